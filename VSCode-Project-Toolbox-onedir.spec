@@ -0,0 +1,56 @@
+# -*- mode: python ; coding: utf-8 -*-
+# One-folder build: the executable sits next to its libraries, so nothing is
+# unpacked to a temporary directory on every launch as with the onefile build.
+# Build with: pyinstaller VSCode-Project-Toolbox-onedir.spec
+
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    # Qt modules the toolbox never uses
+    excludes=['PyQt5.QtWebEngineWidgets', 'PyQt5.QtWebEngineCore', 'PyQt5.QtQml', 'PyQt5.QtQuick',
+              'PyQt5.QtMultimedia', 'PyQt5.QtSql', 'PyQt5.QtTest', 'tkinter'],
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='VSCode-Project-Toolbox',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,  # Compressed libraries would be decompressed on every start
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['assets/icon.icns'],
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='VSCode-Project-Toolbox',
+)
+app = BUNDLE(
+    coll,
+    name='VSCode-Project-Toolbox.app',
+    icon='assets/icon.icns',
+    bundle_identifier=None,
+)
@@ -0,0 +1,61 @@
+import os
+import platform
+
+APP_DIR_NAME = "vscode-project-toolbox"
+
+
+def cache_dir():
+    """Returns the per-user directory for files that can be rebuilt at any time."""
+    system = platform.system()
+    home = os.path.expanduser("~")
+    if system == 'Darwin':  # macOS
+        base = os.path.join(home, "Library/Caches")
+    elif system == 'Windows':
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(home, "AppData/Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(home, ".cache")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def config_dir():
+    """Returns the per-user directory for the toolbox's own settings."""
+    system = platform.system()
+    home = os.path.expanduser("~")
+    if system == 'Darwin':  # macOS
+        base = os.path.join(home, "Library/Application Support")
+    elif system == 'Windows':
+        base = os.environ.get("APPDATA") or os.path.join(home, "AppData/Roaming")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def data_dir():
+    """Returns the per-user directory for data the toolbox builds up over time."""
+    system = platform.system()
+    home = os.path.expanduser("~")
+    if system == 'Darwin':  # macOS
+        base = os.path.join(home, "Library/Application Support")
+    elif system == 'Windows':
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(home, "AppData/Local")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(home, ".local/share")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def daemon_socket_path():
+    """Returns the Unix socket the project daemon listens on."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    base = os.path.join(runtime, APP_DIR_NAME) if runtime else cache_dir()
+    return os.path.join(base, "daemon.sock")
+
+
+def instance_socket_path():
+    """Returns the local socket a running window listens on for a second launch.
+
+    On Windows this is a named pipe, which is per machine, so it carries the user name.
+    """
+    if platform.system() == 'Windows':
+        user = os.environ.get("USERNAME", "user")
+        return rf"\\.\pipe\{APP_DIR_NAME}-{user}"
+    return os.path.join(os.path.dirname(daemon_socket_path()), "window.sock")
@@ -0,0 +1,138 @@
+"""Generates VSCode state files with a realistic mix of recently opened entries.
+
+The entries follow what VSCode writes to history.recentlyOpenedPathsList:
+folders, files, workspaces with a configPath, percent-encoded names,
+Windows drive-letter URIs and a few remote URIs. The same
+count and seed always produce the same data.
+"""
+import json
+import os
+import random
+import sqlite3
+import urllib.parse
+
+WORDS = ["api", "web", "core", "utils", "service", "client", "server", "docs", "infra", "data",
+         "mobile", "auth", "billing", "search", "ui", "cli", "sdk", "worker", "gateway", "ml"]
+UNICODE_WORDS = ["café", "résumé", "naïve", "projekt-über", "データ", "проект"]
+ROOTS = ["/home/dev/src", "/home/dev/work/clients", "/home/dev/My Projects", "/opt/repos",
+         "/home/dev/go/src/github.com/example"]
+WINDOWS_ROOTS = ["c:/Users/dev/source/repos", "d:/Work/Projects"]
+
+
+def file_uri(path):
+    """VSCode-style file URI: percent-encoded, with the drive colon encoded too."""
+    if not path.startswith("/"):
+        path = "/" + path  # Windows drive letter paths
+    return "file://" + urllib.parse.quote(path, safe="/")
+
+
+def make_entries(count, seed=0):
+    """Returns count entries in the shape VSCode stores them."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{i}"
+        kind = rng.random()
+        if kind < 0.55:
+            entries.append({"folderUri": file_uri(f"{rng.choice(ROOTS)}/{rng.choice(WORDS)}/{name}")})
+        elif kind < 0.65:
+            path = f"{rng.choice(ROOTS)}/{rng.choice(UNICODE_WORDS)} {name}"
+            entries.append({"folderUri": file_uri(path)})
+        elif kind < 0.75:
+            entries.append({"folderUri": file_uri(f"{rng.choice(WINDOWS_ROOTS)}/{name}")})
+        elif kind < 0.85:
+            entries.append({"fileUri": file_uri(f"{rng.choice(ROOTS)}/{name}/README.md")})
+        elif kind < 0.95:
+            config = file_uri(f"{rng.choice(ROOTS)}/{name}/{name}.code-workspace")
+            entries.append({"workspace": {"id": f"{i:032x}", "configPath": config}})
+        else:
+            entries.append({"folderUri": f"vscode-remote://ssh-remote%2Bbuild-{i % 7}/srv/{name}",
+                            "remoteAuthority": f"ssh-remote+build-{i % 7}"})
+        if rng.random() < 0.05:
+            entries[-1]["label"] = name.upper()
+    return entries
+
+
+def write_state_db(path, count, seed=0):
+    """Writes a state.vscdb with count recent entries among other typical keys."""
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    rows = [(f"workbench.view.extension.{i}.state", json.dumps({"collapsed": i % 2 == 0}))
+            for i in range(200)]
+    rows.append(("history.recentlyOpenedPathsList", json.dumps({"entries": make_entries(count, seed)})))
+    conn.executemany("INSERT INTO ItemTable VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def write_storage_json(path, count, seed=0, padding_bytes=0):
+    """Writes a storage.json with count recent entries among other typical keys.
+
+    padding_bytes of unrelated state (window layouts, theme caches) are added
+    ahead of the history, as on long-lived installs.
+    """
+    entries = make_entries(count, seed)
+    padding = {f"workbench.panel.{i}": {"layout": "x" * 900, "sizes": [i, i + 1, {"open": True}]}
+               for i in range(padding_bytes // 1000)}
+    data = {
+        **padding,
+        "telemetry.machineId": f"{seed:064x}",
+        "theme": "vs-dark",
+        "windowsState": {"lastActiveWindow": {"folder": entries[0].get("folderUri") if entries else None,
+                                              "uiState": {"mode": 1, "width": 1200, "height": 800}}},
+        "openedPathsList": {
+            "entries": entries,
+            # Older keys some installs still carry
+            "workspaces3": [entry["folderUri"] for entry in entries[:50] if "folderUri" in entry],
+        },
+    }
+    with open(path, "w", encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def write_workspace_storage(path, count, seed=0):
+    """Writes a workspaceStorage directory with one <hash>/workspace.json per opened project.
+
+    Directory modification times are spread over the past year, as VSCode
+    leaves them when it last wrote each workspace's state.
+    """
+    import time
+    rng = random.Random(seed)
+    now = time.time()
+    os.makedirs(path, exist_ok=True)
+    for i, entry in enumerate(make_entries(count, seed)):
+        uri = entry.get("folderUri") or entry.get("fileUri")
+        if "workspace" in entry:
+            data = {"workspace": entry["workspace"]["configPath"]}
+        elif "fileUri" in entry:
+            continue  # Single files get no workspace storage
+        else:
+            data = {"folder": uri}
+        directory = os.path.join(path, f"{rng.getrandbits(128):032x}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "workspace.json"), "w", encoding='utf-8') as f:
+            json.dump(data, f)
+        mtime = now - rng.random() * 365 * 24 * 3600
+        os.utime(directory, (mtime, mtime))
+
+
+def write_project_trees(path, count, seed=0):
+    """Writes count small project folders and returns their paths.
+
+    Each has a few source directories in one of several languages and a
+    node_modules directory the profiler is expected to skip.
+    """
+    rng = random.Random(seed)
+    extensions = [".py", ".ts", ".go", ".rs", ".java"]
+    projects = []
+    for i in range(count):
+        project = os.path.join(path, f"{rng.choice(WORDS)}-{i}")
+        extension = rng.choice(extensions)
+        for directory in ("src", "src/lib", "tests", "node_modules/dep"):
+            os.makedirs(os.path.join(project, directory), exist_ok=True)
+            for n in range(rng.randint(2, 8)):
+                open(os.path.join(project, directory, f"f{n}{extension}"), "w").close()
+        projects.append(project)
+    return projects
@@ -0,0 +1,170 @@
+"""Command line access to recent projects, for scripts and pickers such as fzf or rofi.
+
+    toolbox list [--json]               all projects, best first
+    toolbox query TEXT [--limit N]      fuzzy search, best match first
+    toolbox open PATH|URI...            open projects in VSCode, remote ones by URI
+    toolbox daemon [--stop|--metrics]   keep the list warm for instant answers
+
+Qt is never imported. When a daemon is running, list and query are answered
+by it; otherwise the cached snapshot is used, re-parsing VSCode's storage
+only when it changed.
+"""
+import json
+import os
+import socket
+import sys
+from app_paths import daemon_socket_path
+
+COMMANDS = ("list", "query", "open", "daemon")
+
+
+def ask_daemon(request, socket_path=None, timeout=5.0):
+    """Sends one request to the daemon; returns its reply, or None if no daemon is running."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path or daemon_socket_path())
+            sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+    except OSError:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def load_projects(args):
+    """Returns (paths, origins) without a daemon."""
+    # Imported here so daemon-backed commands skip the parsing machinery entirely
+    from toolbox_core import ProjectDiscovery
+    discovery = ProjectDiscovery()
+    discovery.load_snapshot()
+    paths = discovery.collect_recent_projects()
+    return paths, discovery.project_origins
+
+
+def find_projects(args, text=None):
+    """Returns (paths, editors per path or None) for list (text None) or query."""
+    if not args.no_daemon:
+        request = {"cmd": "list" if text is None else "query", "text": text,
+                   "limit": args.limit, "editors": args.json}
+        reply = ask_daemon(request, args.socket)
+        if reply and reply.get("ok"):
+            return reply["paths"], reply.get("editors")
+
+    paths, origins = load_projects(args)
+    if text is not None:
+        from search_index import SearchIndex
+        matches = SearchIndex(paths).search(text)
+        paths = paths if matches is None else matches
+    if args.limit:
+        paths = paths[:args.limit]
+    editors = [origins.get(path, ()) for path in paths] if args.json else None
+    return paths, editors
+
+
+def print_projects(args, paths, editors):
+    if args.json:
+        records = [{"path": path, "name": os.path.basename(path) or path, "editors": list(names)}
+                   for path, names in zip(paths, editors)]
+        json.dump(records, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    elif paths:
+        sys.stdout.write("\n".join(paths) + "\n")
+
+
+def open_projects(args):
+    from toolbox_core import LAUNCH_COMMAND, open_in_editor
+    from vscode_uri import is_remote
+    from frecency import FrecencyStore
+    frecency = FrecencyStore()
+    results = []
+    for path in args.paths:
+        if not is_remote(path):
+            path = os.path.abspath(os.path.expanduser(path))
+        error = open_in_editor(path, LAUNCH_COMMAND)
+        if error is None:
+            frecency.record_launch(path)
+        else:
+            print(f"Failed to open {path}: {error}", file=sys.stderr)
+        results.append({"path": path, "ok": error is None, "error": error})
+    if args.json:
+        json.dump(results, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+def run_daemon(args):
+    if args.stop:
+        reply = ask_daemon({"cmd": "shutdown"}, args.socket)
+        if reply is None:
+            print("No daemon is running.", file=sys.stderr)
+            return 1
+        return 0
+    if args.metrics:
+        reply = ask_daemon({"cmd": "metrics"}, args.socket)
+        if reply is None:
+            print("No daemon is running.", file=sys.stderr)
+            return 1
+        json.dump(reply["metrics"], sys.stdout, indent=1)
+        sys.stdout.write("\n")
+        return 0
+    if not hasattr(socket, "AF_UNIX"):
+        print("The daemon needs Unix domain sockets, which this platform lacks.", file=sys.stderr)
+        return 1
+    from daemon import ProjectDaemon
+    try:
+        ProjectDaemon(args.socket).serve_forever()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser():
+    import argparse  # Only needed for commands; main.py imports this module for COMMANDS
+    parser = argparse.ArgumentParser(prog="toolbox", description=__doc__.splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="print JSON instead of one path per line")
+    common.add_argument("--socket", help="daemon socket (default: in the user's runtime directory)")
+    common.add_argument("--no-daemon", action="store_true", help="do not ask a running daemon")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", parents=[common], help="list recent projects")
+    list_parser.add_argument("--limit", type=int, default=None)
+    query_parser = commands.add_parser("query", parents=[common], help="search recent projects")
+    query_parser.add_argument("text", nargs="+")
+    query_parser.add_argument("--limit", type=int, default=None)
+    open_parser = commands.add_parser("open", parents=[common], help="open projects in VSCode")
+    open_parser.add_argument("paths", nargs="+")
+    daemon_parser = commands.add_parser("daemon", parents=[common], help="run the project daemon")
+    daemon_parser.add_argument("--stop", action="store_true", help="stop the running daemon")
+    daemon_parser.add_argument("--metrics", action="store_true",
+                               help="print the running daemon's counters, timings and recent log")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from instrumentation import configure_logging, export_at_exit
+    configure_logging("info" if args.command == "daemon" else "warning")
+    export_at_exit()
+    if args.command == "list":
+        print_projects(args, *find_projects(args))
+    elif args.command == "query":
+        print_projects(args, *find_projects(args, " ".join(args.text)))
+    elif args.command == "open":
+        return open_projects(args)
+    elif args.command == "daemon":
+        return run_daemon(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
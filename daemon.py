@@ -0,0 +1,169 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+from app_paths import daemon_socket_path
+from instrumentation import get_logger, metrics
+from search_index import SearchIndex
+from toolbox_core import ProjectDiscovery
+
+log = get_logger("daemon")
+
+
+class ProjectDaemon:
+    """Keeps the parsed, ranked and indexed project list warm behind a Unix socket.
+
+    Clients send one line of JSON per connection and get one line back:
+
+        {"cmd": "list", "editors": true}       -> {"ok": true, "paths": [...], "editors": [[...], ...]}
+        {"cmd": "query", "text": "api", "limit": 20}
+        {"cmd": "ping"} / {"cmd": "reload"} / {"cmd": "shutdown"}
+
+    A background thread compares the storage files (and the launch history)
+    with the ones the list was built from every POLL_INTERVAL seconds and
+    rebuilds the list when they changed, so answers never go stale for long.
+    """
+    POLL_INTERVAL = 2.0
+    RESULT_CACHE_SIZE = 128  # Recent query results, answered without searching again
+
+    def __init__(self, socket_path=None, discovery=None):
+        self.socket_path = socket_path or daemon_socket_path()
+        self.discovery = discovery or ProjectDiscovery()
+        self.lock = threading.Lock()  # Guards the list below
+        self._reload_lock = threading.Lock()  # One reload at a time
+        self.paths = []
+        self.origins = {}
+        self.index = SearchIndex()
+        self.sources = None
+        self._results = {}
+        self._stopped = threading.Event()
+        self._server = None
+
+    def reload(self, use_cache=True):
+        """Rebuilds the list; the previous one keeps answering until the new one is ready."""
+        with self._reload_lock:
+            if self.discovery.snapshot is None:
+                self.discovery.load_snapshot()
+            paths = self.discovery.collect_recent_projects(use_cache=use_cache)
+            index = SearchIndex(paths)
+            index.search("a")  # Build a mask and the name index now rather than on the first query
+            sources = self.discovery.source_keys(self.discovery.storage_locations)
+            self._publish(paths, index, sources)
+
+    def _publish(self, paths, index, sources):
+        with self.lock:
+            self.paths = paths
+            self.origins = self.discovery.project_origins
+            self.index = index
+            self.sources = sources
+            self._results = {}
+
+    def handle(self, request):
+        """Answers one decoded request."""
+        command = request.get("cmd")
+        if command == "reload":
+            self.reload(use_cache=False)
+        if command == "shutdown":
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {"ok": True}
+        if command == "metrics":
+            return {"ok": True, "metrics": metrics.report()}
+        with self.lock:
+            if command in ("ping", "reload"):
+                return {"ok": True, "count": len(self.paths), "pid": os.getpid()}
+            if command == "list":
+                paths = self.paths
+            elif command == "query":
+                with metrics.span("daemon.query", "daemon") as args:
+                    paths = self._search(request.get("text") or "")
+                    args["results"] = len(paths)
+            else:
+                return {"ok": False, "error": f"Unknown command: {command}"}
+            limit = request.get("limit")
+            if limit:
+                paths = paths[:limit]
+            reply = {"ok": True, "paths": paths}
+            if request.get("editors"):
+                reply["editors"] = [self.origins.get(path, ()) for path in paths]
+            return reply
+
+    def _search(self, text):
+        paths = self._results.get(text)
+        if paths is None:
+            paths = self.index.search(text)
+            paths = self.paths if paths is None else paths
+            if len(self._results) >= self.RESULT_CACHE_SIZE:
+                self._results.pop(next(iter(self._results)))  # Oldest first
+            self._results[text] = paths
+        return paths
+
+    def serve_forever(self):
+        """Loads the projects, then answers requests until stop() is called."""
+        self.reload()
+        self._bind()
+        watcher = threading.Thread(target=self._watch_sources, daemon=True)
+        watcher.start()
+        log.info("Serving %d projects on %s", len(self.paths), self.socket_path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+
+    def stop(self):
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _bind(self):
+        if os.path.exists(self.socket_path):
+            if is_running(self.socket_path):
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            os.remove(self.socket_path)  # Left behind by a daemon that crashed
+        os.makedirs(os.path.dirname(self.socket_path), mode=0o700, exist_ok=True)
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline())
+                    reply = daemon.handle(request if isinstance(request, dict) else {})
+                except ValueError as e:
+                    reply = {"ok": False, "error": f"Bad request: {e}"}
+                self.wfile.write(json.dumps(reply).encode('utf-8') + b"\n")
+
+        old_umask = os.umask(0o077)  # Only the owner may connect
+        try:
+            self._server = ThreadingUnixServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+
+    def _watch_sources(self):
+        while not self._stopped.wait(self.POLL_INTERVAL):
+            current = self.discovery.source_keys(self.discovery.storage_locations)
+            if current != self.sources:
+                try:
+                    self.reload()
+                except Exception as e:
+                    log.exception("Could not reload projects: %s", e)
+
+
+class ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def is_running(socket_path=None):
+    """True if a daemon answers on the socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            sock.connect(socket_path or daemon_socket_path())
+            sock.sendall(b'{"cmd": "ping"}\n')
+            return bool(sock.recv(1))
+    except OSError:
+        return False
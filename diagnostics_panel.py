@@ -0,0 +1,95 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+                             QTableWidgetItem, QPlainTextEdit, QFileDialog, QHeaderView, QLabel)
+from PyQt5.QtCore import QTimer
+from instrumentation import metrics, recent_logs
+
+
+class DiagnosticsPanel(QDialog):
+    """Live view of the metrics registry and recent log, opened with F12.
+
+    Counters and histogram percentiles are refreshed every REFRESH_MS while
+    the panel is visible. The report and trace can be exported for a bug
+    report; Reset starts measuring afresh, e.g. before reproducing a slow
+    search.
+    """
+    REFRESH_MS = 1000
+    COLUMNS = ("metric", "count", "p50", "p90", "p99", "max", "unit")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(720, 520)
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table, 3)
+
+        layout.addWidget(QLabel("Recent log"))
+        self.log_view = QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        self.log_view.setMaximumBlockCount(recent_logs.records.maxlen)
+        layout.addWidget(self.log_view, 2)
+
+        buttons = QHBoxLayout()
+        for text, slot in (("Export JSON...", self.export_json),
+                           ("Export Chrome trace...", self.export_trace),
+                           ("Reset", self.reset)):
+            button = QPushButton(text)
+            button.setAutoDefault(False)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        rows = [(name, value, "", "", "", "", "") for name, value in snapshot["counters"].items()]
+        for name, summary in snapshot["histograms"].items():
+            rows.append((name, summary["count"], summary.get("p50", ""), summary.get("p90", ""),
+                         summary.get("p99", ""), summary.get("max", ""), summary["unit"]))
+        self.table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(str(value)))
+
+        lines = [f"{record['level']:<8}{record['logger']}: {record['msg']}" for record in recent_logs.records]
+        text = "\n".join(lines)
+        if text != self.log_view.toPlainText():
+            self.log_view.setPlainText(text)
+            self.log_view.verticalScrollBar().setValue(self.log_view.verticalScrollBar().maximum())
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def export_json(self):
+        self._export("Export diagnostics", "toolbox-diagnostics.json", metrics.export_json)
+
+    def export_trace(self):
+        self._export("Export Chrome trace", "toolbox-trace.json", metrics.export_chrome_trace)
+
+    def _export(self, title, default_name, write):
+        path, _ = QFileDialog.getSaveFileName(self, title, default_name, "JSON (*.json)")
+        if not path:
+            return
+        try:
+            write(path)
+        except OSError as e:
+            self.log_view.appendPlainText(f"Could not write {path}: {e}")
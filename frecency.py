@@ -0,0 +1,130 @@
+from bisect import bisect_right
+from itertools import compress, count, filterfalse
+import math
+import os
+import sqlite3
+import time
+from app_paths import data_dir
+
+# A launch is worth half as much after this many seconds
+HALF_LIFE = 7 * 24 * 3600
+
+
+class FrecencyStore:
+    """Launch history of projects opened through the toolbox, kept in SQLite.
+
+    Each project has one row with its launch count, last launch time and an
+    exponentially decaying score. The score is stored as the base-2 logarithm
+    of the sum of 2 ** (t / HALF_LIFE) over all launch times t. Adding a
+    launch is therefore a single update of one row and stored scores never
+    need decaying: the value of a project at time now is
+    2 ** (score - now / HALF_LIFE), and comparing two stored scores compares
+    the projects at any point in time.
+
+    Connections are opened per call, so the store can be used from the loader
+    thread and the GUI thread alike.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "frecency.sqlite")
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # A launch lost in a power cut is no loss
+        conn.execute("""CREATE TABLE IF NOT EXISTS launches (
+                            path TEXT PRIMARY KEY,
+                            score REAL NOT NULL,
+                            count INTEGER NOT NULL,
+                            last_opened REAL NOT NULL)""")
+        return conn
+
+    def record_launch(self, path, when=None):
+        """Adds a launch of path at time when (default now)."""
+        when = time.time() if when is None else when
+        launch = when / HALF_LIFE
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute("SELECT score FROM launches WHERE path = ?", (path,)).fetchone()
+                score = launch if row is None else log2_add(row[0], launch)
+                conn.execute("""INSERT INTO launches (path, score, count, last_opened) VALUES (?, ?, 1, ?)
+                                ON CONFLICT(path) DO UPDATE SET score = excluded.score,
+                                    count = count + 1, last_opened = MAX(last_opened, excluded.last_opened)""",
+                             (path, score, when))
+        finally:
+            conn.close()
+
+    def scores(self):
+        """Returns {path: stored score} for every project launched so far."""
+        if not self.exists():
+            return {}
+        conn = self._connect()
+        try:
+            return dict(conn.execute("SELECT path, score FROM launches"))
+        finally:
+            conn.close()
+
+    def forget(self, path):
+        """Drops a project's launch history."""
+        if not self.exists():
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM launches WHERE path = ?", (path,))
+        finally:
+            conn.close()
+
+    def rank(self, paths, now=None):
+        """Orders paths by frecency, merged with their existing (most recent first) order."""
+        return rank_projects(paths, self.scores(), now)
+
+
+def log2_add(a, b):
+    """log2(2 ** a + 2 ** b) without overflowing for large a and b."""
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def current_value(score, now=None):
+    """The decayed value of a stored score at time now: one fresh launch is worth 1."""
+    now = time.time() if now is None else now
+    return 2 ** (score - now / HALF_LIFE)
+
+
+def rank_projects(paths, scores, now=None):
+    """Merges launch frecency into a list of paths ordered most recent first.
+
+    A path's weight is 1 / (position + 1) for its place in the list plus the
+    current value of its launches, so a fresh launch counts as much as being
+    the most recently opened project in VSCode. Paths without launches keep
+    their relative order and only the launched ones are moved, to the first
+    place where they outweigh the path that follows; apart from one filtering
+    pass, the work depends on the number of launched projects only.
+    """
+    if not scores:
+        return list(paths)
+    now = time.time() if now is None else now
+    positions = list(compress(count(), map(scores.__contains__, paths)))
+    if not positions:
+        return list(paths)
+    rest = list(filterfalse(scores.__contains__, paths))
+
+    launched = sorted(((1 / (position + 1) + current_value(scores[paths[position]], now), paths[position])
+                       for position in positions), reverse=True)
+    ranked = []
+    start = 0
+    for weight, path in launched:
+        # Unlaunched paths at positions up to last_ahead outweigh this one
+        last_ahead = min(math.ceil(1 / weight - 1) - 1, len(paths) - 1)
+        ahead = last_ahead + 1 - bisect_right(positions, last_ahead) if last_ahead >= 0 else 0
+        ahead = max(ahead, start)
+        ranked.extend(rest[start:ahead])
+        ranked.append(path)
+        start = ahead
+    ranked.extend(rest[start:])
+    return ranked
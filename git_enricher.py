@@ -0,0 +1,129 @@
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from git_status import GitStatusCache, read_git_status, status_key
+from instrumentation import get_logger, metrics
+
+log = get_logger("git")
+
+
+class GitStatusEnricher(QObject):
+    """Fetches git status for projects on a small thread pool, most recent request first.
+
+    Requests come from the rows being painted, so visible rows are served
+    before anything else; a request jumps ahead of older ones still waiting.
+    At most max_workers git processes run at once. Each job first compares
+    the .git/HEAD and .git/index modification times with the cache and only
+    runs git when they changed. Results are collected and delivered in
+    batches through statuses_ready as {path: GitStatus or None}.
+    """
+    statuses_ready = pyqtSignal(object)
+    _job_done = pyqtSignal(str, object)  # From worker threads: path, (found, status)
+
+    def __init__(self, max_workers=4, cache=None, flush_ms=100, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self.cache = cache or GitStatusCache()
+        self.cache.load()
+        self.enabled = True
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="git-status")
+        self._pending = deque()
+        self._queued = set()
+        self._running = set()
+        self._results = {}
+        self._closed = False
+        self._job_done.connect(self._on_job_done)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_ms)
+        self._flush_timer.timeout.connect(self._flush)
+
+    def request(self, paths):
+        """Queue paths ahead of everything already waiting, in the given order."""
+        if not self.enabled or self._closed:
+            return
+        for path in reversed(paths):
+            if path in self._running:
+                continue
+            if path in self._queued:
+                self._pending.remove(path)
+            else:
+                self._queued.add(path)
+            self._pending.appendleft(path)
+        self._start_jobs()
+
+    def clear_pending(self):
+        """Forget waiting requests, e.g. after the list was replaced."""
+        self._pending.clear()
+        self._queued.clear()
+
+    def shutdown(self):
+        """Drop waiting requests and save the cache.
+
+        Running git processes are not waited for, since one on a slow network
+        mount would hold up closing the window; their results are dropped.
+        """
+        self._closed = True
+        self.clear_pending()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.save()
+
+    def _start_jobs(self):
+        while self._pending and len(self._running) < self.max_workers:
+            path = self._pending.popleft()
+            self._queued.discard(path)
+            self._running.add(path)
+            self._pool.submit(self._job, path)
+
+    def _job(self, path):
+        # Runs on a pool thread
+        try:
+            with metrics.span("git.status", "git") as args:
+                key = status_key(path)
+                if key is None:
+                    status = None  # Not a repository
+                else:
+                    found, status = self.cache.get(path, key)
+                    if not found:
+                        status = read_git_status(path)
+                        self.cache.put(path, key, status)
+                    args["cached"] = found
+            metrics.count("git.cached" if key is not None and found else "git.runs")
+            result = (True, status)
+        except FileNotFoundError:
+            result = (False, None)  # git is not installed
+        except subprocess.TimeoutExpired:
+            # Not cached: a cold disk or a busy mount may well answer next time
+            metrics.count("git.timeouts")
+            log.info("git status timed out in %s", path)
+            result = (True, None)
+        except Exception as e:
+            log.warning("Could not read git status of %s: %s", path, e)
+            result = (True, None)
+        if self._closed:
+            return  # Shut down while git was running; nobody waits for this any more
+        try:
+            self._job_done.emit(path, result)
+        except RuntimeError:
+            self._closed = True  # Deleted on the GUI thread while git was running
+
+    def _on_job_done(self, path, result):
+        self._running.discard(path)
+        found, status = result
+        if not found:
+            if self.enabled:
+                log.warning("git not found; project list will not show git status.")
+            self.enabled = False
+            self.clear_pending()
+            return
+        self._results[path] = status
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+        self._start_jobs()
+
+    def _flush(self):
+        results, self._results = self._results, {}
+        if results:
+            self.statuses_ready.emit(results)
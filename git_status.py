@@ -0,0 +1,159 @@
+import json
+import os
+import subprocess
+import threading
+from app_paths import cache_dir
+from instrumentation import get_logger
+
+log = get_logger("git")
+
+
+class GitStatus:
+    """Branch, dirty state and ahead/behind counts of one repository."""
+    __slots__ = ("branch", "dirty", "ahead", "behind")
+
+    def __init__(self, branch, dirty=False, ahead=0, behind=0):
+        self.branch = branch
+        self.dirty = dirty
+        self.ahead = ahead
+        self.behind = behind
+
+    def __eq__(self, other):
+        return isinstance(other, GitStatus) and self.to_list() == other.to_list()
+
+    def __repr__(self):
+        return f"GitStatus({self.branch!r}, dirty={self.dirty}, ahead={self.ahead}, behind={self.behind})"
+
+    def label(self):
+        """Short text for the project list, e.g. 'main* ↑2 ↓1'."""
+        text = self.branch + ("*" if self.dirty else "")
+        if self.ahead:
+            text += f" ↑{self.ahead}"
+        if self.behind:
+            text += f" ↓{self.behind}"
+        return text
+
+    def to_list(self):
+        return [self.branch, self.dirty, self.ahead, self.behind]
+
+
+def find_git_dir(path):
+    """Returns the repository's git directory for a working tree root, or None."""
+    dot_git = os.path.join(path, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        # Worktrees and submodules have a .git file pointing elsewhere
+        with open(dot_git, "r", encoding='utf-8') as f:
+            line = f.readline().strip()
+    except OSError:
+        return None
+    if line.startswith("gitdir:"):
+        return os.path.normpath(os.path.join(path, line[len("gitdir:"):].strip()))
+    return None
+
+
+def status_key(path):
+    """Modification times of .git/HEAD and .git/index, or None if path is not a repository.
+
+    Commits, checkouts and staging all touch one of the two, so an unchanged
+    key means the cached status still holds.
+    """
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return None
+    key = []
+    for name in ("HEAD", "index"):
+        try:
+            key.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+        except OSError:
+            key.append(None)  # A fresh repository has no index yet
+    return key
+
+
+def read_git_status(path, timeout=10):
+    """Runs git status for the repository at path; returns a GitStatus or None on failure.
+
+    Raises FileNotFoundError when git itself is not installed, and
+    subprocess.TimeoutExpired when it does not answer within timeout
+    seconds: unlike a failure, that says nothing about the repository.
+    """
+    # Optional locks off: git must not rewrite the index, which would change the key
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS="0")
+    result = subprocess.run(
+        ["git", "-C", path, "status", "--porcelain=v2", "--branch", "--untracked-files=no"],
+        capture_output=True, text=True, timeout=timeout, env=env)
+    if result.returncode != 0:
+        return None
+    return parse_status(result.stdout)
+
+
+def parse_status(output):
+    """Parses the output of git status --porcelain=v2 --branch."""
+    branch = None
+    oid = None
+    ahead = behind = 0
+    dirty = False
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            branch = line[len("# branch.head "):]
+        elif line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):]
+        elif line.startswith("# branch.ab "):
+            counts = line[len("# branch.ab "):].split()
+            ahead, behind = int(counts[0]), -int(counts[1])
+        elif line and not line.startswith("#"):
+            dirty = True
+    if branch == "(detached)":
+        branch = oid[:7] if oid and oid != "(initial)" else branch
+    return GitStatus(branch or "?", dirty, ahead, behind)
+
+
+class GitStatusCache:
+    """Git statuses keyed by repository path and status_key(), saved between runs.
+
+    Safe to use from several worker threads at once.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "git-status.json")
+        self._entries = {}  # path -> (key, GitStatus or None)
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            for path, (key, status) in data.items():
+                self._entries[path] = (key, GitStatus(*status) if status else None)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {path: [key, status.to_list() if status else None]
+                    for path, (key, status) in self._entries.items()}
+            self._dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("Could not write git status cache %s: %s", self.path, e)
+
+    def get(self, path, key):
+        """Returns (True, status) when a status for exactly this key is cached."""
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == key:
+            return True, entry[1]
+        return False, None
+
+    def put(self, path, key, status):
+        with self._lock:
+            self._entries[path] = (key, status)
+            self._dirty = True
@@ -0,0 +1,86 @@
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+from path_health import PathHealthCache, probe_paths
+from instrumentation import get_logger, metrics
+
+log = get_logger("path_health")
+
+
+class PathHealthChecker(QObject):
+    """Checks whether project paths still exist, away from the GUI thread.
+
+    Probing runs on a daemon thread through probe_paths(), so a dead network
+    mount costs at most timeout seconds per mount and never holds up loading,
+    painting or quitting. Results arrive through health_ready as
+    {path: state}, a mount at a time. A check requested while one is running
+    starts as soon as it is done.
+    """
+    health_ready = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, timeout=2.0, cache=None, parent=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.cache = cache or PathHealthCache()
+        self._cache_loaded = False  # Loaded on the checking thread, it can hold many paths
+        self._thread = None
+        self._next = None
+        self._closed = False
+        self._done = threading.Event()
+        self._done.set()
+        self.finished.connect(self._on_finished)
+
+    def check(self, paths):
+        """Probe paths, using cached results that have not expired."""
+        if self._thread is not None:
+            self._next = list(paths)
+            return
+        self._done.clear()
+        self._thread = threading.Thread(target=self._run, args=(list(paths),), daemon=True,
+                                        name="path-health")
+        self._thread.start()
+
+    def is_running(self):
+        return self._thread is not None
+
+    def wait(self, timeout=None):
+        """Blocks until the current check is done; for tests and benchmarks."""
+        return self._done.wait(timeout)
+
+    def shutdown(self):
+        """Save what is known; a check still waiting on a mount is abandoned."""
+        self._next = None
+        self._closed = True
+        if self._cache_loaded:
+            self.cache.save()
+
+    def _run(self, paths):
+        # Runs on the probing thread; signals are queued to the GUI thread
+        try:
+            if not self._cache_loaded:
+                self.cache.load()
+                self._cache_loaded = True
+            with metrics.span("health.check", "path_health", paths=len(paths)):
+                probe_paths(paths, self.timeout, cache=self.cache, on_results=self._emit)
+        except Exception as e:
+            log.exception("Could not check project paths: %s", e)
+        self.cache.save()
+        self._done.set()
+        self._emit(None)
+
+    def _emit(self, states):
+        if self._closed:
+            return  # The window is gone; nobody is listening
+        try:
+            if states is None:
+                self.finished.emit()
+            else:
+                self.health_ready.emit(states)
+        except RuntimeError:
+            self._closed = True  # Deleted on the GUI thread while probing
+
+    def _on_finished(self):
+        self._thread = None
+        paths, self._next = self._next, None
+        if paths is not None:
+            self.check(paths)
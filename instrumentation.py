@@ -0,0 +1,245 @@
+"""Logging, metrics and tracing shared by the window, the command line and the daemon.
+
+Diagnostics go through loggers named toolbox.<module> (see get_logger). The
+process-wide `metrics` registry keeps counters, histograms and a bounded
+buffer of trace events; `metrics.span(name)` times a block into all of them.
+A report can be exported as JSON, or as a Chrome trace for chrome://tracing
+and Perfetto. Nothing here imports Qt.
+
+Environment variables:
+
+    VSCODE_TOOLBOX_LOG=debug|info|warning    log level (default info, warning for the CLI)
+    VSCODE_TOOLBOX_LOG_JSON=1                one JSON object per log line
+    VSCODE_TOOLBOX_METRICS=report.json       write the metrics report at exit
+    VSCODE_TOOLBOX_TRACE=trace.json          write a Chrome trace at exit
+"""
+import atexit
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+LOG_ENV = "VSCODE_TOOLBOX_LOG"
+LOG_JSON_ENV = "VSCODE_TOOLBOX_LOG_JSON"
+METRICS_ENV = "VSCODE_TOOLBOX_METRICS"
+TRACE_ENV = "VSCODE_TOOLBOX_TRACE"
+
+
+def get_logger(name):
+    return logging.getLogger(f"toolbox.{name}")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; fields passed as extra={"fields": {...}} are included."""
+    def format(self, record):
+        data = {"ts": round(record.created, 3), "level": record.levelname.lower(),
+                "logger": record.name, "msg": record.getMessage()}
+        data.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class RecentLogHandler(logging.Handler):
+    """Keeps the last few records for the diagnostics panel and exported reports."""
+    def __init__(self, capacity=500):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        entry = {"ts": round(record.created, 3), "level": record.levelname.lower(),
+                 "logger": record.name, "msg": record.getMessage()}
+        entry.update(getattr(record, "fields", None) or {})
+        self.records.append(entry)
+
+
+recent_logs = RecentLogHandler()
+
+
+def configure_logging(default_level="info"):
+    """Sends toolbox logs to stderr, as plain messages or JSON lines; safe to call twice."""
+    logger = logging.getLogger("toolbox")
+    if getattr(logger, "_toolbox_configured", False):
+        return
+    level = os.environ.get(LOG_ENV, default_level).upper()
+    logger.setLevel(getattr(logging, level, logging.INFO))
+    handler = logging.StreamHandler(sys.stderr)
+    if os.environ.get(LOG_JSON_ENV):
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.addHandler(recent_logs)
+    logger.propagate = False
+    logger._toolbox_configured = True
+
+
+class Histogram:
+    """Distribution of observed values in log-scale buckets, a quarter octave (~19%) wide.
+
+    Memory stays constant however many values are observed; percentiles are
+    accurate to the bucket width.
+    """
+    BUCKETS_PER_OCTAVE = 4
+
+    def __init__(self, unit="ms"):
+        self.unit = unit
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = {}  # bucket index -> count; None holds values <= 0
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        key = math.floor(math.log2(value) * self.BUCKETS_PER_OCTAVE) if value > 0 else None
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for key in sorted(self.buckets, key=lambda k: -math.inf if k is None else k):
+            seen += self.buckets[key]
+            if seen >= rank:
+                if key is None:
+                    return max(self.min, 0.0)
+                upper = 2 ** ((key + 1) / self.BUCKETS_PER_OCTAVE)
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {"unit": self.unit, "count": 0}
+        return {"unit": self.unit, "count": self.count, "mean": round(self.total / self.count, 3),
+                "min": round(self.min, 3), "p50": round(self.percentile(0.5), 3),
+                "p90": round(self.percentile(0.9), 3), "p99": round(self.percentile(0.99), 3),
+                "max": round(self.max, 3)}
+
+
+class Metrics:
+    """Counters, histograms and trace events for one process; safe to use from any thread.
+
+    Trace events are complete events ("ph": "X") in Chrome trace format, with
+    timestamps in microseconds since the registry was created. At most
+    MAX_EVENTS are kept, oldest dropped first.
+    """
+    MAX_EVENTS = 20000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.counters = {}
+        self.histograms = {}
+        self.events = deque(maxlen=self.MAX_EVENTS)
+        self._threads = {}  # thread id -> name, for the trace metadata
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value, unit="ms"):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(unit)
+            histogram.observe(value)
+
+    def record_span(self, name, start, end, category="toolbox", args=None, observe=True):
+        """Record a block that ran from start to end (perf_counter seconds) on this thread."""
+        thread = threading.current_thread()
+        event = {"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+                 "ts": round((start - self.origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1)}
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+            self._threads[thread.ident] = thread.name
+        if observe:
+            self.observe(name, (end - start) * 1000)
+
+    @contextmanager
+    def span(self, name, category="toolbox", **args):
+        """Times the block into the histogram name and the trace.
+
+        Yields the args dict, so results known only at the end (row counts,
+        entries parsed) can be added to the trace event.
+        """
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.record_span(name, start, time.perf_counter(), category, args)
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+            self.events.clear()
+
+    def snapshot(self):
+        """Counters and histogram summaries, as plain data."""
+        with self._lock:
+            return {"counters": dict(sorted(self.counters.items())),
+                    "histograms": {name: histogram.summary()
+                                   for name, histogram in sorted(self.histograms.items())}}
+
+    def report(self):
+        """Everything needed to diagnose a slow machine from a file: environment, metrics, recent logs."""
+        data = {"version": 1, "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "uptime_s": round(time.perf_counter() - self.origin, 3),
+                "platform": platform.platform(), "python": platform.python_version(),
+                "cpus": os.cpu_count()}
+        data.update(self.snapshot())
+        data["log"] = list(recent_logs.records)
+        return data
+
+    def chrome_trace(self):
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "vscode-project-toolbox"}}]
+        metadata += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                     for tid, name in threads.items()]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def export_json(self, path):
+        _write_json(path, self.report())
+
+    def export_chrome_trace(self, path):
+        _write_json(path, self.chrome_trace())
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+metrics = Metrics()
+
+
+def export_at_exit():
+    """Writes the report and trace named by VSCODE_TOOLBOX_METRICS / _TRACE when the process exits."""
+    def export():
+        for env, write in ((METRICS_ENV, metrics.export_json), (TRACE_ENV, metrics.export_chrome_trace)):
+            path = os.environ.get(env)
+            if path:
+                try:
+                    write(path)
+                except OSError as e:
+                    print(f"Could not write {path}: {e}", file=sys.stderr)
+    if os.environ.get(METRICS_ENV) or os.environ.get(TRACE_ENV):
+        atexit.register(export)
@@ -1,11 +1,57 @@
+import time
+START_TIME = time.perf_counter()  # Taken before the Qt imports to measure cold start
+
 import sys
-from PyQt5.QtWidgets import QApplication
-from toolbox import ToolboxApp
+from cli import COMMANDS
+
+def listen_for_launches(window):
+    from resident import InstanceServer
+    server = InstanceServer(parent=window)
+    server.show_requested.connect(window.show_switcher)
+    server.listen()
 
 def main():
-    app = QApplication(sys.argv)
-    window = ToolboxApp()
-    window.show()
+    if getattr(sys, "frozen", False):
+        # Project profiling spawns worker processes, which run this executable again
+        import multiprocessing
+        multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        # Command line use never loads Qt
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    # --profile-startup prints the wall time of each startup phase, then quits once the list is loaded
+    profiling = "--profile-startup" in sys.argv[1:]
+    # A window is already running: have it show itself and leave before loading Qt
+    from single_instance import activate_running_instance
+    if not profiling and activate_running_instance():
+        sys.exit(0)
+
+    from instrumentation import configure_logging, export_at_exit
+    from settings import load_settings
+    from startup_profile import StartupProfile
+    configure_logging()
+    export_at_exit()
+    settings = load_settings()
+    resident = not profiling and ("--tray" in sys.argv[1:] or bool(settings.get("stay_resident")))
+    profile = StartupProfile(START_TIME, enabled=profiling)
+
+    with profile.phase("imports"):
+        from PyQt5.QtWidgets import QApplication
+        from toolbox import ToolboxApp
+    with profile.phase("QApplication"):
+        app = QApplication(sys.argv)
+    with profile.phase("window"):
+        window = ToolboxApp(START_TIME, profile)
+    if not profiling:
+        # Later launches hand over to this window; set up once it has painted
+        window.painted.connect(lambda: listen_for_launches(window))
+    if resident:
+        from resident import ResidentController
+        controller = ResidentController(app, window, settings.get("resident_memory_limit_mb"))
+        controller.prewarm()
+    else:
+        window.show()
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
@@ -0,0 +1,240 @@
+import errno
+import json
+import os
+import threading
+import time
+from app_paths import cache_dir, data_dir
+from instrumentation import get_logger, metrics
+from vscode_uri import is_remote
+
+OK = "ok"
+MISSING = "missing"
+UNREACHABLE = "unreachable"
+
+log = get_logger("path_health")
+
+# Errors from a file system that exists but cannot be reached right now
+_UNREACHABLE_ERRNOS = {errno.EIO, errno.ETIMEDOUT, errno.EHOSTDOWN, errno.EHOSTUNREACH,
+                       errno.ENETDOWN, errno.ENETUNREACH, errno.ECONNREFUSED,
+                       getattr(errno, "ESTALE", errno.EIO)}
+
+# Mounts whose probe stalled and has not returned yet; not probed again until it does
+_stalled_mounts = set()
+_stalled_lock = threading.Lock()
+
+
+def probe_path(path):
+    """Checks one path with a single stat; may block for as long as its file system does."""
+    try:
+        os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return MISSING
+    except PermissionError:
+        return OK  # It exists, we just cannot look inside
+    except OSError as e:
+        return UNREACHABLE if e.errno in _UNREACHABLE_ERRNOS else MISSING
+    return OK
+
+
+def read_mount_points():
+    """Mount points from /proc/self/mounts, longest first; empty where there is no such file.
+
+    Reading the mount table never touches the mounted file systems themselves.
+    """
+    try:
+        with open("/proc/self/mounts", "r", encoding='utf-8') as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    mounts = set()
+    for line in lines:
+        fields = line.split()
+        if len(fields) > 1:
+            # Spaces and other special characters are escaped as octal
+            mounts.add(fields[1].encode('latin-1').decode('unicode_escape'))
+    return sorted(mounts, key=len, reverse=True)
+
+
+def mount_point(path, mounts):
+    """The mount a path lives on, from the mount table or, failing that, its leading components."""
+    for mount in mounts:
+        if path == mount or path.startswith(mount.rstrip("/") + "/"):
+            return mount
+    drive, rest = os.path.splitdrive(path)
+    if drive:
+        return drive  # Drive letter or //server/share
+    parts = rest.split("/")
+    if len(parts) > 2 and parts[1] in ("Volumes", "mnt", "media", "net", "Network"):
+        return "/".join(parts[:3])
+    return "/"
+
+
+class PathHealthCache:
+    """Probe results with an expiry time, saved between runs.
+
+    Unreachable results expire sooner, since mounts tend to come back.
+    """
+    TTL = {OK: 15 * 60, MISSING: 15 * 60, UNREACHABLE: 2 * 60}
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "path-health.json")
+        self._entries = {}  # path -> (state, checked at)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # The checking thread and the GUI thread may both save
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self._entries.update((path, tuple(entry)) for path, entry in data.items())
+
+    def save(self):
+        with self._lock:
+            data = dict(self._entries)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, "w", encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                log.warning("Could not write path health cache %s: %s", self.path, e)
+
+    def get(self, path, now=None):
+        """The cached state of path, or None if unknown or expired."""
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        state, checked = entry
+        now = time.time() if now is None else now
+        return state if now - checked < self.TTL.get(state, 0) else None
+
+    def put_many(self, states, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._entries.update((path, (state, now)) for path, state in states.items())
+
+
+def probe_paths(paths, timeout=2.0, max_workers=8, cache=None, on_results=None, mounts=None):
+    """Returns {path: OK | MISSING | UNREACHABLE} without ever waiting on a dead mount for long.
+
+    Paths are grouped by mount and each group is checked in order on its own
+    daemon thread, at most max_workers groups at a time. When a group makes no
+    progress for timeout seconds, the path it is stuck on and everything left
+    in the group are reported unreachable and the thread is abandoned to the
+    kernel; being a daemon thread it cannot keep the process alive. Until
+    that thread returns, later calls report the mount's paths unreachable
+    without probing, so a dead mount never ties up more than one thread.
+    Fresh cached results are used without probing. Remote projects are left out.
+    on_results, if given, receives each group's results as soon as they are
+    known.
+    """
+    results = {}
+    todo = []
+    for path in paths:
+        if is_remote(path):
+            continue  # Lives on another machine; only VSCode can reach it
+        state = cache.get(path) if cache is not None else None
+        if state is None:
+            todo.append(path)
+        else:
+            results[path] = state
+    metrics.count("path_health.cached", len(results))
+    metrics.count("path_health.probed", len(todo))
+    if on_results and results:
+        on_results(dict(results))
+
+    groups = {}
+    mounts = read_mount_points() if mounts is None else mounts
+    for path in todo:
+        groups.setdefault(mount_point(path, mounts), []).append(path)
+    with _stalled_lock:
+        stalled = _stalled_mounts.intersection(groups)
+    for mount in stalled:
+        skipped = dict.fromkeys(groups.pop(mount), UNREACHABLE)
+        metrics.count("path_health.skipped_stalled", len(skipped))
+        results.update(skipped)
+        if on_results:
+            on_results(skipped)
+
+    condition = threading.Condition()
+    waiting = list(groups.items())
+    active = []  # [group paths, group results, time of last progress, mount]
+
+    def work(group):
+        paths, states, _, mount = group
+        for path in paths:
+            state = probe_path(path)
+            with condition:
+                if group[0] is not paths:
+                    break  # Given up on while this thread was stuck
+                states[path] = state
+                group[2] = time.monotonic()
+                condition.notify()
+        else:
+            return
+        # The mount answered at last, so the next check may probe it again
+        with _stalled_lock:
+            _stalled_mounts.discard(mount)
+
+    with condition:
+        while waiting or active:
+            while waiting and len(active) < max_workers:
+                mount, paths = waiting.pop()
+                group = [paths, {}, time.monotonic(), mount]
+                active.append(group)
+                threading.Thread(target=work, args=(group,), daemon=True).start()
+            condition.wait(min(timeout, 0.1))
+            now = time.monotonic()
+            for group in list(active):
+                paths, states, last_progress, mount = group
+                done = len(states) == len(paths)
+                if not done and now - last_progress < timeout:
+                    continue
+                active.remove(group)
+                finished = dict(states)
+                if not done:
+                    # Stalled: the rest of this mount cannot be reached either
+                    finished.update((path, UNREACHABLE) for path in paths if path not in finished)
+                    group[0] = ()  # The stuck thread stops at its next path, if it ever returns
+                    with _stalled_lock:
+                        _stalled_mounts.add(mount)
+                    metrics.count("path_health.stalled_mounts")
+                    log.warning("No answer from %s for %.1f s; marking %d paths unreachable",
+                                mount, timeout, len(paths) - len(states))
+                results.update(finished)
+                if cache is not None:
+                    cache.put_many(finished)
+                if on_results:
+                    on_results(finished)
+    return results
+
+
+class PrunedPaths:
+    """Projects the user removed from the list; VSCode's own history is left alone."""
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "pruned-projects.json")
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding='utf-8') as f:
+                paths = json.load(f)
+        except FileNotFoundError:
+            return set()
+        except (OSError, ValueError) as e:
+            log.warning("Ignoring unreadable pruned projects file %s: %s", self.path, e)
+            return set()
+        return set(paths) if isinstance(paths, list) else set()
+
+    def add(self, paths):
+        pruned = self.load()
+        pruned.update(paths)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(tmp_path, "w", encoding='utf-8') as f:
+            json.dump(sorted(pruned), f, indent=1)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,93 @@
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, QProcess, pyqtSignal
+from instrumentation import metrics
+from vscode_uri import launch_arguments
+
+
+class ProjectLauncher(QObject):
+    """Opens projects in VSCode without blocking the GUI thread.
+
+    Every launch is a QProcess running the editor's command line wrapper.
+    Paths are queued and at most max_running wrappers run at once, so opening
+    a large selection spawns them a few at a time instead of all together.
+    Failures, whether the command is missing or exits with an error, are
+    reported through the failed signal. The time from a request to the
+    wrapper exiting, queueing included, is recorded as the launch metric.
+    """
+    launched = pyqtSignal(str)  # path
+    failed = pyqtSignal(str, str)  # path, error message
+    idle = pyqtSignal()  # queue drained and nothing running
+
+    def __init__(self, command=("code", "--new-window"), max_running=3, parent=None):
+        super().__init__(parent)
+        self.command = list(command)
+        self.max_running = max_running
+        self._queue = deque()
+        self._running = {}  # QProcess -> path
+        self._requested = {}  # path -> perf_counter time it was requested
+
+    def open(self, paths):
+        """Queue paths for opening; paths already queued or opening are skipped."""
+        pending = set(self._queue).union(self._running.values())
+        for path in paths:
+            if path and path not in pending:
+                pending.add(path)
+                self._queue.append(path)
+                self._requested[path] = time.perf_counter()
+        self._start_next()
+
+    def pending_count(self):
+        """Number of projects queued or still being launched."""
+        return len(self._queue) + len(self._running)
+
+    def shutdown(self, timeout_ms=2000):
+        """Drop queued launches and give running ones a moment to hand over to the editor."""
+        self._queue.clear()
+        self._requested.clear()
+        for process in list(self._running):
+            process.waitForFinished(timeout_ms)
+
+    def _start_next(self):
+        while self._queue and len(self._running) < self.max_running:
+            path = self._queue.popleft()
+            process = QProcess(self)
+            process.finished.connect(self._on_finished)
+            process.errorOccurred.connect(self._on_error)
+            self._running[process] = path
+            process.start(self.command[0], self.command[1:] + launch_arguments(path))
+
+    def _on_error(self, error):
+        process = self.sender()
+        if error == QProcess.FailedToStart and process in self._running:
+            # No finished signal follows a failed start
+            path = self._running.pop(process)
+            self._record(path, False)
+            self.failed.emit(path, f"Could not run '{self.command[0]}': {process.errorString()}")
+            self._done(process)
+
+    def _on_finished(self, exit_code, exit_status):
+        process = self.sender()
+        path = self._running.pop(process, None)
+        if path is None:
+            return
+        ok = exit_status == QProcess.NormalExit and exit_code == 0
+        self._record(path, ok)
+        if ok:
+            self.launched.emit(path)
+        else:
+            error = bytes(process.readAllStandardError()).decode(errors='replace').strip()
+            self.failed.emit(path, error or f"'{self.command[0]}' exited with code {exit_code}")
+        self._done(process)
+
+    def _record(self, path, ok):
+        start = self._requested.pop(path, None)
+        metrics.count("launch.ok" if ok else "launch.failed")
+        if start is not None:
+            metrics.record_span("launch", start, time.perf_counter(), "launch", {"ok": ok})
+
+    def _done(self, process):
+        process.deleteLater()
+        self._start_next()
+        if not self._queue and not self._running:
+            self.idle.emit()
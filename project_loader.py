@@ -0,0 +1,139 @@
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+
+class ProjectLoadWorker(QThread):
+    """Runs a project collector off the GUI thread and streams the result in batches."""
+    batch_ready = pyqtSignal(int, object)  # generation, paths
+    collected = pyqtSignal(int, object)  # generation, all paths (when not streaming)
+    loaded = pyqtSignal(int, int)  # generation, total number of paths
+    failed = pyqtSignal(int, str)  # generation, error message
+
+    def __init__(self, generation, collect, batch_size=500, stream=True):
+        super().__init__()
+        self.generation = generation
+        self._collect = collect
+        self._batch_size = batch_size
+        self._stream = stream
+        self._cancelled = False
+
+    def cancel(self):
+        """Stop emitting batches; a collect already in progress is left to finish."""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            paths = self._collect()
+        except Exception as e:
+            if not self._cancelled:
+                self.failed.emit(self.generation, str(e))
+            return
+        if not self._stream:
+            if not self._cancelled:
+                self.collected.emit(self.generation, paths)
+                self.loaded.emit(self.generation, len(paths))
+            return
+        for start in range(0, len(paths), self._batch_size):
+            if self._cancelled:
+                return
+            self.batch_ready.emit(self.generation, paths[start:start + self._batch_size])
+        if not self._cancelled:
+            self.loaded.emit(self.generation, len(paths))
+
+
+class ProjectLoader(QObject):
+    """Loads projects on a background thread; starting a new load cancels the previous one.
+
+    start() streams the result through batch_ready for a fresh list, refresh()
+    delivers it in one piece through refreshed so it can be diffed against the
+    rows already shown. Every load gets a generation number and results from
+    older generations are dropped, so a reload never mixes rows from two runs.
+    Collectors share their discovery state and cache files, so only one runs
+    at a time: a load requested while a cancelled one is still collecting
+    waits for it, and of several such requests only the last one runs.
+    """
+    started = pyqtSignal()
+    batch_ready = pyqtSignal(object)
+    refreshed = pyqtSignal(object)
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, batch_size=500, parent=None):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self._generation = 0
+        self._worker = None
+        self._workers = set()  # Workers still running, kept alive until they finish
+        self._next = None  # (generation, collect, stream) waiting for a running worker
+
+    def is_loading(self):
+        return self._worker is not None or self._next is not None
+
+    def start(self, collect):
+        """Cancel any load in flight and start collecting with the given callable."""
+        self._start_worker(collect, stream=True)
+        self.started.emit()
+
+    def refresh(self, collect):
+        """Like start(), but deliver the whole result through refreshed."""
+        self._start_worker(collect, stream=False)
+
+    def _start_worker(self, collect, stream):
+        self.cancel()
+        self._generation += 1
+        if self._workers:
+            self._next = (self._generation, collect, stream)
+            return
+        self._run_worker(self._generation, collect, stream)
+
+    def _run_worker(self, generation, collect, stream):
+        worker = ProjectLoadWorker(generation, collect, self.batch_size, stream)
+        worker.batch_ready.connect(self._on_batch_ready)
+        worker.collected.connect(self._on_collected)
+        worker.loaded.connect(self._on_loaded)
+        worker.failed.connect(self._on_failed)
+        # QThread.finished fires once run() returns, including after a cancel
+        worker.finished.connect(self._on_worker_finished)
+        self._workers.add(worker)
+        self._worker = worker
+        worker.start()
+
+    def cancel(self):
+        """Cancel the current load, if any. Batches already queued are ignored."""
+        self._next = None
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def shutdown(self, timeout_ms=2000):
+        """Cancel and wait for background threads, e.g. before the application exits."""
+        self.cancel()
+        for worker in list(self._workers):
+            worker.wait(timeout_ms)
+
+    def _on_worker_finished(self):
+        self._workers.discard(self.sender())
+        if self._next is not None and not self._workers:
+            generation, collect, stream = self._next
+            self._next = None
+            self._run_worker(generation, collect, stream)
+
+    def _is_current(self, generation):
+        return self._worker is not None and generation == self._generation
+
+    def _on_batch_ready(self, generation, paths):
+        if self._is_current(generation):
+            self.batch_ready.emit(paths)
+
+    def _on_collected(self, generation, paths):
+        if self._is_current(generation):
+            self.refreshed.emit(paths)
+
+    def _on_loaded(self, generation, total):
+        if self._is_current(generation):
+            self._worker = None
+            self.finished.emit(total)
+
+    def _on_failed(self, generation, message):
+        if self._is_current(generation):
+            self._worker = None
+            self.failed.emit(message)
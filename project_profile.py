@@ -0,0 +1,287 @@
+import fnmatch
+import json
+import os
+import re
+import time
+from collections import Counter
+from app_paths import cache_dir
+from instrumentation import get_logger
+
+log = get_logger("profile")
+
+# Never worth walking: dependencies, virtual environments, build output and caches.
+# Directories starting with a dot (.git, .venv, .idea, ...) are skipped as well.
+SKIP_DIRS = frozenset({
+    "node_modules", "bower_components", "venv", "env", "__pycache__", "site-packages",
+    "dist", "build", "out", "target", "bin", "obj", "vendor", "Pods", "DerivedData",
+    "coverage", "htmlcov",
+})
+
+LANGUAGES = {
+    ".py": "Python", ".pyi": "Python", ".ipynb": "Python",
+    ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript", ".vue": "Vue", ".svelte": "Svelte",
+    ".go": "Go", ".rs": "Rust", ".java": "Java", ".kt": "Kotlin", ".kts": "Kotlin", ".scala": "Scala",
+    ".c": "C", ".h": "C", ".cpp": "C++", ".cc": "C++", ".cxx": "C++", ".hpp": "C++", ".hh": "C++",
+    ".cs": "C#", ".fs": "F#", ".rb": "Ruby", ".php": "PHP", ".swift": "Swift", ".m": "Objective-C",
+    ".dart": "Dart", ".lua": "Lua", ".r": "R", ".jl": "Julia", ".ex": "Elixir", ".exs": "Elixir",
+    ".erl": "Erlang", ".hs": "Haskell", ".clj": "Clojure", ".ml": "OCaml", ".zig": "Zig",
+    ".sh": "Shell", ".bash": "Shell", ".zsh": "Shell", ".ps1": "PowerShell",
+    ".html": "HTML", ".css": "CSS", ".scss": "CSS", ".sass": "CSS", ".less": "CSS",
+    ".tf": "Terraform", ".sql": "SQL", ".tex": "TeX",
+}
+
+# Names people type after lang: for languages whose own name is awkward to type
+LANGUAGE_ALIASES = {
+    "py": "python", "js": "javascript", "ts": "typescript", "rs": "rust", "golang": "go",
+    "cpp": "c++", "csharp": "c#", "cs": "c#", "fsharp": "f#", "sh": "shell", "rb": "ruby",
+    "kt": "kotlin", "objc": "objective-c", "tf": "terraform",
+}
+
+
+class ProjectProfile:
+    """Main language, rough file count and last change of one project folder."""
+    __slots__ = ("language", "files", "modified", "truncated")
+
+    def __init__(self, language, files, modified, truncated=False):
+        self.language = language  # None when no known source files were found
+        self.files = files
+        self.modified = modified  # Newest directory modification time, in seconds
+        self.truncated = truncated  # The walk stopped at its entry limit, so files is a lower bound
+
+    def __eq__(self, other):
+        return isinstance(other, ProjectProfile) and self.to_list() == other.to_list()
+
+    def __repr__(self):
+        return (f"ProjectProfile({self.language!r}, files={self.files}, modified={self.modified}, "
+                f"truncated={self.truncated})")
+
+    def label(self, now=None):
+        """Short text for the project list, e.g. 'Python · 1.2k files · 3d'."""
+        files = _rough_count(self.files) + ("+" if self.truncated else "")
+        parts = [self.language] if self.language else []
+        parts.append(f"{files} files")
+        if self.modified:
+            parts.append(_age((now or time.time()) - self.modified))
+        return " · ".join(parts)
+
+    def to_list(self):
+        return [self.language, self.files, self.modified, self.truncated]
+
+
+def _rough_count(count):
+    if count < 1000:
+        return str(count)
+    return f"{count / 1000:.1f}k" if count < 10000 else f"{count // 1000}k"
+
+
+def _age(seconds):
+    for unit, length in (("y", 365 * 86400), ("mo", 30 * 86400), ("d", 86400), ("h", 3600)):
+        if seconds >= length:
+            return f"{int(seconds // length)}{unit}"
+    return "now"
+
+
+def ignored_dir_patterns(path):
+    """Directory name patterns from the project's top-level .gitignore.
+
+    Only entries without a slash inside are used ('build/', '/dist', '*.egg-info');
+    they are matched against directory names at any depth, which is close
+    enough for counting files.
+    """
+    patterns = []
+    try:
+        with open(os.path.join(path, ".gitignore"), "r", encoding='utf-8', errors='replace') as f:
+            lines = f.read(65536).splitlines()
+    except OSError:
+        return patterns
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(("#", "!")):
+            continue
+        line = line.strip("/")
+        if line and "/" not in line and "**" not in line:
+            patterns.append(line)
+    return patterns
+
+
+def scan_project(path, max_depth=4, max_entries=20000):
+    """Walks path with os.scandir, at most max_depth levels and max_entries entries deep.
+
+    Returns (dirs, mtimes, profile): the directories visited, relative to
+    path, with their modification times, which key the result in the
+    manifest. Only directories are stat'ed; DirEntry types come with the
+    listing on most systems, so files cost no extra I/O. Raises OSError when
+    path itself cannot be listed.
+    """
+    patterns = ignored_dir_patterns(path)
+    languages = Counter()
+    files = entries = 0
+    dirs, mtimes = [], []
+    truncated = False
+    pending = [("", 0)]
+    while pending:
+        relative, depth = pending.pop()
+        directory = os.path.join(path, relative) if relative else path
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            listing = os.scandir(directory)
+        except OSError:
+            if not relative:
+                raise
+            continue
+        dirs.append(relative)
+        mtimes.append(mtime)
+        with listing:
+            for entry in listing:
+                entries += 1
+                if entries > max_entries:
+                    truncated = True
+                    break
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        name = entry.name
+                        if (depth + 1 < max_depth and not name.startswith(".") and name not in SKIP_DIRS
+                                and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns)):
+                            pending.append((os.path.join(relative, name) if relative else name, depth + 1))
+                    elif entry.is_file(follow_symlinks=False):
+                        files += 1
+                        language = LANGUAGES.get(os.path.splitext(entry.name)[1].lower())
+                        if language:
+                            languages[language] += 1
+                except OSError:
+                    continue
+        if truncated:
+            break
+    language = languages.most_common(1)[0][0] if languages else None
+    return dirs, mtimes, ProjectProfile(language, files, max(mtimes) / 1e9, truncated)
+
+
+def dir_mtimes(path, dirs):
+    """Current modification times of dirs (relative to path), None for those that are gone."""
+    mtimes = []
+    for relative in dirs:
+        try:
+            mtimes.append(os.stat(os.path.join(path, relative) if relative else path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+def refresh_profiles(jobs, max_depth=4, max_entries=20000):
+    """Brings manifest entries up to date; run in a worker process.
+
+    jobs is a list of (path, entry) with entry as stored in the manifest, or
+    None. An entry whose directories all kept their modification times still
+    holds, so only projects where something was added, removed or renamed are
+    walked again. Returns (path, entry) for those only; entry is None when
+    path could not be listed.
+    """
+    changed = []
+    for path, entry in jobs:
+        if entry is not None and dir_mtimes(path, entry[0]) == entry[1]:
+            continue
+        try:
+            dirs, mtimes, profile = scan_project(path, max_depth, max_entries)
+        except OSError:
+            changed.append((path, None))
+            continue
+        changed.append((path, [dirs, mtimes, profile.to_list()]))
+    return changed
+
+
+_FILTER = re.compile(r"(?<!\S)(lang|files|modified):([<>]?)(\S+)", re.IGNORECASE)
+_AGE = re.compile(r"(\d+(?:\.\d+)?)(h|d|w|m|mo|y)?$", re.IGNORECASE)
+_AGE_UNITS = {"h": 3600, "d": 86400, "w": 7 * 86400, "m": 30 * 86400, "mo": 30 * 86400, "y": 365 * 86400}
+
+
+def parse_filters(text, now=None):
+    """Splits profile filters out of a search, e.g. 'lang:python files:>100 modified:<2w api'.
+
+    Returns the rest of the query and a predicate over ProjectProfile, or
+    None when text has no filters. lang: matches the main language (or an
+    alias such as py or ts), files: the file count (>N by default) and
+    modified: the time since the last change (<N by default, in h, d, w, m
+    or y). Tokens that do not parse are left in the query.
+    """
+    now = now or time.time()
+    checks = []
+
+    def take(match):
+        key, op, value = match.group(1).lower(), match.group(2), match.group(3).lower()
+        if key == "lang":
+            value = LANGUAGE_ALIASES.get(value, value)
+            checks.append(lambda profile: (profile.language or "").lower() == value)
+        elif key == "files":
+            if not value.isdigit():
+                return match.group(0)
+            count = int(value)
+            if op == "<":
+                checks.append(lambda profile: profile.files < count)
+            else:
+                checks.append(lambda profile: profile.files > count)
+        else:
+            age = _AGE.match(value)
+            if age is None:
+                return match.group(0)
+            since = now - float(age.group(1)) * _AGE_UNITS[(age.group(2) or "d").lower()]
+            if op == ">":
+                checks.append(lambda profile: profile.modified < since)
+            else:
+                checks.append(lambda profile: profile.modified >= since)
+        return ""
+
+    query = _FILTER.sub(take, text)
+    if not checks:
+        return text, None
+    return query, lambda profile: profile is not None and all(check(profile) for check in checks)
+
+
+class ProfileManifest:
+    """Project profiles with the directory modification times they were computed from.
+
+    Saved between runs, so that a repeat run only stats the directories of
+    each project and walks the ones that changed. Used from the GUI thread
+    only; the checks themselves run in refresh_profiles().
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "project-profiles.json")
+        self._entries = {}  # path -> [dirs, mtimes, profile list]
+        self._dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self._entries.update(data)
+
+    def save(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("Could not write project profile manifest %s: %s", self.path, e)
+
+    def entry(self, path):
+        return self._entries.get(path)
+
+    def profile(self, path):
+        entry = self._entries.get(path)
+        return None if entry is None else ProjectProfile(*entry[2])
+
+    def put(self, path, entry):
+        if entry is None:
+            if self._entries.pop(path, None) is not None:
+                self._dirty = True
+        else:
+            self._entries[path] = entry
+            self._dirty = True
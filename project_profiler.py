@@ -0,0 +1,89 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+from project_profile import ProfileManifest, ProjectProfile, refresh_profiles
+from instrumentation import get_logger, metrics
+
+log = get_logger("profile")
+
+
+class ProjectProfiler(QObject):
+    """Profiles project folders (main language, file count, last change) on a process pool.
+
+    Walking a tree is Python-bound once the directories are in the OS cache,
+    so it runs in worker processes rather than threads and never holds the
+    GIL the GUI needs. At most max_workers folders are walked at once, a
+    chunk of projects per task. Profiles already in the manifest are
+    delivered right away; the workers only stat their directories and walk
+    again where something changed. Each path is checked once per session.
+    Results arrive through profiles_ready as {path: ProjectProfile or None}.
+    """
+    profiles_ready = pyqtSignal(object)
+    _chunk_done = pyqtSignal(object, object)  # From the pool's callback thread: future, jobs
+
+    def __init__(self, max_workers=2, chunk_size=16, manifest=None, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.manifest = manifest or ProfileManifest()
+        self.manifest.load()
+        self._pool = None  # Started by the first request
+        self._checked = set()
+        self._futures = set()
+        self._closed = False
+        self._chunk_done.connect(self._on_chunk_done)
+
+    def profile(self, paths):
+        """Queue paths not checked yet this session."""
+        paths = [path for path in paths if path not in self._checked]
+        if not paths or self._closed:
+            return
+        self._checked.update(paths)
+        known = {path: self.manifest.profile(path) for path in paths if self.manifest.entry(path) is not None}
+        if known:
+            self.profiles_ready.emit(known)
+        if self._pool is None:
+            # Spawned rather than forked: forking a process with Qt's threads running is not safe
+            self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        for start in range(0, len(paths), self.chunk_size):
+            jobs = [(path, self.manifest.entry(path)) for path in paths[start:start + self.chunk_size]]
+            future = self._pool.submit(refresh_profiles, jobs)
+            self._futures.add(future)
+            future.add_done_callback(lambda future, jobs=jobs: self._emit_done(future, jobs))
+
+    def is_running(self):
+        return bool(self._futures)
+
+    def shutdown(self):
+        """Drop waiting chunks and save the manifest; a chunk being walked finishes on its own."""
+        self._closed = True
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self.manifest.save()
+
+    def _emit_done(self, future, jobs):
+        # Runs on the pool's management thread; the signal is queued to the GUI thread
+        if self._closed or future.cancelled():
+            return
+        try:
+            self._chunk_done.emit(future, jobs)
+        except RuntimeError:
+            self._closed = True  # Deleted on the GUI thread while profiling
+
+    def _on_chunk_done(self, future, jobs):
+        self._futures.discard(future)
+        try:
+            changed = future.result()
+        except Exception as e:
+            log.warning("Could not profile %d projects: %s", len(jobs), e)
+            return
+        metrics.count("profile.unchanged", len(jobs) - len(changed))
+        metrics.count("profile.walked", len(changed))
+        profiles = {}
+        for path, entry in changed:
+            self.manifest.put(path, entry)
+            profiles[path] = None if entry is None else ProjectProfile(*entry[2])
+        if profiles:
+            self.profiles_ready.emit(profiles)
+        if not self._futures:
+            self.manifest.save()
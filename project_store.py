@@ -0,0 +1,137 @@
+import os
+import re
+from array import array
+from itertools import repeat
+from operator import add, itemgetter
+from vscode_uri import is_remote
+
+# Local paths use the platform's separator; remote URIs always use "/"
+_LOCAL_SEP = os.sep
+# A directory name followed by the separator, or a trailing name without one
+_SEGMENT = {sep: re.compile(f"[^{re.escape(sep)}]*{re.escape(sep)}|[^{re.escape(sep)}]+") for sep in ("/", "\\")}
+
+
+def _separator(path):
+    return "/" if is_remote(path) else _LOCAL_SEP
+
+
+class ProjectStore:
+    """Every project path the window knows, each held once, addressed by record id.
+
+    A path is split at its last separator into the parent directory and the
+    folder name; remote URIs are split at "/" on every platform. Parent directories are interned in a prefix trie: each node
+    is one directory level and keeps its full prefix string, shared by every
+    project below it. A record is then just the id of its parent node, in an
+    array, and the folder name. The lowercased name is only stored
+    separately when it differs, so most records cost a name string, a list
+    slot and four bytes.
+
+    The list model, the search index and the ranking all pass record ids
+    around; path strings are put back together only when one is needed,
+    e.g. for a tooltip or to launch the project. Ids are stable: adding a
+    path again returns the id it already has. Records are never removed, so
+    a reloaded list reuses the ids of the previous one.
+    """
+    def __init__(self):
+        self.prefixes = [""]  # node -> full directory prefix, ending with the separator
+        self.lower_prefixes = [""]  # node -> lowercased prefix, the same object when unchanged
+        self._node_children = [{}]  # node -> {segment: child node}
+        self._node_of_dir = {}  # Prefix without its final separator -> node, except for "/" and ""
+        self._records_in = [{}]  # node -> {folder name: record id}
+        self.nodes = array('I')  # record -> parent node
+        self.names = []  # record -> folder name
+        self.lower_names = []  # record -> lowercased folder name, the same object when unchanged
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, path):
+        """Returns the record id of path, adding it if it is new."""
+        return self.add_many([path])[0]
+
+    def add_many(self, paths):
+        """Returns the record ids of paths, adding the new ones.
+
+        Known paths, all of them on a reload, are looked up without a
+        Python-level loop; only new directories and records are added one
+        at a time.
+        """
+        seps = repeat("/") if _LOCAL_SEP == "/" else map(_separator, paths)
+        parts = list(map(str.rpartition, paths, seps))
+        heads = list(map(itemgetter(0), parts))
+        names = list(map(itemgetter(2), parts))
+        nodes = list(map(self._node_of_dir.get, heads))
+        if None in nodes:
+            nodes = [self._add_dir(head, sep) if sep else 0 if node is None else node
+                     for node, (head, sep, _) in zip(nodes, parts)]
+        records = list(map(dict.get, map(self._records_in.__getitem__, nodes), names))
+        if None in records:
+            start = len(self.names)
+            for i, record in enumerate(records):
+                if record is None:
+                    in_node = self._records_in[nodes[i]]
+                    name = names[i]
+                    record = in_node.get(name)  # Listed twice in paths
+                    if record is None:
+                        record = in_node[name] = len(self.names)
+                        self.nodes.append(nodes[i])
+                        self.names.append(name)
+                    records[i] = record
+            added = self.names[start:]
+            self.lower_names.extend(name if lower == name else lower
+                                    for name, lower in zip(added, map(str.lower, added)))
+        return records
+
+    def _add_dir(self, head, sep):
+        node = self._node_of_dir.get(head)
+        if node is not None:
+            return node
+        node = 0
+        for segment in _SEGMENT[sep].findall(head + sep):
+            children = self._node_children[node]
+            child = children.get(segment)
+            if child is None:
+                child = children[segment] = len(self.prefixes)
+                full = self.prefixes[node] + segment
+                lower = full.lower()
+                self.prefixes.append(full)
+                self.lower_prefixes.append(full if lower == full else lower)
+                self._node_children.append({})
+                self._records_in.append({})
+                if full.endswith(sep) and full != sep:
+                    self._node_of_dir[full[:-len(sep)]] = child
+            node = child
+        return node
+
+    def id_of(self, path):
+        """Returns the record id of path, or None if it was never added."""
+        head, sep, name = path.rpartition(_separator(path))
+        if not sep:
+            node = 0
+        elif head:
+            node = self._node_of_dir.get(head)
+        else:
+            node = self._node_children[0].get(sep)  # Directly below the root
+        return None if node is None else self._records_in[node].get(name)
+
+    def path(self, record):
+        return self.prefixes[self.nodes[record]] + self.names[record]
+
+    def paths(self, records):
+        prefixes = map(self.prefixes.__getitem__, map(self.nodes.__getitem__, records))
+        return list(map(add, prefixes, map(self.names.__getitem__, records)))
+
+    def lower_paths(self, records):
+        """Iterates over the lowercased paths of records (a sequence), built on the fly."""
+        lower_prefixes = map(self.lower_prefixes.__getitem__, map(self.nodes.__getitem__, records))
+        return map(add, lower_prefixes, map(self.lower_names.__getitem__, records))
+
+    def presence(self, records, char):
+        """A big-endian integer with one byte per record, 1 where its lowercased path contains char.
+
+        Each directory prefix is checked once, not once per project below it.
+        """
+        in_prefix = bytes([char in prefix for prefix in self.lower_prefixes])
+        in_prefixes = bytes(map(in_prefix.__getitem__, map(self.nodes.__getitem__, records)))
+        in_names = bytes(map(str.__contains__, map(self.lower_names.__getitem__, records), repeat(char)))
+        return int.from_bytes(in_prefixes, 'big') | int.from_bytes(in_names, 'big')
@@ -0,0 +1,212 @@
+import os
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from operator import contains, eq, not_
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, QRect, QSize, QTimer
+from PyQt5.QtGui import QPainter
+from PyQt5.QtWidgets import QStyle
+from ui_components import ProjectItemDelegate
+from instrumentation import metrics
+
+FOLDER = "folder"
+EDITOR = "editor"
+
+
+class ProjectTreeModel(QAbstractItemModel):
+    """The rows of a ProjectListModel grouped by parent directory or by editor.
+
+    Groups are computed from the list model's visible records, so the search
+    filter and hidden projects carry over and a group is only shown while it
+    has matches. Grouping by folder uses the ProjectStore's directory nodes
+    as keys, which costs a Counter over an array. A group starts out without
+    child rows: they are created by fetchMore when the view expands it, so a
+    collapsed group costs a label and a count however many projects it holds.
+    Child rows are answered by the list model itself.
+    """
+    GroupCountRole = Qt.UserRole + 10  # Number of projects in a group row
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.grouping = None  # FOLDER, EDITOR, or None while the tree is not shown
+        self._keys = []  # Group row -> directory node or editor name
+        self._counts = []  # Group row -> number of visible projects in it
+        self._children = {}  # Group row -> array of records, once the group was expanded
+        self._home = os.path.expanduser("~")
+        # Streamed batches and synced moves arrive a row range at a time; regroup once after them
+        self._regroup_timer = QTimer(self)
+        self._regroup_timer.setSingleShot(True)
+        self._regroup_timer.setInterval(0)
+        self._regroup_timer.timeout.connect(self.regroup)
+        source.modelReset.connect(self.regroup)
+        for signal in (source.rowsInserted, source.rowsRemoved, source.rowsMoved):
+            signal.connect(self._schedule_regroup)
+        source.dataChanged.connect(self._source_data_changed)
+
+    def set_grouping(self, grouping):
+        if grouping != self.grouping:
+            self.grouping = grouping
+            self.regroup()
+
+    def regroup(self):
+        """Recompute the groups from the list model's visible rows; every group starts collapsed."""
+        self._regroup_timer.stop()
+        self.beginResetModel()
+        self._children = {}
+        counts = {}
+        if self.grouping is not None:
+            with metrics.span("tree.group", "ui", grouping=self.grouping) as args:
+                records = self.source.visible_ids()
+                if self.grouping == FOLDER:
+                    counts = Counter(map(self.source.store.nodes.__getitem__, records))
+                else:
+                    # Few distinct editor tuples, so count those first
+                    counts = Counter()
+                    for editors, count in Counter(self.source.editors_of(records)).items():
+                        for editor in editors or ("",):
+                            counts[editor] += count
+                args["groups"] = len(counts)
+        self._keys = list(counts)
+        self._counts = list(counts.values())
+        self.endResetModel()
+
+    def _schedule_regroup(self, *args):
+        if self.grouping is not None:
+            self._regroup_timer.start()
+
+    def _source_data_changed(self, top_left, bottom_right, roles=()):
+        if self.grouping is None:
+            return
+        if self.grouping == EDITOR and (not roles or self.source.OriginRole in roles):
+            self._schedule_regroup()
+            return
+        for row, records in self._children.items():
+            if records:
+                group = self.index(row, 0)
+                self.dataChanged.emit(self.index(0, 0, group), self.index(len(records) - 1, 0, group), roles)
+
+    def group_key(self, index):
+        """The directory node or editor name of a group row, None for a project row."""
+        if not index.isValid() or index.internalId():
+            return None
+        return self._keys[index.row()]
+
+    def group_rows(self, keys):
+        """Rows of the groups among keys that are currently shown."""
+        return [row for row, key in enumerate(self._keys) if key in keys]
+
+    def _members(self, key):
+        records = self.source.visible_ids()
+        if self.grouping == FOLDER:
+            in_group = map(eq, map(self.source.store.nodes.__getitem__, records), repeat(key))
+        elif key:
+            in_group = map(contains, self.source.editors_of(records), repeat(key))
+        else:
+            in_group = map(not_, self.source.editors_of(records))
+        return array('I', compress(records, in_group))
+
+    def _label(self, key):
+        if self.grouping == EDITOR:
+            return key or "Unknown editor"
+        folder = self.source.store.prefixes[key]
+        if len(folder) > 1 and folder.endswith(os.sep) and not folder.endswith(":" + os.sep):
+            folder = folder[:-len(os.sep)]
+        if folder == self._home or folder.startswith(self._home + os.sep):
+            folder = "~" + folder[len(self._home):]
+        return folder or "."
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        # A project row's internal id is its group's row plus one; groups have 0
+        return self.createIndex(row, column, parent.row() + 1 if parent.isValid() else 0)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()  # QObject.parent()
+        if not index.isValid() or not index.internalId():
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._keys)
+        if parent.internalId():
+            return 0
+        return len(self._children.get(parent.row(), ()))
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self._keys)
+        return not parent.internalId()
+
+    def canFetchMore(self, parent):
+        return parent.isValid() and not parent.internalId() and parent.row() not in self._children
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        records = self._members(self._keys[parent.row()])
+        if not records:
+            self._children[parent.row()] = records
+            return
+        self.beginInsertRows(parent, 0, len(records) - 1)
+        self._children[parent.row()] = records
+        self.endInsertRows()
+
+    def flags(self, index):
+        if index.isValid() and not index.internalId():
+            return Qt.ItemIsEnabled  # Groups open and close, only projects are selected
+        return super().flags(index)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        group = index.internalId()
+        if group:
+            return self.source.record_data(self._children[group - 1][index.row()], role)
+        if role == Qt.DisplayRole:
+            return self._label(self._keys[index.row()])
+        if role == self.GroupCountRole:
+            return self._counts[index.row()]
+        if role == Qt.ToolTipRole and self.grouping == FOLDER:
+            return self.source.store.prefixes[self._keys[index.row()]]
+        return None
+
+
+class ProjectTreeDelegate(ProjectItemDelegate):
+    """Paints group rows as a one-line header with a count, and projects as the list does."""
+    GROUP_HEIGHT = 30
+
+    def sizeHint(self, option, index):
+        if index.parent().isValid():
+            return super().sizeHint(option, index)
+        return QSize(option.rect.width(), self.GROUP_HEIGHT)
+
+    def paint(self, painter, option, index):
+        if index.parent().isValid():
+            super().paint(painter, option, index)
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = option.rect
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.HOVER_COLOR)
+            painter.drawRoundedRect(rect, 4, 4)
+        inner = rect.adjusted(self.TEXT_PADDING_H // 2, 0, -self.MARGIN_H, 0)
+        count = f"{index.data(ProjectTreeModel.GroupCountRole)}"
+        count_width = self._path_metrics.width(count)
+        painter.setFont(self.path_font)
+        painter.setPen(self.PATH_COLOR)
+        painter.drawText(inner, Qt.AlignRight | Qt.AlignVCenter, count)
+        label_rect = QRect(inner.left(), inner.top(), inner.width() - count_width - self.SPACING, inner.height())
+        label = self._name_metrics.elidedText(index.data(Qt.DisplayRole) or "", Qt.ElideMiddle, label_rect.width())
+        painter.setFont(self.name_font)
+        painter.setPen(self.NAME_COLOR)
+        painter.drawText(label_rect, Qt.AlignLeft | Qt.AlignVCenter, label)
+        painter.restore()
@@ -0,0 +1,182 @@
+import ctypes
+import ctypes.util
+import gc
+import os
+import platform
+from PyQt5.QtCore import QObject, QEvent, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QPixmapCache
+from PyQt5.QtNetwork import QLocalServer
+from PyQt5.QtWidgets import QAction, QMenu, QStyle, QSystemTrayIcon
+from app_paths import instance_socket_path
+from single_instance import SHOW_REPLY, SHOW_REQUEST
+from instrumentation import get_logger, metrics
+
+log = get_logger("resident")
+
+
+def current_rss():
+    """Resident memory of this process in bytes, or None where it cannot be read cheaply."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if platform.system() == 'Darwin' else peak * 1024  # Peak, not current
+
+
+def release_free_memory():
+    """Hands freed heap pages back to the system where the C library allows it."""
+    gc.collect()
+    if platform.system() != 'Linux':
+        return
+    libc_name = ctypes.util.find_library("c")
+    try:
+        ctypes.CDLL(libc_name).malloc_trim(0)  # glibc only
+    except (OSError, AttributeError):
+        pass
+
+
+class InstanceServer(QObject):
+    """Listens for later launches asking this window to show itself."""
+    show_requested = pyqtSignal()
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.path = path or instance_socket_path()
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_connection)
+
+    def listen(self):
+        """Starts listening; returns False if the socket cannot be taken."""
+        if platform.system() != 'Windows':
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        # main.py only gets here when nothing answered, so a leftover socket is stale
+        QLocalServer.removeServer(self.path)
+        if not self._server.listen(self.path):
+            log.warning("Could not listen on %s: %s", self.path, self._server.errorString())
+            return False
+        return True
+
+    def close(self):
+        self._server.close()
+
+    def _on_connection(self):
+        while self._server.hasPendingConnections():
+            connection = self._server.nextPendingConnection()
+            connection.readyRead.connect(lambda c=connection: self._on_ready_read(c))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def _on_ready_read(self, connection):
+        if not connection.canReadLine():
+            return
+        if bytes(connection.readLine()) == SHOW_REQUEST:
+            self.show_requested.emit()
+            connection.write(SHOW_REPLY)
+            connection.flush()
+        connection.disconnectFromServer()
+
+
+class ResidentController(QObject):
+    """Keeps the window, model and search index alive in the tray between uses.
+
+    Closing the window only hides it. Once it has been hidden for
+    IDLE_TRIM_MS, caches that grow with use are dropped and freed memory is
+    handed back, and the resulting footprint is logged and shown in the
+    tray tooltip. Memory above the configured limit after trimming is
+    reported as a warning.
+    """
+    IDLE_TRIM_MS = 60 * 1000
+
+    def __init__(self, app, window, memory_limit_mb=None, parent=None):
+        super().__init__(parent)
+        self.app = app
+        self.window = window
+        self.memory_limit_mb = memory_limit_mb
+        self.idle_rss = None
+        window.resident = True
+        app.setQuitOnLastWindowClosed(False)
+
+        self.trim_timer = QTimer(self)
+        self.trim_timer.setSingleShot(True)
+        self.trim_timer.setInterval(self.IDLE_TRIM_MS)
+        self.trim_timer.timeout.connect(self.trim)
+        window.installEventFilter(self)
+
+        self.tray = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            icon = window.style().standardIcon(QStyle.SP_DirIcon)
+            self.tray = QSystemTrayIcon(icon, self)
+            menu = QMenu()
+            for text, slot in (("Show", window.show_switcher), ("Reload", window.load_recent_projects),
+                               (None, None), ("Quit", self.quit)):
+                if text is None:
+                    menu.addSeparator()
+                    continue
+                action = QAction(text, menu)
+                action.triggered.connect(slot)
+                menu.addAction(action)
+            self.tray_menu = menu
+            self.tray.setContextMenu(menu)
+            self.tray.activated.connect(self._on_tray_activated)
+            self.tray.setToolTip(window.windowTitle())
+            self.tray.show()
+        else:
+            log.warning("No system tray available; launch the toolbox again to show the window.")
+
+    def prewarm(self):
+        """Lays out and paints the window once off screen, so the first real show is instant."""
+        self.window.setAttribute(Qt.WA_DontShowOnScreen, True)
+        self.window.show()
+        self.app.processEvents()
+        self.window.hide()
+        self.window.setAttribute(Qt.WA_DontShowOnScreen, False)
+
+    def quit(self):
+        self.window.quitting = True
+        self.window.close()
+        if self.tray is not None:
+            self.tray.hide()
+        self.app.quit()
+
+    def trim(self):
+        """Drops caches of a hidden window and reports what the process holds on to."""
+        if self.window.isVisible():
+            return
+        before = current_rss()
+        self.window.trim_memory()
+        QPixmapCache.clear()
+        release_free_memory()
+        self.idle_rss = current_rss()
+        if self.idle_rss is None:
+            return
+        message = f"Idle memory: {self.idle_rss / 2**20:.1f} MB"
+        if before is not None:
+            message += f" (trimmed from {before / 2**20:.1f} MB)"
+        metrics.observe("memory.idle_rss", self.idle_rss / 2**20, "MB")
+        log.info(message, extra={"fields": {"rss_mb": round(self.idle_rss / 2**20, 1)}})
+        if self.tray is not None:
+            self.tray.setToolTip(f"{self.window.windowTitle()}\n{message}")
+        if self.memory_limit_mb and self.idle_rss > self.memory_limit_mb * 2**20:
+            log.warning("Idle memory is above the %s MB limit; "
+                        "consider pruning projects or restarting the toolbox.", self.memory_limit_mb)
+
+    def eventFilter(self, obj, event):
+        if obj is self.window:
+            if event.type() == QEvent.Hide:
+                self.trim_timer.start()
+            elif event.type() == QEvent.Show:
+                self.trim_timer.stop()
+        return super().eventFilter(obj, event)
+
+    def _on_tray_activated(self, reason):
+        if reason == QSystemTrayIcon.Trigger:
+            if self.window.isVisible() and self.window.isActiveWindow():
+                self.window.hide()
+            else:
+                self.window.show_switcher()
@@ -0,0 +1,274 @@
+from array import array
+from bisect import bisect_left
+from itertools import chain, compress, filterfalse, islice
+import re
+from project_store import ProjectStore
+
+# Characters after which a match counts as the start of a word
+WORD_SEPARATORS = frozenset("/\\-_. ")
+
+
+class SearchIndex:
+    """Fuzzy search over project folder names and full paths.
+
+    Projects are record ids in a ProjectStore, which supplies their
+    lowercased paths and names. A per-character presence mask is built the
+    first time a character is queried. A mask holds one byte (0 or 1) per
+    project, so masks combine with a single integer AND and feed straight
+    into itertools.compress.
+
+    A query first narrows the candidates with those masks, then confirms the
+    subsequence match with a compiled pattern and finally ranks the survivors.
+    When the query extends the previous one and all of its matches were
+    found, those are the candidates instead, and only the terms that changed
+    are confirmed again.
+
+    Small result sets are scored one by one. Large ones (short, broad queries)
+    only get the folder names that start with the query moved to the front,
+    found through a sorted prefix index over the names; the rest keep the
+    list's own order. That order needs no look at the rest, so iter_ids()
+    confirms candidates a chunk at a time and only as far as the ranking and
+    the caller's reading require.
+    """
+    # Above this many matches only the prefix index is used for ranking
+    RANK_LIMIT = 1500
+    # Candidates confirmed at a time; a broad query stops after the first few chunks
+    VERIFY_CHUNK = 2048
+
+    def __init__(self, paths=(), store=None):
+        self.store = store if store is not None else ProjectStore()
+        self.set_paths(paths)
+
+    def __len__(self):
+        return len(self._records)
+
+    def set_paths(self, paths):
+        """Index a new list of paths, replacing the previous one."""
+        self.set_ids(self.store.add_many(paths))
+
+    def set_ids(self, records):
+        """Index a new list of store records, replacing the previous one.
+
+        Nothing is computed until the first search, so setting the list
+        costs nothing until someone actually types.
+        """
+        self._records = array('I', records)
+        self.trim()
+
+    def trim(self):
+        """Drop the per-character masks and query caches; they are rebuilt as needed."""
+        self._masks = {}
+        self._prefix_index = None
+        self._name_lengths = None  # Record -> length of its folder name, next to the prefix index
+        self._last_terms = None
+        self._last_matches = None
+
+    def add_paths(self, paths):
+        """Index additional paths appended after the existing ones."""
+        self.add_ids(self.store.add_many(paths))
+
+    def add_ids(self, records):
+        """Index additional store records appended after the existing ones."""
+        if not records:
+            return
+        records = array('I', records)
+        self._records.extend(records)
+        # Masks are big-endian, so appending entries is a shift plus the new bytes
+        for char, mask in self._masks.items():
+            self._masks[char] = (mask << (8 * len(records))) | self.store.presence(records, char)
+        self._prefix_index = None
+        self._last_terms = None
+        self._last_matches = None
+
+    def search(self, query):
+        """Return the paths matching query, best match first, or None for an empty query."""
+        records = self.search_ids(query)
+        return None if records is None else self.store.paths(records)
+
+    def search_ids(self, query):
+        """Return the records matching query, best match first.
+
+        Every whitespace separated term has to match, as a subsequence of the
+        lowercased path. Returns None for an empty query.
+        """
+        records = self.iter_ids(query)
+        return None if records is None else list(records)
+
+    def iter_ids(self, query):
+        """Like search_ids(), but an iterator that finds the matches as they are read.
+
+        The first RANK_LIMIT matches or so are found up front to choose the
+        ranking; a broad query leaves the rest to be confirmed once read.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return None
+        last = self._last_terms
+        if (last is not None and self._last_matches.complete() and len(terms) >= len(last)
+                and " ".join(terms).startswith(" ".join(last))):
+            # Extending a query can only drop matches, so start from the last result.
+            # Terms before the last one typed are unchanged and need no second look.
+            unchanged = len(last) - 1 if terms[len(last) - 1] != last[-1] else len(last)
+            matches = _Matches(self, self._last_matches.found, terms[unchanged:])
+        else:
+            # The masks already settle single characters on a fresh search
+            matches = _Matches(self, self._candidates("".join(terms)), [term for term in terms if len(term) > 1])
+        self._last_terms = terms
+        self._last_matches = matches
+        matches.fill(self.RANK_LIMIT + 1)
+        if matches.complete() and len(matches.found) <= self.RANK_LIMIT:
+            return iter(self._score_sorted(matches.found, terms))
+        return self._rank_broad(matches, terms)
+
+    def match_ids(self, records, query):
+        """Return the given store records that match query, in their original order."""
+        for term in query.lower().split():
+            records = self._verify(records, term)
+        return list(records)
+
+    def _mask(self, char):
+        mask = self._masks.get(char)
+        if mask is None:
+            mask = self._masks[char] = self.store.presence(self._records, char)
+        return mask
+
+    def _candidates(self, chars):
+        """Iterate over the records whose path contains every character in chars, in list order."""
+        count = len(self._records)
+        mask = -1
+        for char in set(chars):
+            mask &= self._mask(char)
+            if not mask:
+                return iter(())
+        return compress(self._records, mask.to_bytes(count, 'big'))
+
+    def _verify(self, ids, term):
+        """The records among ids whose lowercased path has term as a subsequence."""
+        hits = map(fuzzy_pattern(term).search, self.store.lower_paths(ids))
+        return list(compress(ids, hits))
+
+    def _rank_broad(self, matches, terms):
+        # Too many to score one by one: lift names starting with the last term
+        order = self._names_by_prefix()
+        name_of = self.store.lower_names.__getitem__
+        term = terms[-1]
+        start = bisect_left(order, term, key=name_of)
+        end = bisect_left(order, term + "\uffff", start, key=name_of)
+        head = order[start:end].tolist()
+        if not head:
+            return iter(matches)
+        # Every match among these names comes with the head, so none of them follow it
+        head_set = set(head)
+        if len(head) > self.RANK_LIMIT:
+            # Still too many to score: shorter names are closer to an exact match,
+            # and the other terms are confirmed as the head is read
+            head = _Matches(self, sorted(head, key=self._name_lengths.__getitem__), terms[:-1])
+        else:
+            for other in terms[:-1]:
+                head = self._verify(head, other)
+            head = self._score_sorted(head, terms)
+        return chain(head, filterfalse(head_set.__contains__, matches))
+
+    def _score_sorted(self, ids, terms):
+        names = self.store.lower_names
+        scores = {record: sum(score_match(term, path, names[record]) for term in terms)
+                  for record, path in zip(ids, self.store.lower_paths(ids))}
+        # sorted() is stable, so equal scores keep the list's own order
+        return sorted(ids, key=scores.__getitem__, reverse=True)
+
+    def _names_by_prefix(self):
+        """The records sorted by folder name, built on first use with every name's length."""
+        if self._prefix_index is None:
+            names = self.store.lower_names
+            self._prefix_index = array('I', sorted(self._records, key=names.__getitem__))
+            self._name_lengths = array('I', map(len, names))
+        return self._prefix_index
+
+
+class _Matches:
+    """The candidates that match every term, confirmed a chunk at a time, in their order."""
+
+    def __init__(self, index, candidates, terms):
+        self.found = []
+        self._index = index
+        self._candidates = iter(candidates)
+        self._terms = terms
+        self._done = False
+
+    def complete(self):
+        return self._done
+
+    def fill(self, count):
+        """Confirm candidates until count matches are found or none are left."""
+        chunk_size = self._index.VERIFY_CHUNK
+        while len(self.found) < count and not self._done:
+            chunk = list(islice(self._candidates, chunk_size))
+            self._done = len(chunk) < chunk_size
+            for term in self._terms:
+                chunk = self._index._verify(chunk, term)
+            self.found.extend(chunk)
+
+    def __iter__(self):
+        position = 0
+        while True:
+            if position == len(self.found):
+                if self._done:
+                    return
+                self.fill(position + 1)
+                continue
+            yield self.found[position]
+            position += 1
+
+
+_PATTERNS = {}
+
+
+def fuzzy_pattern(term):
+    """Compiled pattern matching term as a subsequence, e.g. 'abc' -> a[^b]*b[^c]*c."""
+    pattern = _PATTERNS.get(term)
+    if pattern is None:
+        parts = [re.escape(term[0])]
+        for char in term[1:]:
+            escaped = re.escape(char)
+            parts.append(f"[^{escaped}]*{escaped}")
+        if len(_PATTERNS) > 256:
+            _PATTERNS.clear()
+        pattern = _PATTERNS[term] = re.compile("".join(parts))
+    return pattern
+
+
+def score_match(term, path, name):
+    """Score how well term matches a lowercased path whose basename is name.
+
+    Whole-name and prefix hits rank highest, then substrings of the name,
+    substrings of the path, and finally scattered subsequence matches, which
+    earn points for contiguous runs, word starts and landing in the name.
+    """
+    if name == term:
+        return 1000
+    position = name.find(term)
+    if position == 0:
+        return 900 - len(name)
+    if position > 0:
+        return 700 + (50 if name[position - 1] in WORD_SEPARATORS else 0) - position
+    position = path.rfind(term)
+    if position >= 0:
+        return 400 + (50 if position and path[position - 1] in WORD_SEPARATORS else 0)
+
+    # Scattered match: walk the subsequence from the right so it prefers the name
+    name_start = len(path) - len(name)
+    score = 100
+    index = len(path)
+    previous = None
+    for char in reversed(term):
+        index = path.rfind(char, 0, index)
+        if index < 0:
+            return 0
+        if previous is not None and previous == index + 1:
+            score += 15  # Contiguous run
+        if index == 0 or path[index - 1] in WORD_SEPARATORS:
+            score += 10  # Start of a word
+        if index >= name_start:
+            score += 5  # Inside the folder name
+        previous = index
+    return score
@@ -0,0 +1,66 @@
+import json
+import os
+from app_paths import config_dir
+from instrumentation import get_logger
+
+# Environment variable with extra VSCode user directories, separated by os.pathsep
+EXTRA_PATHS_ENV = "VSCODE_TOOLBOX_EXTRA_PATHS"
+
+DEFAULT_SETTINGS = {
+    # Additional VSCode-style "User" directories (or storage files) to read.
+    # Each entry is a path, or {"name": "...", "path": "..."} to label the editor.
+    "extra_storage_paths": [],
+    # Also list every project VSCode remembers in User/workspaceStorage, not only its capped recent list.
+    "deep_history": False,
+    # Start with projects whose folder is missing or unreachable hidden from the list.
+    "hide_missing_projects": False,
+    # Show projects as a flat "list", or grouped by parent "folder" or by "editor".
+    "project_view": "list",
+    # Keep running in the system tray when the window is closed (same as main.py --tray).
+    "stay_resident": False,
+    # Warn when a resident toolbox still holds more than this after trimming its caches.
+    "resident_memory_limit_mb": 300,
+}
+
+
+def settings_path():
+    return os.path.join(config_dir(), "settings.json")
+
+
+def load_settings():
+    """Returns the user's settings merged over the defaults."""
+    settings = dict(DEFAULT_SETTINGS)
+    path = settings_path()
+    try:
+        with open(path, "r", encoding='utf-8') as f:
+            user_settings = json.load(f)
+        if isinstance(user_settings, dict):
+            settings.update(user_settings)
+    except FileNotFoundError:
+        pass
+    except (OSError, json.JSONDecodeError) as e:
+        get_logger("settings").warning("Ignoring unreadable settings file %s: %s", path, e)
+    return settings
+
+
+def extra_storage_paths(settings=None):
+    """Returns (name, path) pairs for user-configured storage locations."""
+    settings = settings if settings is not None else load_settings()
+    extras = []
+    for entry in settings.get("extra_storage_paths", []):
+        if isinstance(entry, str):
+            extras.append((None, entry))
+        elif isinstance(entry, dict) and entry.get("path"):
+            extras.append((entry.get("name"), entry["path"]))
+    for path in os.environ.get(EXTRA_PATHS_ENV, "").split(os.pathsep):
+        if path:
+            extras.append((None, path))
+    return [(name or _editor_name(path), os.path.expanduser(path)) for name, path in extras]
+
+
+def _editor_name(path):
+    """Guesses an editor label from a path like ~/.config/Foo/User or .../User/globalStorage/state.vscdb."""
+    parts = [part for part in os.path.normpath(path).split(os.sep) if part]
+    while parts and parts[-1] in ("User", "globalStorage", "state.vscdb", "storage.json"):
+        parts.pop()
+    return parts[-1] if parts else path
@@ -0,0 +1,32 @@
+"""Hands a second launch over to the window that is already running.
+
+The client side uses the standard library only, so a second launch that finds
+a running window exits before Qt is ever imported. The window listens with a
+QLocalServer (see resident.py) on instance_socket_path().
+"""
+import platform
+import socket
+from app_paths import instance_socket_path
+
+SHOW_REQUEST = b"show\n"
+SHOW_REPLY = b"ok\n"
+
+
+def activate_running_instance(path=None, timeout=0.5):
+    """Asks a running window to show itself; returns True if one did."""
+    path = path or instance_socket_path()
+    try:
+        if platform.system() == 'Windows':
+            with open(path, "r+b", buffering=0) as pipe:
+                pipe.write(SHOW_REQUEST)
+                return pipe.readline() == SHOW_REPLY
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(SHOW_REQUEST)
+            with sock.makefile("rb") as reply:
+                return reply.readline() == SHOW_REPLY
+    except OSError:
+        return False
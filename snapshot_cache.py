@@ -0,0 +1,128 @@
+import json
+import os
+from app_paths import cache_dir
+from instrumentation import get_logger
+
+log = get_logger("snapshot")
+
+# Bump whenever the way projects are parsed or stored changes
+CACHE_VERSION = 3
+
+
+class Snapshot:
+    """A cached project list together with the storage files it was read from.
+
+    origins maps each path to the names of the editors it was opened in.
+    """
+    def __init__(self, sources, paths, origins=None):
+        self.sources = sources
+        self.paths = paths
+        self.origins = origins if origins is not None else {}
+
+
+class SnapshotCache:
+    """On-disk copy of the last parsed project list.
+
+    The file starts with one line of JSON holding the format version and the
+    path, type, modification time and size of every storage file the list was
+    read from, followed by the paths, each ended by a NUL character. Reading it
+    back is a single split, with no JSON or URI decoding per project.
+
+    The editors each project came from are stored in the header as one bit
+    mask per path, indexing into the header's list of editor names.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "projects-snapshot")
+
+    @staticmethod
+    def source_key(storage_path, storage_type):
+        """Describes a storage file's current state, or returns None if it is missing."""
+        try:
+            stat = os.stat(storage_path)
+        except OSError:
+            return None
+        key = {"path": storage_path, "type": storage_type,
+               "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        if storage_type == 'db':
+            # Recent writes may only have reached the write-ahead log so far
+            try:
+                wal = os.stat(storage_path + "-wal")
+                key["wal"] = [wal.st_mtime_ns, wal.st_size]
+            except OSError:
+                key["wal"] = None
+        return key
+
+    def load(self):
+        """Returns the cached Snapshot, or None if there is no usable cache."""
+        try:
+            with open(self.path, "r", encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                if header.get("version") != CACHE_VERSION:
+                    return None
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if body and not body.endswith("\0"):
+            return None  # Truncated
+        paths = body[:-1].split("\0") if body else []
+        masks = header.get("origins", [])
+        if len(paths) != header.get("count") or len(masks) != len(paths):
+            return None  # Damaged
+        return Snapshot(header.get("sources", []), paths,
+                        self._decode_origins(paths, header.get("editors", []), masks))
+
+    def save_snapshot(self, sources, paths, origins=None):
+        """Saves the paths read from sources and returns them as a Snapshot."""
+        origins = origins if origins is not None else {}
+        self.save(sources, paths, origins)
+        return Snapshot(sources, paths, origins)
+
+    def save(self, sources, paths, origins=None):
+        """Writes the snapshot atomically, so a crash never leaves half a cache behind."""
+        editors, masks = self._encode_origins(paths, origins or {})
+        header = {"version": CACHE_VERSION, "sources": sources, "count": len(paths),
+                  "editors": editors, "origins": masks}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                f.write(json.dumps(header) + "\n")
+                if paths:
+                    f.write("\0".join(paths) + "\0")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("Could not write project cache %s: %s", self.path, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _encode_origins(paths, origins):
+        # Bits are decoded in order, so editors are listed in an order every
+        # project's tuple agrees with: discovery order, not alphabetical
+        before = {}
+        for names in dict.fromkeys(origins.values()):
+            for i, editor in enumerate(names):
+                before.setdefault(editor, set()).update(names[:i])
+        editors = []
+        while before:
+            editor = next((editor for editor, earlier in before.items() if earlier.issubset(editors)),
+                          next(iter(before)))
+            editors.append(editor)
+            del before[editor]
+        bits = {editor: 1 << i for i, editor in enumerate(editors)}
+        masks = [sum(bits[editor] for editor in origins.get(path, ())) for path in paths]
+        return editors, masks
+
+    @staticmethod
+    def _decode_origins(paths, editors, masks):
+        # Few distinct masks exist, so decode each one once
+        decoded = {}
+        for mask in set(masks):
+            decoded[mask] = tuple(editor for i, editor in enumerate(editors) if mask >> i & 1)
+        return dict(zip(paths, map(decoded.__getitem__, masks)))
+
+    def is_fresh(self, snapshot, sources):
+        """True if the snapshot was taken from exactly these storage file states."""
+        return snapshot is not None and None not in sources and snapshot.sources == sources
@@ -0,0 +1,44 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """Wall time of each startup phase, reported by main.py --profile-startup.
+
+    Phases are measured from start_time, the moment main.py began. They can
+    run on different threads and overlap (parsing happens on the loader
+    thread while the window is built), so each is reported with its own start
+    offset and duration. Only the first run of a phase is kept; reloads later
+    on are not part of startup. A disabled profile records nothing.
+    """
+    def __init__(self, start_time=None, enabled=False):
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.enabled = enabled
+        self.phases = {}  # name -> (start, end, thread name), in the order they began
+        self._lock = threading.Lock()
+
+    def add(self, name, start, end=None):
+        """Record a phase that ran from start to end (now if omitted), perf_counter seconds."""
+        if not self.enabled:
+            return
+        end = time.perf_counter() if end is None else end
+        with self._lock:
+            self.phases.setdefault(name, (start, end, threading.current_thread().name))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start)
+
+    def report(self, file=None):
+        """Print one line per phase: start offset and duration in milliseconds."""
+        file = file or sys.stderr
+        print(f"{'phase':<24}{'start ms':>10}{'took ms':>10}  thread", file=file)
+        for name, (start, end, thread) in sorted(self.phases.items(), key=lambda item: item[1][0]):
+            print(f"{name:<24}{(start - self.start_time) * 1000:>10.1f}{(end - start) * 1000:>10.1f}  {thread}",
+                  file=file)
@@ -0,0 +1,65 @@
+import json
+import mmap
+import re
+
+OPENED_PATHS_KEY = b'"openedPathsList"'
+# Keys of openedPathsList holding entries, newest format first
+ENTRY_KEYS = ("entries", "workspaces3", "files2", "workspaces2")
+
+_VALUE_START = re.compile(rb'\s*:\s*\{')
+_decoder = json.JSONDecoder()
+
+
+def iter_opened_paths(storage_path):
+    """Yields the recently opened entries from a storage.json file.
+
+    Only the openedPathsList object is parsed: the file is memory-mapped, the
+    key is located with a plain byte search and the object is decoded from
+    there, so window state, theme caches and other keys are never decoded.
+    Memory use and parse time follow the size of the history rather than the
+    size of the file.
+    """
+    with open(storage_path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            data = f.read()  # Empty file, or a file system without mmap support
+        try:
+            opened_paths = load_object(data, OPENED_PATHS_KEY)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    if opened_paths is None:
+        return
+    for key in ENTRY_KEYS:
+        yield from opened_paths.get(key, [])
+
+
+def load_object(data, key, window=256 * 1024):
+    """Decodes the object stored under key in JSON data, or returns None if there is none.
+
+    key is the quoted key as bytes; matches not followed by an object, or
+    inside another string, are skipped. The object is decoded from a window
+    of the data that grows until the object fits, and decoding stops at the
+    object's closing brace, so the rest of the data is never parsed.
+    """
+    start = data.find(key)
+    while start >= 0:
+        value = _VALUE_START.match(data, start + len(key))
+        if value and (start == 0 or data[start - 1:start] != b"\\"):
+            return _decode_from(data, value.end() - 1, window)
+        start = data.find(key, start + 1)
+    return None
+
+
+def _decode_from(data, start, window):
+    while True:
+        end = start + window
+        # A character cut in half at the window's edge is dropped; the object never ends there
+        text = data[start:end].decode('utf-8', 'ignore')
+        try:
+            return _decoder.raw_decode(text)[0]
+        except json.JSONDecodeError:
+            if end >= len(data):
+                raise
+        window *= 4
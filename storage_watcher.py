@@ -0,0 +1,127 @@
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+import os
+import sqlite3
+from instrumentation import get_logger
+from toolbox_core import sqlite_uri
+
+log = get_logger("watcher")
+
+
+class StorageWatcher(QObject):
+    """Watches VSCode's state.vscdb or storage.json and reports real changes.
+
+    File system notifications only start a debounce timer. When it fires, the
+    watcher checks whether the content actually changed: for the SQLite
+    database through PRAGMA data_version on a persistent read-only connection,
+    for storage.json through its modification time and size. Bursts of writes
+    therefore end up as a single changed signal.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, debounce_ms=500, parent=None):
+        super().__init__(parent)
+        self.storage_path = None
+        self.storage_type = None
+        self._conn = None
+        self._conn_inode = None
+        self._data_version = None
+        self._file_signature = None
+
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.fileChanged.connect(self._schedule_check)
+        self._fs_watcher.directoryChanged.connect(self._schedule_check)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._check)
+
+    def watch(self, storage_path, storage_type):
+        """Start watching the given storage file, replacing any previous one."""
+        if (storage_path, storage_type) == (self.storage_path, self.storage_type):
+            return
+        self.stop()
+        self.storage_path = storage_path
+        self.storage_type = storage_type
+        if not storage_path:
+            return
+        # The directory catches the -wal file appearing and files being replaced
+        self._fs_watcher.addPath(os.path.dirname(storage_path))
+        self._watch_files()
+        # Record the current state so only later changes are reported
+        self.poll()
+
+    def stop(self):
+        """Stop watching and close the database connection."""
+        self._debounce.stop()
+        watched = self._fs_watcher.files() + self._fs_watcher.directories()
+        if watched:
+            self._fs_watcher.removePaths(watched)
+        self._close_connection()
+        self.storage_path = None
+        self.storage_type = None
+        self._data_version = None
+        self._file_signature = None
+
+    def poll(self):
+        """Return True if the storage changed since the last poll."""
+        if self.storage_type == 'db':
+            return self._poll_db()
+        if self.storage_type == 'json':
+            return self._poll_json()
+        return False
+
+    def _watch_files(self):
+        paths = [self.storage_path]
+        if self.storage_type == 'db':
+            paths.append(self.storage_path + "-wal")
+        watched = set(self._fs_watcher.files())
+        for path in paths:
+            # Replaced files drop out of the watcher, so re-add them when they exist
+            if path not in watched and os.path.exists(path):
+                self._fs_watcher.addPath(path)
+
+    def _schedule_check(self, _path=None):
+        self._debounce.start()
+
+    def _check(self):
+        self._watch_files()
+        if self.poll():
+            self.changed.emit()
+
+    def _poll_db(self):
+        try:
+            inode = os.stat(self.storage_path).st_ino
+            if self._conn is None or inode != self._conn_inode:
+                # The database was replaced; the old connection would never see changes
+                self._close_connection()
+                self._conn = sqlite3.connect(sqlite_uri(self.storage_path), uri=True)
+                self._conn_inode = inode
+                reopened = self._data_version is not None
+                self._data_version = None
+            else:
+                reopened = False
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except (OSError, sqlite3.Error) as e:
+            log.warning("Could not check %s for changes: %s", self.storage_path, e)
+            self._close_connection()
+            return False
+        changed = reopened or (self._data_version is not None and version != self._data_version)
+        self._data_version = version
+        return changed
+
+    def _poll_json(self):
+        try:
+            stat = os.stat(self.storage_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        changed = self._file_signature is not None and signature != self._file_signature
+        self._file_signature = signature
+        return changed
+
+    def _close_connection(self):
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._conn_inode = None
@@ -0,0 +1,32 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PyQt5.QtWidgets import QApplication
+
+@pytest.fixture(scope="session")
+def app():
+    """Ensure a QApplication exists for all tests."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
+
+@pytest.fixture
+def synthetic_state(monkeypatch):
+    """The benchmarks' synthetic_state module, importable for the length of one test."""
+    monkeypatch.syspath_prepend(os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+    import synthetic_state
+    return synthetic_state
+
+@pytest.fixture
+def isolated_home(tmp_path, monkeypatch):
+    """Point HOME and the XDG directories into tmp_path, on Linux, and return the new HOME."""
+    home = tmp_path / "home"
+    for var, path in (("HOME", home), ("XDG_CACHE_HOME", tmp_path / "cache"),
+                      ("XDG_CONFIG_HOME", tmp_path / "config"), ("XDG_DATA_HOME", tmp_path / "data")):
+        monkeypatch.setenv(var, str(path))
+    monkeypatch.delenv("VSCODE_TOOLBOX_EXTRA_PATHS", raising=False)
+    monkeypatch.setattr("platform.system", lambda: "Linux")
+    return home
@@ -0,0 +1,20 @@
+import json
+import sqlite3
+from PyQt5.QtCore import QEventLoop, QTimer
+
+def wait_for(signal, timeout_ms=5000):
+    loop = QEventLoop()
+    signal.connect(loop.quit)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec_()
+
+def make_db(path, paths):
+    """Write a state.vscdb whose recent list is paths, replacing the list if the database exists."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE IF NOT EXISTS ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    entries = [{"folderUri": f"file://{p}"} for p in paths]
+    conn.execute("INSERT INTO ItemTable VALUES (?, ?)",
+                 ("history.recentlyOpenedPathsList", json.dumps({"entries": entries})))
+    conn.commit()
+    conn.close()
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from tests.helpers import make_db
+import cli
+from daemon import ProjectDaemon
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+@pytest.fixture
+def fake_home(isolated_home, tmp_path):
+    make_db(isolated_home / ".config/Code/User/globalStorage/state.vscdb", ["/src/api-server", "/src/web", "/src/docs"])
+    return tmp_path
+
+def test_cli_lists_and_queries_without_a_daemon(fake_home, capsys):
+    socket_args = ["--socket", str(fake_home / "none.sock")]
+    assert cli.main(["list"] + socket_args) == 0
+    assert capsys.readouterr().out.split() == ["/src/api-server", "/src/web", "/src/docs"]
+    assert cli.main(["query", "web", "--json"] + socket_args) == 0
+    assert json.loads(capsys.readouterr().out) == [{"path": "/src/web", "name": "web", "editors": ["Code"]}]
+
+def test_daemon_answers_queries(fake_home, capsys):
+    socket_path = str(fake_home / "d.sock")
+    daemon = ProjectDaemon(socket_path)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    try:
+        for _ in range(100):
+            if cli.ask_daemon({"cmd": "ping"}, socket_path):
+                break
+            thread.join(0.05)
+        reply = cli.ask_daemon({"cmd": "query", "text": "srv", "editors": True}, socket_path)
+        assert reply == {"ok": True, "paths": ["/src/api-server"], "editors": [["Code"]]}
+        assert cli.main(["list", "--limit", "2", "--socket", socket_path]) == 0
+        assert capsys.readouterr().out.split() == ["/src/api-server", "/src/web"]
+        assert cli.ask_daemon({"cmd": "bogus"}, socket_path)["ok"] is False
+    finally:
+        cli.ask_daemon({"cmd": "shutdown"}, socket_path)
+        thread.join(5)
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
+
+def test_cli_does_not_import_qt():
+    code = "import sys, cli, daemon; sys.exit(any(m.startswith('PyQt5') for m in sys.modules))"
+    assert subprocess.run([sys.executable, "-c", code], cwd=ROOT).returncode == 0
+
+def test_pruned_projects_stay_out_of_the_list(fake_home, capsys):
+    from toolbox_core import ProjectDiscovery
+    socket_args = ["--socket", str(fake_home / "none.sock")]
+    assert cli.main(["list"] + socket_args) == 0
+    capsys.readouterr()
+    ProjectDiscovery().prune(["/src/web"])
+    assert cli.main(["list"] + socket_args) == 0
+    assert capsys.readouterr().out.split() == ["/src/api-server", "/src/docs"]
@@ -0,0 +1,25 @@
+from frecency import HALF_LIFE, FrecencyStore, current_value, rank_projects
+
+def test_scores_decay_and_accumulate(tmp_path):
+    store = FrecencyStore(str(tmp_path / "frecency.sqlite"))
+    assert store.scores() == {}
+    now = 1_700_000_000
+    store.record_launch("/a", now - HALF_LIFE)
+    store.record_launch("/b", now)
+    store.record_launch("/b", now)
+    scores = store.scores()
+    assert abs(current_value(scores["/a"], now) - 0.5) < 1e-9
+    assert abs(current_value(scores["/b"], now) - 2.0) < 1e-9
+    store.forget("/b")
+    assert list(store.scores()) == ["/a"]
+
+def test_rank_merges_frecency_with_recency_order():
+    now = 1_700_000_000
+    recency = ["/newest", "/second", "/third", "/old"]
+    assert rank_projects(recency, {}, now) == recency
+    # One fresh launch lifts a project above everything opened only in VSCode
+    scores = {"/old": now / HALF_LIFE}
+    assert rank_projects(recency, scores, now) == ["/old", "/newest", "/second", "/third"]
+    # Launches long ago hardly matter
+    scores = {"/old": (now - 10 * HALF_LIFE) / HALF_LIFE}
+    assert rank_projects(recency, scores, now) == recency
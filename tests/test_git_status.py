@@ -0,0 +1,107 @@
+import shutil
+import subprocess
+import pytest
+from tests.helpers import wait_for
+import git_enricher
+from git_enricher import GitStatusEnricher
+from git_status import GitStatus, GitStatusCache, parse_status, read_git_status, status_key
+
+needs_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+def make_repo(path):
+    path.mkdir()
+    def git(*args):
+        subprocess.run(["git", "-C", str(path), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                       check=True, capture_output=True)
+    git("init", "-b", "main")
+    (path / "a.txt").write_text("a")
+    git("add", "a.txt")
+    git("commit", "-m", "init")
+    return path
+
+def test_parse_status():
+    output = "# branch.oid 0123456789\n# branch.head main\n# branch.upstream origin/main\n# branch.ab +2 -1\n"
+    assert parse_status(output) == GitStatus("main", False, 2, 1)
+    assert parse_status(output + "1 .M N... 100644 100644 100644 a b a.txt\n").label() == "main* ↑2 ↓1"
+    assert parse_status("# branch.oid abcdef123456\n# branch.head (detached)\n").branch == "abcdef1"
+
+@needs_git
+def test_read_git_status_and_key(tmp_path):
+    repo = make_repo(tmp_path / "repo")
+    assert status_key(str(tmp_path)) is None
+    key = status_key(str(repo))
+    assert read_git_status(str(repo)) == GitStatus("main")
+    (repo / "a.txt").write_text("changed")
+    assert read_git_status(str(repo)).dirty
+    assert status_key(str(repo)) == key  # git status must not rewrite the index
+
+def test_cache_round_trip(tmp_path):
+    cache = GitStatusCache(str(tmp_path / "git.json"))
+    cache.put("/r", [1, 2], GitStatus("dev", True))
+    cache.put("/plain", None, None)
+    cache.save()
+    loaded = GitStatusCache(str(tmp_path / "git.json"))
+    loaded.load()
+    assert loaded.get("/r", [1, 2]) == (True, GitStatus("dev", True))
+    assert loaded.get("/r", [1, 3]) == (False, None)
+
+@needs_git
+def test_enricher_delivers_statuses_and_reuses_the_cache(app, tmp_path, monkeypatch):
+    repo = str(make_repo(tmp_path / "repo"))
+    calls = []
+    def counting_read(path):
+        calls.append(path)
+        return read_git_status(path)
+    monkeypatch.setattr(git_enricher, "read_git_status", counting_read)
+    enricher = GitStatusEnricher(cache=GitStatusCache(str(tmp_path / "git.json")), flush_ms=10)
+    results = {}
+    enricher.statuses_ready.connect(results.update)
+    enricher.request([repo, str(tmp_path)])
+    wait_for(enricher.statuses_ready)
+    if len(results) < 2:
+        wait_for(enricher.statuses_ready)
+    assert results == {repo: GitStatus("main"), str(tmp_path): None}
+    enricher.request([repo])
+    wait_for(enricher.statuses_ready)
+    enricher.shutdown()
+    assert calls == [repo]
+
+def test_enricher_shutdown_does_not_wait_for_git(app, tmp_path, monkeypatch):
+    import threading
+    import time
+    release = threading.Event()
+    started = threading.Event()
+    monkeypatch.setattr(git_enricher, "status_key", lambda path: [1, 2])
+    monkeypatch.setattr(git_enricher, "read_git_status",
+                        lambda path: started.set() or release.wait(5) or GitStatus("main"))
+    enricher = GitStatusEnricher(cache=GitStatusCache(str(tmp_path / "git.json")), flush_ms=10)
+    results = []
+    enricher.statuses_ready.connect(results.append)
+    enricher.request(["/slow/mount/a", "/slow/mount/b"])
+    assert started.wait(5)
+    start = time.perf_counter()
+    enricher.shutdown()  # A git status on a dead mount must not hold up closing the window
+    assert time.perf_counter() - start < 1
+    release.set()
+    enricher._pool.shutdown(wait=True)
+    app.processEvents()
+    assert results == []
+
+def test_enricher_does_not_cache_timeouts(app, tmp_path, monkeypatch):
+    import subprocess
+
+    def timed_out(path):
+        raise subprocess.TimeoutExpired(["git", "status"], 10)
+
+    monkeypatch.setattr(git_enricher, "status_key", lambda path: [1, 2])
+    monkeypatch.setattr(git_enricher, "read_git_status", timed_out)
+    cache = GitStatusCache(str(tmp_path / "git.json"))
+    enricher = GitStatusEnricher(cache=cache, flush_ms=10)
+    results = {}
+    enricher.statuses_ready.connect(results.update)
+    enricher.request(["/slow/repo"])
+    wait_for(enricher.statuses_ready)
+    enricher.shutdown()
+    assert results == {"/slow/repo": None}
+    # The next run asks git again
+    assert cache.get("/slow/repo", [1, 2]) == (False, None)
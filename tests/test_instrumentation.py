@@ -0,0 +1,38 @@
+import json
+import logging
+from instrumentation import Histogram, JsonFormatter, Metrics
+
+def test_histogram_percentiles_are_within_a_bucket():
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.observe(value)
+    summary = histogram.summary()
+    assert summary["count"] == 1000 and summary["min"] == 1 and summary["max"] == 1000
+    assert 500 <= summary["p50"] <= 500 * 1.2
+    assert 990 <= summary["p99"] <= 1000
+    assert Histogram().percentile(0.5) is None
+
+def test_spans_feed_histograms_and_chrome_trace(tmp_path):
+    metrics = Metrics()
+    with metrics.span("parse.db", "parsing", editor="Code") as args:
+        args["entries"] = 3
+    metrics.count("parse.entries.db", 3)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"parse.entries.db": 3}
+    assert snapshot["histograms"]["parse.db"]["count"] == 1
+
+    path = tmp_path / "trace.json"
+    metrics.export_chrome_trace(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    span = next(event for event in events if event["ph"] == "X")
+    assert span["name"] == "parse.db" and span["args"] == {"editor": "Code", "entries": 3}
+    assert any(event["name"] == "thread_name" for event in events)
+
+    metrics.reset()
+    assert metrics.snapshot() == {"counters": {}, "histograms": {}}
+
+def test_json_formatter_includes_fields():
+    record = logging.LogRecord("toolbox.discovery", logging.INFO, __file__, 1, "Found %d", (2,), None)
+    record.fields = {"locations": 2}
+    data = json.loads(JsonFormatter().format(record))
+    assert data["msg"] == "Found 2" and data["locations"] == 2 and data["level"] == "info"
@@ -0,0 +1,105 @@
+import threading
+import time
+import path_health
+from path_health import (MISSING, OK, UNREACHABLE, PathHealthCache, PrunedPaths, mount_point,
+                         probe_path, probe_paths)
+from ui_components import ToolboxUI
+from PyQt5.QtWidgets import QMainWindow
+
+def test_probe_path_tells_missing_from_present(tmp_path):
+    assert probe_path(str(tmp_path)) == OK
+    assert probe_path(str(tmp_path / "gone")) == MISSING
+    (tmp_path / "file").write_text("")
+    assert probe_path(str(tmp_path / "file" / "below")) == MISSING
+
+def test_mount_point_prefers_the_mount_table():
+    mounts = ["/mnt/nas/share", "/home", "/"]
+    assert mount_point("/mnt/nas/share/project", mounts) == "/mnt/nas/share"
+    assert mount_point("/home/user/src", mounts) == "/home"
+    assert mount_point("/homework", mounts) == "/"
+    assert mount_point("/Volumes/Backup/src", []) == "/Volumes/Backup"
+    assert mount_point("/Users/me/src", []) == "/"
+
+def test_a_stuck_mount_is_reported_unreachable_without_waiting(tmp_path, monkeypatch):
+    release = threading.Event()
+    real_probe = path_health.probe_path
+
+    def probe(path):
+        if path.startswith("/mnt/dead/"):
+            release.wait(10)  # A hung network file system
+        return real_probe(path)
+
+    monkeypatch.setattr(path_health, "probe_path", probe)
+    alive = str(tmp_path)
+    reported = {}
+    start = time.monotonic()
+    try:
+        states = probe_paths([alive, "/mnt/dead/a", "/mnt/dead/b"], timeout=0.2,
+                             mounts=["/mnt/dead", "/"], on_results=reported.update)
+    finally:
+        release.set()
+    assert time.monotonic() - start < 2
+    assert states == {alive: OK, "/mnt/dead/a": UNREACHABLE, "/mnt/dead/b": UNREACHABLE}
+    assert reported == states
+
+def test_a_stalled_mount_is_not_probed_again_until_it_answers(monkeypatch):
+    release = threading.Event()
+    probed = []
+
+    def probe(path):
+        probed.append(path)
+        release.wait(10)
+        return OK
+
+    monkeypatch.setattr(path_health, "probe_path", probe)
+    mounts = ["/mnt/hung", "/"]
+    try:
+        assert probe_paths(["/mnt/hung/a"], timeout=0.1, mounts=mounts) == {"/mnt/hung/a": UNREACHABLE}
+        reported = {}
+        # The first probe is still stuck: no second thread joins it
+        assert probe_paths(["/mnt/hung/a", "/mnt/hung/b"], timeout=0.1, mounts=mounts,
+                           on_results=reported.update) == {"/mnt/hung/a": UNREACHABLE, "/mnt/hung/b": UNREACHABLE}
+        assert probed == ["/mnt/hung/a"] and reported == {"/mnt/hung/a": UNREACHABLE, "/mnt/hung/b": UNREACHABLE}
+    finally:
+        release.set()
+    deadline = time.monotonic() + 2
+    while "/mnt/hung" in path_health._stalled_mounts and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert probe_paths(["/mnt/hung/b"], timeout=1, mounts=mounts) == {"/mnt/hung/b": OK}
+
+def test_cached_results_expire(tmp_path):
+    cache = PathHealthCache(str(tmp_path / "health.json"))
+    cache.put_many({"/a": MISSING, "/b": UNREACHABLE}, now=1000)
+    assert cache.get("/a", now=1000 + 60) == MISSING
+    assert cache.get("/b", now=1000 + 60) == UNREACHABLE
+    assert cache.get("/b", now=1000 + 600) is None
+    cache.save()
+    reloaded = PathHealthCache(str(tmp_path / "health.json"))
+    reloaded.load()
+    assert reloaded.get("/a", now=1000 + 60) == MISSING
+    # Cached results are not probed again
+    assert probe_paths(["/a"], cache=reloaded) == {"/a": MISSING}
+
+def test_pruned_paths_accumulate(tmp_path):
+    pruned = PrunedPaths(str(tmp_path / "data" / "pruned.json"))
+    assert pruned.load() == set()
+    pruned.add(["/a"])
+    pruned.add(["/b"])
+    assert pruned.load() == {"/a", "/b"}
+
+def test_missing_projects_can_be_hidden(app):
+    window = QMainWindow()
+    ui = ToolboxUI(window)
+    ui.set_projects(["/p/alpha", "/p/beta", "/p/gamma"])
+    ui.set_project_health({"/p/alpha": OK, "/p/beta": MISSING})
+    model = ui.project_model
+    assert model.index(1).data(model.HealthRole) == MISSING
+    assert ui.prune_button.isEnabled()
+    assert model.rowCount() == 3
+    ui.hide_missing_checkbox.setChecked(True)
+    assert [model.index(row).data() for row in range(model.rowCount())] == ["alpha", "gamma"]
+    ui.search_input.setText("beta")
+    ui.apply_filter()
+    assert model.rowCount() == 0
+    ui.hide_missing_checkbox.setChecked(False)
+    assert model.rowCount() == 1
@@ -0,0 +1,33 @@
+import sys
+from tests.helpers import wait_for
+from project_launcher import ProjectLauncher
+
+def test_launcher_caps_concurrent_processes(app, tmp_path):
+    script = "import sys, time; open(sys.argv[1], 'w').close(); time.sleep(0.1)"
+    launcher = ProjectLauncher([sys.executable, "-c", script], max_running=2)
+    launched = []
+    peak = []
+    launcher.launched.connect(launched.append)
+    launcher.launched.connect(lambda _: peak.append(len(launcher._running)))
+    paths = [str(tmp_path / f"p{i}") for i in range(5)]
+    launcher.open(paths + paths[:2])  # Duplicates are skipped
+    assert launcher.pending_count() == 5
+    assert len(launcher._running) == 2
+    wait_for(launcher.idle)
+    assert sorted(launched) == paths
+    assert max(peak) <= 2
+    assert all((tmp_path / f"p{i}").exists() for i in range(5))
+
+def test_launcher_reports_failures(app, tmp_path):
+    failing = ProjectLauncher([sys.executable, "-c", "import sys; sys.exit('no such folder')"])
+    errors = []
+    failing.failed.connect(lambda path, message: errors.append((path, message)))
+    failing.open(["/x"])
+    wait_for(failing.idle)
+    assert errors == [("/x", "no such folder")]
+
+    missing = ProjectLauncher([str(tmp_path / "not-a-command")])
+    missing.failed.connect(lambda path, message: errors.append((path, message)))
+    missing.open(["/y"])
+    wait_for(missing.idle)
+    assert errors[1][0] == "/y" and "Could not run" in errors[1][1]
@@ -0,0 +1,71 @@
+from project_loader import ProjectLoader
+from tests.helpers import wait_for
+
+def test_loader_streams_batches(app):
+    loader = ProjectLoader(batch_size=2)
+    batches = []
+    totals = []
+    loader.batch_ready.connect(batches.append)
+    loader.finished.connect(totals.append)
+    loader.start(lambda: ["/a", "/b", "/c", "/d", "/e"])
+    wait_for(loader.finished)
+    loader.shutdown()
+    assert batches == [["/a", "/b"], ["/c", "/d"], ["/e"]]
+    assert totals == [5]
+    assert not loader.is_loading()
+
+def test_loader_restart_drops_stale_results(app):
+    import threading
+    release = threading.Event()
+    def slow_collect():
+        release.wait(5)
+        return ["/stale"]
+    loader = ProjectLoader()
+    batches = []
+    loader.batch_ready.connect(batches.append)
+    loader.start(slow_collect)
+    loader.start(lambda: ["/fresh"])
+    release.set()
+    wait_for(loader.finished)
+    loader.shutdown()
+    app.processEvents()
+    assert batches == [["/fresh"]]
+
+def test_loader_reports_failures(app):
+    def broken_collect():
+        raise OSError("unreadable")
+    loader = ProjectLoader()
+    errors = []
+    loader.failed.connect(errors.append)
+    loader.start(broken_collect)
+    wait_for(loader.failed)
+    loader.shutdown()
+    assert errors == ["unreadable"]
+
+def test_loader_runs_one_collect_at_a_time(app):
+    import threading
+    release = threading.Event()
+    running = []
+    overlaps = []
+    def collect(result, wait=False):
+        def run():
+            overlaps.append(len(running))
+            running.append(result)
+            if wait:
+                release.wait(5)
+            running.remove(result)
+            return [result]
+        return run
+    loader = ProjectLoader()
+    refreshed = []
+    loader.refreshed.connect(refreshed.append)
+    loader.refresh(collect("/first", wait=True))
+    loader.refresh(collect("/second"))
+    loader.refresh(collect("/third"))
+    assert loader.is_loading()
+    release.set()
+    wait_for(loader.finished)
+    loader.shutdown()
+    # /second was superseded before it started; /third waited for /first
+    assert overlaps == [0, 0]
+    assert refreshed == [["/third"]]
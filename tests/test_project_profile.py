@@ -0,0 +1,51 @@
+import os
+from project_profile import ProfileManifest, ProjectProfile, parse_filters, refresh_profiles, scan_project
+
+def make_tree(root, files):
+    for name in files:
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+
+def test_scan_skips_dependencies_ignored_and_deep_dirs(tmp_path):
+    make_tree(tmp_path, ["a.py", "pkg/b.py", "pkg/c.js", "node_modules/x/d.js", "node_modules/x/e.js",
+                         ".venv/lib/f.py", "generated/g.js", "one/two/three/four/h.js", ".gitignore"])
+    (tmp_path / ".gitignore").write_text("# build output\n/generated/\n*.log\n")
+    dirs, mtimes, profile = scan_project(str(tmp_path), max_depth=3)
+    assert sorted(dirs) == ["", "one", os.path.join("one", "two"), "pkg"]
+    assert len(mtimes) == len(dirs)
+    assert profile.language == "Python" and profile.files == 4 and not profile.truncated
+
+    _, _, profile = scan_project(str(tmp_path), max_entries=2)
+    assert profile.truncated and profile.files <= 2
+
+def test_refresh_walks_only_changed_projects(tmp_path):
+    make_tree(tmp_path, ["p/a.go", "q/b.rs"])
+    p, q = str(tmp_path / "p"), str(tmp_path / "q")
+    entries = dict(refresh_profiles([(p, None), (q, None), (str(tmp_path / "gone"), None)]))
+    assert entries[str(tmp_path / "gone")] is None
+    assert ProjectProfile(*entries[p][2]).language == "Go"
+
+    manifest = ProfileManifest(str(tmp_path / "manifest.json"))
+    manifest.put(p, entries[p])
+    manifest.put(q, entries[q])
+    manifest.save()
+    manifest = ProfileManifest(str(tmp_path / "manifest.json"))
+    manifest.load()
+    assert refresh_profiles([(p, manifest.entry(p)), (q, manifest.entry(q))]) == []
+    make_tree(tmp_path, ["q/c.rs"])
+    os.utime(q, ns=(0, 1))  # A new file changes the directory's modification time
+    assert [path for path, _ in refresh_profiles([(p, manifest.entry(p)), (q, manifest.entry(q))])] == [q]
+
+def test_parse_filters_and_label():
+    now = 1_000_000_000
+    python = ProjectProfile("Python", 1500, now - 3 * 86400)
+    go = ProjectProfile("Go", 20, now - 400 * 86400, truncated=True)
+    query, wanted = parse_filters("api lang:py files:>100", now)
+    assert query.split() == ["api"]
+    assert wanted(python) and not wanted(go) and not wanted(None)
+    _, wanted = parse_filters("modified:>1y", now)
+    assert wanted(go) and not wanted(python)
+    assert parse_filters("files:many", now) == ("files:many", None)
+    assert python.label(now) == "Python · 1.5k files · 3d"
+    assert go.label(now) == "Go · 20+ files · 1y"
@@ -0,0 +1,41 @@
+from project_store import ProjectStore
+
+PATHS = ["/home/user/src/api", "/home/user/src/Web", "/home/user/My Work/api", "/opt/tool", "/top", "relative"]
+
+def test_paths_round_trip_and_ids_are_stable():
+    store = ProjectStore()
+    records = store.add_many(PATHS)
+    assert records == list(range(len(PATHS)))
+    assert store.paths(records) == PATHS
+    assert store.add_many(list(reversed(PATHS))) == list(reversed(records))
+    assert store.add("/home/user/src/new") == len(PATHS)
+    assert store.id_of("/home/user/src/Web") == 1
+    assert store.id_of("/home/user/src/missing") is None
+    assert store.id_of("/nowhere/api") is None
+
+def test_parent_directories_are_shared():
+    store = ProjectStore()
+    api, web = store.add_many(PATHS[:2])
+    assert store.nodes[api] == store.nodes[web]
+    assert store.prefixes[store.nodes[api]] is store.prefixes[store.nodes[web]]
+    assert store.names[web] == "Web" and store.lower_names[web] == "web"
+    assert store.lower_names[api] is store.names[api]  # Already lowercase, not copied
+
+def test_lowercased_paths_and_presence():
+    store = ProjectStore()
+    records = store.add_many(PATHS)
+    assert list(store.lower_paths(records[1:3])) == ["/home/user/src/web", "/home/user/my work/api"]
+    # One byte per record: "w" is in the name of Web and the directory of "My Work"
+    assert store.presence(records, "w").to_bytes(len(records), 'big') == bytes([0, 1, 1, 0, 0, 0])
+
+def test_remote_uris_split_at_forward_slashes_on_windows(monkeypatch):
+    import project_store
+    monkeypatch.setattr(project_store, "_LOCAL_SEP", "\\")
+    paths = ["C:\\src\\api", "vscode-remote://ssh-remote+box/srv/api", "vscode-remote://ssh-remote+box/srv/web"]
+    store = ProjectStore()
+    local, api, web = store.add_many(paths)
+    assert store.paths([local, api, web]) == paths
+    assert [store.names[record] for record in (local, api, web)] == ["api", "api", "web"]
+    assert store.prefixes[store.nodes[api]] == "vscode-remote://ssh-remote+box/srv/"
+    assert store.nodes[api] == store.nodes[web]
+    assert [store.id_of(path) for path in paths] == [local, api, web]
@@ -0,0 +1,33 @@
+import threading
+from resident import InstanceServer, current_rss
+from single_instance import activate_running_instance
+from tests.helpers import wait_for
+
+def test_second_launch_asks_the_running_window_to_show(app, tmp_path):
+    path = str(tmp_path / "window.sock")
+    assert not activate_running_instance(path)
+    server = InstanceServer(path)
+    assert server.listen()
+    shown = []
+    server.show_requested.connect(lambda: shown.append(True))
+    answers = []
+    client = threading.Thread(target=lambda: answers.append(activate_running_instance(path, timeout=5)))
+    client.start()
+    while client.is_alive():
+        app.processEvents()
+        client.join(0.01)
+    server.close()
+    assert answers == [True] and shown == [True]
+
+def test_resident_window_hides_instead_of_closing(app, isolated_home):
+    from toolbox import ToolboxApp
+    window = ToolboxApp()
+    wait_for(window.loader.finished)
+    window.resident = True
+    window.show_switcher()
+    assert window.isVisible()
+    window.close()
+    assert not window.isVisible() and window.loader is not None
+    window.quitting = True
+    window.close()
+    assert current_rss() is None or current_rss() > 0
@@ -0,0 +1,78 @@
+from search_index import SearchIndex, fuzzy_pattern, score_match
+
+PATHS = [
+    "/home/user/oss/api-server",
+    "/home/user/oss/toolbox",
+    "/home/user/work/acme/site",
+    "/home/user/work/acme/toolbox-docs",
+    "/home/user/work/mobile",
+]
+
+def test_fuzzy_pattern_matches_subsequences():
+    assert fuzzy_pattern("tbx").search("toolbox")
+    assert not fuzzy_pattern("xbt").search("toolbox")
+    assert fuzzy_pattern("a.b").search("a.b")
+    assert not fuzzy_pattern("a.b").search("axb")
+
+def test_search_ranks_basename_hits_first():
+    index = SearchIndex(PATHS)
+    results = index.search("toolbox")
+    assert results[:2] == ["/home/user/oss/toolbox", "/home/user/work/acme/toolbox-docs"]
+
+def test_search_finds_middle_segments_and_fuzzy_matches():
+    index = SearchIndex(PATHS)
+    assert set(index.search("acme")) == {"/home/user/work/acme/site", "/home/user/work/acme/toolbox-docs"}
+    assert index.search("apisrv") == ["/home/user/oss/api-server"]
+    assert index.search("zzz") == []
+    assert index.search("  ") is None
+
+def test_search_terms_must_all_match():
+    index = SearchIndex(PATHS)
+    assert index.search("acme docs") == ["/home/user/work/acme/toolbox-docs"]
+
+def test_extended_query_reuses_previous_matches():
+    index = SearchIndex(PATHS)
+    index.search("to")
+    assert index.search("toolb") == ["/home/user/oss/toolbox", "/home/user/work/acme/toolbox-docs"]
+    # A query that is not an extension starts over
+    assert index.search("mob")[0] == "/home/user/work/mobile"
+
+def test_add_paths_extends_masks():
+    index = SearchIndex(PATHS[:2])
+    index.search("a")
+    index.add_paths(PATHS[2:])
+    assert "/home/user/work/acme/site" in index.search("a")
+
+def test_broad_queries_lift_name_prefix_hits():
+    paths = [f"/home/user/work/project{i}" for i in range(3000)] + ["/home/user/work/zeta"]
+    index = SearchIndex(paths)
+    results = index.search("z")
+    assert results == ["/home/user/work/zeta"]
+    results = index.search("e")
+    assert len(results) == len(paths)
+
+def test_broad_queries_confirm_matches_as_they_are_read(monkeypatch):
+    paths = [f"/src/team{i % 7}/service-{i}" for i in range(20000)] + ["/src/serv"]
+    index = SearchIndex(paths)
+    monkeypatch.setattr(SearchIndex, "RANK_LIMIT", 100)
+    monkeypatch.setattr(SearchIndex, "VERIFY_CHUNK", 256)
+    checked = []
+    verify = index._verify
+    monkeypatch.setattr(index, "_verify", lambda ids, term: checked.append(len(ids)) or verify(ids, term))
+    results = index.iter_ids("serv")
+    assert next(results) == index.store.id_of("/src/serv")
+    assert sum(checked) < 2000  # Only the first chunks, not all 20001 candidates
+    assert index.store.paths(list(results)) == [path for path in paths if path != "/src/serv"]
+    # A complete result is reused, confirming only the term that changed
+    def expected(*terms):
+        return {path for path in paths if all(fuzzy_pattern(term).search(path) for term in terms)}
+    monkeypatch.setattr(SearchIndex, "RANK_LIMIT", 20000)
+    previous = index.search("am3 ice")
+    assert set(previous) == expected("am3", "ice")
+    checked.clear()
+    assert set(index.search("am3 ice-1")) == expected("am3", "ice-1")
+    assert sum(checked) == len(previous)  # Only "ice-1", only over the last matches
+
+def test_score_prefers_word_boundaries_and_names():
+    assert score_match("site", "/work/site", "site") > score_match("site", "/work/website", "website")
+    assert score_match("web", "/web/x", "x") < score_match("web", "/a/website", "website")
@@ -0,0 +1,42 @@
+from snapshot_cache import SnapshotCache
+
+def test_snapshot_round_trip(tmp_path):
+    source = tmp_path / "storage.json"
+    source.write_text("{}")
+    cache = SnapshotCache(str(tmp_path / "cache" / "snapshot"))
+    sources = [SnapshotCache.source_key(str(source), 'json')]
+    cache.save(sources, ["/a", "/b c", "/ünï"])
+    snapshot = cache.load()
+    assert snapshot.paths == ["/a", "/b c", "/ünï"]
+    assert cache.is_fresh(snapshot, sources)
+
+def test_snapshot_goes_stale_when_source_changes(tmp_path):
+    source = tmp_path / "storage.json"
+    source.write_text("{}")
+    cache = SnapshotCache(str(tmp_path / "snapshot"))
+    cache.save([SnapshotCache.source_key(str(source), 'json')], ["/a"])
+    source.write_text('{"openedPathsList": {}}')
+    snapshot = cache.load()
+    assert not cache.is_fresh(snapshot, [SnapshotCache.source_key(str(source), 'json')])
+
+def test_snapshot_rejects_missing_or_damaged_files(tmp_path):
+    cache = SnapshotCache(str(tmp_path / "snapshot"))
+    assert cache.load() is None
+    cache.save([], ["/a", "/b"])
+    with open(cache.path, "r+", encoding="utf-8") as f:
+        content = f.read()
+        f.seek(0)
+        f.write(content[:-2])
+        f.truncate()
+    assert cache.load() is None
+    assert SnapshotCache.source_key(str(tmp_path / "missing"), 'db') is None
+
+def test_snapshot_keeps_project_origins(tmp_path):
+    cache = SnapshotCache(str(tmp_path / "snapshot"))
+    origins = {"/a": ("Code",), "/b": ("Code", "VSCodium"), "/c": ()}
+    cache.save([], ["/a", "/b", "/c"], origins)
+    assert cache.load().origins == origins
+    # Editors keep their discovery order, whichever project lists one first
+    origins = {"/a": ("VSCodium",), "/b": ("Cursor", "Code"), "/c": ("Cursor", "VSCodium", "Code")}
+    cache.save([], ["/a", "/b", "/c"], origins)
+    assert cache.load().origins == origins
@@ -0,0 +1,23 @@
+import io
+import time
+from startup_profile import StartupProfile
+
+def test_phases_are_reported_in_start_order():
+    start = time.perf_counter()
+    profile = StartupProfile(start, enabled=True)
+    with profile.phase("window"):
+        with profile.phase("widgets"):
+            pass
+    profile.add("imports", start, start + 0.05)
+    profile.add("imports", start, start + 1)  # Only the first run counts
+    out = io.StringIO()
+    profile.report(out)
+    lines = out.getvalue().splitlines()
+    assert [line.split()[0] for line in lines[1:]] == ["imports", "window", "widgets"]
+    assert lines[1].split()[2] == "50.0"
+
+def test_disabled_profile_records_nothing():
+    profile = StartupProfile()
+    with profile.phase("window"):
+        pass
+    assert profile.phases == {}
@@ -0,0 +1,26 @@
+import json
+from storage_json import iter_opened_paths, load_object
+
+def test_iter_opened_paths_reads_only_the_history(tmp_path):
+    storage = tmp_path / "storage.json"
+    storage.write_text(json.dumps({
+        "theme": "a string mentioning \"openedPathsList\": {not json",
+        "windowsState": {"nested": [{"brackets": "}]{["}]},
+        "openedPathsList": {"entries": [{"folderUri": "file:///a"}], "workspaces3": ["file:///b"]},
+        "after": {"x": 1},
+    }))
+    assert list(iter_opened_paths(str(storage))) == [{"folderUri": "file:///a"}, "file:///b"]
+
+def test_iter_opened_paths_handles_missing_history(tmp_path):
+    storage = tmp_path / "storage.json"
+    storage.write_text('{"theme": "dark"}')
+    assert list(iter_opened_paths(str(storage))) == []
+    storage.write_text("")
+    assert list(iter_opened_paths(str(storage))) == []
+
+def test_load_object_grows_its_window_and_rejects_truncated_json():
+    import pytest
+    data = json.dumps({"openedPathsList": {"entries": ["file:///é" * 50] * 20}}).encode()
+    assert load_object(data, b'"openedPathsList"', window=16) == {"entries": ["file:///é" * 50] * 20}
+    with pytest.raises(json.JSONDecodeError):
+        load_object(b'{"openedPathsList": {"entries": [', b'"openedPathsList"', window=4)
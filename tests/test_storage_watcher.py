@@ -0,0 +1,24 @@
+import json
+from storage_watcher import StorageWatcher
+from tests.helpers import make_db
+
+def test_watcher_detects_database_commits(app, tmp_path):
+    db_path = tmp_path / "odd ?#% dir" / "state.vscdb"  # Characters that mean something in a SQLite URI
+    make_db(db_path, ["/a"])
+    watcher = StorageWatcher()
+    watcher.watch(str(db_path), 'db')
+    assert not watcher.poll()
+    make_db(db_path, ["/a", "/b"])
+    assert watcher.poll()
+    assert not watcher.poll()
+    watcher.stop()
+
+def test_watcher_detects_json_changes(app, tmp_path):
+    storage_path = tmp_path / "storage.json"
+    storage_path.write_text(json.dumps({"openedPathsList": {"entries": []}}))
+    watcher = StorageWatcher()
+    watcher.watch(str(storage_path), 'json')
+    assert not watcher.poll()
+    storage_path.write_text(json.dumps({"openedPathsList": {"entries": [{"folderUri": "file:///a"}]}}))
+    assert watcher.poll()
+    watcher.stop()
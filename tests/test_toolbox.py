@@ -0,0 +1,63 @@
+import json
+from tests.helpers import make_db, wait_for
+from toolbox import ToolboxApp
+
+def test_projects_are_merged_from_every_install(app, isolated_home, tmp_path, monkeypatch):
+    home = isolated_home
+    make_db(home / ".config/Code/User/globalStorage/state.vscdb", ["/src/a", "/src/b"])
+    make_db(home / ".config/VSCodium/User/globalStorage/state.vscdb", ["/src/b", "/src/c"])
+    custom = tmp_path / "Custom" / "User"
+    custom.mkdir(parents=True)
+    (custom / "storage.json").write_text(json.dumps(
+        {"openedPathsList": {"workspaces3": ["file:///src/d"]}}))
+    monkeypatch.setenv("VSCODE_TOOLBOX_EXTRA_PATHS", str(custom))
+
+    window = ToolboxApp()
+    wait_for(window.loader.finished)
+    try:
+        model = window.ui.get_project_model()
+        # Each install's history in turn, a project seen before kept at its first place
+        assert model.paths() == ["/src/a", "/src/b", "/src/c", "/src/d"]
+        # The window keeps them in its own store; discovery lets go of its copy
+        assert window.discovery.project_origins == {}
+        assert model.index(1).data(model.OriginRole) == ("Code", "VSCodium")
+        assert model.index(3).data(model.OriginRole) == ("Custom",)
+        assert len(window.watchers) == 3
+    finally:
+        window.close()
+
+def test_loaders_read_synthetic_state(app, isolated_home, tmp_path, synthetic_state):
+    synthetic_state.write_state_db(str(tmp_path / "state.vscdb"), 300)
+    synthetic_state.write_storage_json(str(tmp_path / "storage.json"), 300)
+    window = ToolboxApp()
+    window.loader.shutdown()
+    try:
+        from_db = window.discovery.load_recent_projects_from_db(str(tmp_path / "state.vscdb"))
+        from_json = window.discovery.load_recent_projects_from_json(str(tmp_path / "storage.json"))
+        # Every entry is a project in the database; storage.json has no files in its list
+        assert len(from_db) == 300 and 200 < len(from_json) < 300 and set(from_json) <= set(from_db)
+        assert any(path.startswith("vscode-remote://ssh-remote+build-") for path in from_json)
+        assert not any("%" in path for path in from_db + from_json)
+    finally:
+        window.close()
+
+def test_unreadable_storage_keeps_its_projects(app, isolated_home):
+    home = isolated_home
+    code_db = home / ".config/Code/User/globalStorage/state.vscdb"
+    make_db(code_db, ["/src/a", "/src/b"])
+    make_db(home / ".config/VSCodium/User/globalStorage/state.vscdb", ["/src/c"])
+    window = ToolboxApp()
+    wait_for(window.loader.finished)
+    try:
+        model = window.ui.get_project_model()
+        before = model.paths()
+        code_db.write_bytes(b"not a database" * 100)  # Damaged, or caught mid-rewrite
+        window.refresh_recent_projects()
+        wait_for(window.loader.finished)
+        assert model.paths() == before
+        assert model.index(before.index("/src/a")).data(model.OriginRole) == ("Code",)
+        assert [location[2] for location in window.discovery.unreadable_locations] == ["Code"]
+        # Read again next time rather than served from the snapshot
+        assert None in window.discovery.snapshot.sources
+    finally:
+        window.close()
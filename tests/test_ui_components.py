@@ -1,27 +1,24 @@
-import pytest
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
-from PyQt5.QtWidgets import QApplication
-from ui_components import ProjectListItem, ToolboxUI
-
-@pytest.fixture(scope="session")
-def app():
-    """Ensure a QApplication exists for all tests."""
-    import sys
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-    return app
-
-def test_project_list_item_properties(app):
-    folder_name = "TestProject"
-    full_path = "/home/user/projects/TestProject"
-    widget = ProjectListItem(folder_name, full_path)
-    assert widget.name_label.text() == folder_name
-    assert widget.path_label.text() == full_path
-    assert widget.icon_label.pixmap() is not None
+from ui_components import ProjectListModel, ProjectItemDelegate, ToolboxUI
+
+def test_project_list_model_roles(app):
+    model = ProjectListModel(lambda path: path)
+    model.set_projects(["/home/user/projects/TestProject"])
+    index = model.index(0)
+    assert model.rowCount() == 1
+    assert index.data(0) == "TestProject"  # Qt.DisplayRole
+    assert index.data(0x0100) == "/home/user/projects/TestProject"  # Qt.UserRole
+    assert index.data(ProjectListModel.PathDisplayRole) == "/home/user/projects/TestProject"
+
+def test_filter_rows_are_taken_from_an_iterator_as_needed(app):
+    model = ProjectListModel(lambda path: path)
+    model.set_projects([f"/p/{i}" for i in range(1200)])
+    taken = []
+    model.set_filter_ids(taken.append(record) or record for record in reversed(model.ids()))
+    assert model.rowCount() == 500 and len(taken) == 500 and model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 1000
+    assert model.row_of("/p/0") == 1199  # Needs every row, so the rest are taken
+    assert not model.canFetchMore() and model.index(0).data(0) == "1199"
 
 def test_toolbox_ui_add_project_item(app):
     from PyQt5.QtWidgets import QMainWindow
@@ -29,13 +26,13 @@ def test_toolbox_ui_add_project_item(app):
     ui = ToolboxUI(main_window)
     folder_name = "Sample"
     full_path = "/some/very/long/path/to/Sample"
-    item = ui.add_project_item(folder_name, full_path)
-    # Check that the item is added to the list
-    assert ui.project_list.count() == 1
-    # Check that the widget is set and has correct data
-    widget = ui.project_list.itemWidget(item)
-    assert widget.name_label.text() == folder_name
-    assert item.data(0x0100) == full_path  # Qt.UserRole
+    index = ui.add_project_item(folder_name, full_path)
+    # Check that the row is added to the model
+    assert ui.project_model.rowCount() == 1
+    # Check that the row is painted by the delegate and has correct data
+    assert isinstance(ui.project_list.itemDelegate(), ProjectItemDelegate)
+    assert index.data(0) == folder_name
+    assert index.data(0x0100) == full_path  # Qt.UserRole
 
 def test_toolbox_ui_shorten_path(app):
     from PyQt5.QtWidgets import QMainWindow
@@ -58,9 +55,158 @@ def test_toolbox_ui_filter_projects(app):
     ui.add_project_item("Gamma", "/projects/Gamma")
     # Filter for 'Beta'
     ui.filter_projects("Beta")
-    visible = [not ui.project_list.item(i).isHidden() for i in range(ui.project_list.count())]
-    assert visible == [False, True, False]
+    visible = [ui.project_model.index(i).data(0) for i in range(ui.project_model.rowCount())]
+    assert visible == ["Beta"]
     # Filter for empty string (should show all)
     ui.filter_projects("")
-    visible = [not ui.project_list.item(i).isHidden() for i in range(ui.project_list.count())]
-    assert all(visible)
\ No newline at end of file
+    assert ui.project_model.rowCount() == 3
+
+def test_project_item_delegate_paints_rows(app):
+    from PyQt5.QtWidgets import QMainWindow
+    from PyQt5.QtGui import QImage, QPainter
+    from PyQt5.QtWidgets import QStyleOptionViewItem
+    ui = ToolboxUI(QMainWindow())
+    index = ui.add_project_item("Alpha", "/projects/Alpha")
+    option = QStyleOptionViewItem()
+    option.rect.setRect(0, 0, 400, 80)
+    size = ui.project_delegate.sizeHint(option, index)
+    assert size.height() >= ProjectItemDelegate.ICON_BOX
+    image = QImage(400, size.height(), QImage.Format_ARGB32)
+    painter = QPainter(image)
+    ui.project_delegate.paint(painter, option, index)
+    painter.end()
+
+def test_toolbox_ui_append_projects_respects_filter(app):
+    from PyQt5.QtWidgets import QMainWindow
+    ui = ToolboxUI(QMainWindow())
+    ui.search_input.setText("beta")
+    ui.apply_filter()
+    ui.append_projects(["/projects/Alpha", "/projects/Beta"])
+    ui.append_projects(["/projects/Beta2"])
+    assert ui.project_model.rowCount() == 2
+    assert len(ui.project_model.paths()) == 3
+
+def test_project_list_model_sync_applies_diff(app):
+    model = ProjectListModel(lambda path: path)
+    model.set_projects(["/a", "/b", "/c", "/d"])
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    selected = model.index(2)  # "/c"
+    from PyQt5.QtCore import QPersistentModelIndex
+    persistent = QPersistentModelIndex(selected)
+    model.sync(["/a", "/bb", "/c", "/d", "/e"])
+    assert model.paths() == ["/a", "/bb", "/c", "/d", "/e"]
+    assert persistent.row() == 2 and persistent.data(0x0100) == "/c"
+    # Reordered rows are moved, not rebuilt
+    model.sync(["/e", "/a", "/bb", "/c", "/d"])
+    assert model.paths() == ["/e", "/a", "/bb", "/c", "/d"]
+    assert persistent.row() == 3
+    assert resets == []
+    # A wholesale reorder resets once instead of moving nearly every row
+    paths = [f"/p{i}" for i in range(500)]
+    model.sync(paths)
+    moves = []
+    model.rowsMoved.connect(lambda *args: moves.append(args))
+    model.sync(paths[1:] + paths[:1])  # The loop would pull up all the others
+    assert model.paths() == paths[1:] + paths[:1] and resets == [True] and moves == []
+    model.sync(paths)  # Back again takes a single move
+    assert model.paths() == paths and len(moves) == 1 and resets == [True]
+
+def test_toolbox_ui_sync_projects_keeps_filter(app):
+    from PyQt5.QtWidgets import QMainWindow
+    ui = ToolboxUI(QMainWindow())
+    ui.set_projects(["/projects/Alpha", "/projects/Beta"])
+    ui.search_input.setText("beta")
+    ui.filter_projects("beta")
+    ui.sync_projects(["/projects/Alpha", "/projects/Beta", "/projects/Beta2", "/projects/Gamma"])
+    visible = [ui.project_model.index(i).data(0) for i in range(ui.project_model.rowCount())]
+    assert visible == ["Beta", "Beta2"]
+    assert len(ui.project_model.paths()) == 4
+
+def test_toolbox_ui_filter_matches_middle_path_segments(app):
+    from PyQt5.QtWidgets import QMainWindow
+    ui = ToolboxUI(QMainWindow())
+    long_path = "/home/user/clients/acme/very/deeply/nested/folder/structure/for/Website"
+    ui.set_projects(["/home/user/oss/Tool", long_path])
+    # "acme" only appears in the part of the path that shorten_path hides
+    ui.filter_projects("acme")
+    assert [ui.project_model.index(i).data(0x0100) for i in range(ui.project_model.rowCount())] == [long_path]
+
+def test_toolbox_ui_selected_paths_and_status(app):
+    from PyQt5.QtCore import QItemSelectionModel
+    from PyQt5.QtWidgets import QMainWindow
+    ui = ToolboxUI(QMainWindow())
+    for name in ("a", "b", "c"):
+        ui.add_project_item(name, f"/p/{name}")
+    selection = ui.project_list.selectionModel()
+    selection.select(ui.project_model.index(2), QItemSelectionModel.Select)
+    selection.select(ui.project_model.index(0), QItemSelectionModel.Select)
+    assert ui.selected_paths() == ["/p/a", "/p/c"]
+    ui.show_status("Failed to open a", error=True)
+    assert ui.status_label.text() == "Failed to open a"
+    ui.clear_status()
+    assert ui.status_label.text() == ""
+
+def test_project_list_model_requests_git_status_when_painted(app):
+    from git_status import GitStatus
+    model = ProjectListModel(lambda path: path)
+    model.set_projects(["/a", "/b"])
+    requested = []
+    model.git_status_needed.connect(requested.extend)
+    assert model.index(0).data(model.GitStatusRole) is None
+    assert model.index(1).data(model.GitStatusRole) is None
+    model.index(0).data(model.GitStatusRole)  # Asked only once
+    app.processEvents()
+    assert requested == ["/a", "/b"]
+    model.set_git_statuses({"/a": GitStatus("main", dirty=True)})
+    assert model.index(0).data(model.GitStatusRole).label() == "main*"
+
+def test_grouped_view_creates_children_on_expand(app):
+    from PyQt5.QtWidgets import QMainWindow
+    ui = ToolboxUI(QMainWindow())
+    ui.set_projects(["/w/a/x", "/w/a/y", "/w/b/z", "/o/q"])
+    ui.set_project_origins({"/w/a/x": ("Code",), "/w/a/y": ("Code", "Cursor"),
+                            "/w/b/z": ("Cursor",), "/o/q": ("Code",)})
+    ui.set_view_mode("folder")
+    model = ui.project_tree_model
+    groups = [model.index(row, 0) for row in range(model.rowCount())]
+    assert [group.data(0) for group in groups] == ["/w/a", "/w/b", "/o"]
+    assert [group.data(model.GroupCountRole) for group in groups] == [2, 1, 1]
+    assert [model.rowCount(group) for group in groups] == [0, 0, 0]  # Nothing built while collapsed
+    ui.project_tree.expand(groups[0])
+    assert [model.index(row, 0, groups[0]).data(0x0100) for row in range(2)] == ["/w/a/x", "/w/a/y"]
+
+    ui.set_view_mode("editor")
+    assert [(model.index(row, 0).data(0), model.index(row, 0).data(model.GroupCountRole))
+            for row in range(model.rowCount())] == [("Code", 3), ("Cursor", 2)]
+    ui.set_view_mode("list")
+    assert ui.current_view() is ui.project_list and model.rowCount() == 0
+
+def test_grouped_view_filter_keeps_matching_branches(app):
+    from PyQt5.QtCore import QItemSelectionModel
+    from PyQt5.QtWidgets import QMainWindow
+    ui = ToolboxUI(QMainWindow())
+    ui.set_projects(["/w/a/x", "/w/a/y", "/w/b/z"])
+    ui.set_view_mode("folder")
+    model = ui.project_tree_model
+    ui.project_tree.expand(model.index(0, 0))
+    ui.filter_projects("z")
+    assert [model.index(row, 0).data(0) for row in range(model.rowCount())] == ["/w/b"]
+    assert model.rowCount(model.index(0, 0)) == 0  # Collapsed, so still no rows
+    # The group left open is reopened once it has matches again
+    ui.filter_projects("")
+    assert model.rowCount(model.index(0, 0)) == 2 and model.rowCount(model.index(1, 0)) == 0
+    ui.project_tree.selectionModel().select(model.index(1, 0, model.index(0, 0)), QItemSelectionModel.Select)
+    assert ui.selected_paths() == ["/w/a/y"]
+
+def test_toolbox_ui_filters_by_project_profile(app):
+    from PyQt5.QtWidgets import QMainWindow
+    from project_profile import ProjectProfile
+    ui = ToolboxUI(QMainWindow())
+    ui.set_projects(["/p/api", "/p/web", "/p/cli"])
+    ui.set_project_profiles({"/p/api": ProjectProfile("Python", 10, 0), "/p/web": ProjectProfile("TypeScript", 10, 0)})
+    ui.filter_projects("lang:python")
+    assert [ui.project_model.index(i).data(0) for i in range(ui.project_model.rowCount())] == ["api"]
+    ui.filter_projects("lang:ts w")
+    assert [ui.project_model.index(i).data(0) for i in range(ui.project_model.rowCount())] == ["web"]
+    assert ui.project_model.index(0).data(ui.project_model.ProfileRole).language == "TypeScript"
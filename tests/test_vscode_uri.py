@@ -0,0 +1,89 @@
+import sqlite3
+from vscode_uri import is_remote, launch_arguments, project_from_uri, remote_label
+
+def test_uris_decode_to_projects():
+    assert project_from_uri("file:///home/me/my%20app") == "/home/me/my app"
+    assert project_from_uri("file:///home/me/mono/all.code-workspace") == "/home/me/mono"
+    remote = project_from_uri("vscode-remote://ssh-remote%2Bbuild-1/srv/my%20api/")
+    assert remote == "vscode-remote://ssh-remote+build-1/srv/my api"
+    assert project_from_uri("vscode-remote://wsl%2Bubuntu/home/x/ws.code-workspace") == "vscode-remote://wsl+ubuntu/home/x"
+    assert project_from_uri("/plain/path") is None and project_from_uri(None) is None
+    assert is_remote(remote) and not is_remote("/srv/api") and not is_remote("C:\\src\\api")
+
+def test_remote_projects_open_by_folder_uri():
+    remote = "vscode-remote://ssh-remote+build-1/srv/my api"
+    assert launch_arguments("/srv/api") == ["/srv/api"]
+    assert launch_arguments(remote) == ["--folder-uri", "vscode-remote://ssh-remote%2Bbuild-1/srv/my%20api"]
+    assert remote_label(remote) == "SSH: build-1"
+    assert remote_label(project_from_uri("vscode-remote://dev-container%2B7b22/workspaces/app")) == "Dev Container"
+    assert remote_label("/srv/api") is None
+
+def test_database_reader_keeps_workspaces_and_remotes(isolated_home, tmp_path):
+    import json
+    from toolbox_core import ProjectDiscovery, read_item_values
+    db_path = tmp_path / "state vscdb"  # A space, as in "Application Support"
+    entries = [{"folderUri": "file:///src/a"},
+               {"workspace": {"id": "1", "configPath": "file:///src/mono/all.code-workspace"}},
+               {"folderUri": "vscode-remote://ssh-remote%2Bbox/srv/api", "remoteAuthority": "ssh-remote+box"},
+               {"fileUri": "file:///src/notes.md"}]
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.execute("INSERT INTO ItemTable VALUES (?, ?)", ("history.recentlyOpenedPathsList", json.dumps({"entries": entries})))
+    conn.execute("INSERT INTO ItemTable VALUES (?, ?)", ("other", "{}"))
+    conn.commit()
+    conn.execute("BEGIN EXCLUSIVE")  # VSCode in the middle of a write; a locking reader would wait
+    assert list(read_item_values(str(db_path), ("history.recentlyOpenedPathsList", "missing"))) == \
+        ["history.recentlyOpenedPathsList"]
+    conn.rollback()
+    conn.close()
+    assert ProjectDiscovery().load_recent_projects_from_db(str(db_path)) == [
+        "/src/a", "/src/mono", "vscode-remote://ssh-remote+box/srv/api", "/src/notes.md"]
+
+def test_database_reader_sees_uncheckpointed_wal_writes(tmp_path):
+    import json
+    from toolbox_core import read_item_values
+    db_path = str(tmp_path / "state.vscdb")
+    key = "history.recentlyOpenedPathsList"
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA wal_autocheckpoint=0")  # VSCode running: writes stay in state.vscdb-wal
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.execute("INSERT INTO ItemTable VALUES (?, ?)", (key, json.dumps({"entries": [{"folderUri": "file:///old"}]})))
+    conn.commit()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("INSERT INTO ItemTable VALUES (?, ?)", (key, json.dumps(
+        {"entries": [{"folderUri": "file:///new"}, {"folderUri": "file:///old"}]})))
+    conn.commit()
+    try:
+        assert (tmp_path / "state.vscdb-wal").stat().st_size > 0
+        assert [e["folderUri"] for e in json.loads(read_item_values(db_path, (key,))[key])["entries"]] == \
+            ["file:///new", "file:///old"]
+    finally:
+        conn.close()
+
+def test_database_reader_locks_while_a_journal_is_pending(tmp_path, monkeypatch):
+    import toolbox_core
+    db_path = str(tmp_path / "state.vscdb")
+    key = "history.recentlyOpenedPathsList"
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.execute("INSERT INTO ItemTable VALUES (?, ?)", (key, "old"))
+    conn.execute("BEGIN")
+    conn.execute("INSERT INTO ItemTable VALUES (?, ?)", (key, "new"))  # Left in state.vscdb-journal
+    uris = []
+    query_items = toolbox_core._query_items
+    monkeypatch.setattr(toolbox_core, "_query_items", lambda uri, *args: uris.append(uri) or query_items(uri, *args))
+    try:
+        assert (tmp_path / "state.vscdb-journal").stat().st_size > 0
+        assert toolbox_core.read_item_values(db_path, (key,)) == {key: "old"}
+        assert len(uris) == 1 and "immutable" not in uris[0]
+    finally:
+        conn.rollback()
+        conn.close()
+
+def test_json_reader_tolerates_null_workspace(isolated_home, tmp_path):
+    import json
+    from toolbox_core import ProjectDiscovery
+    storage = tmp_path / "storage.json"
+    storage.write_text(json.dumps({"openedPathsList": {"entries": [{"workspace": None}, {"folderUri": "file:///src/a"}]}}))
+    assert ProjectDiscovery().load_recent_projects_from_json(str(storage)) == ["/src/a"]
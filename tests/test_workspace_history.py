@@ -0,0 +1,67 @@
+import json
+import os
+from tests.helpers import make_db
+from workspace_history import WorkspaceHistory, workspace_json_path
+
+def make_workspace(storage_dir, name, data, mtime):
+    directory = storage_dir / name
+    directory.mkdir(parents=True)
+    (directory / "workspace.json").write_text(json.dumps(data))
+    os.utime(directory, (mtime, mtime))
+
+def test_workspace_json_paths():
+    assert workspace_json_path({"folder": "file:///src/my%20app"}) == "/src/my app"
+    assert workspace_json_path({"workspace": "file:///src/mono/all.code-workspace"}) == "/src/mono"
+    assert workspace_json_path({"folder": "vscode-remote://ssh-remote%2Bbox/srv/app"}) == "vscode-remote://ssh-remote+box/srv/app"
+    assert workspace_json_path({"folder": 42}) is None
+
+def test_scan_orders_by_last_use_and_only_rereads_changed_directories(tmp_path, monkeypatch):
+    storage_dir = tmp_path / "workspaceStorage"
+    make_workspace(storage_dir, "a1", {"folder": "file:///src/old"}, 1000)
+    make_workspace(storage_dir, "b2", {"folder": "file:///src/new"}, 3000)
+    make_workspace(storage_dir, "c3", {"folder": "vscode-remote://wsl%2Bubuntu/home/x"}, 2000)
+    cache_path = str(tmp_path / "history.json")
+    history = WorkspaceHistory(cache_path)
+    assert history.scan(str(storage_dir)) == ["/src/new", "vscode-remote://wsl+ubuntu/home/x", "/src/old"]
+    history.save()
+
+    read = []
+    real_read = WorkspaceHistory._read
+    monkeypatch.setattr(WorkspaceHistory, "_read", staticmethod(lambda d: read.append(d) or real_read(d)))
+    os.utime(storage_dir / "a1", (4000, 4000))
+    assert WorkspaceHistory(cache_path).scan(str(storage_dir)) == ["/src/old", "/src/new", "vscode-remote://wsl+ubuntu/home/x"]
+    assert read == [str(storage_dir / "a1")]
+
+def test_deep_history_follows_the_recent_list(isolated_home):
+    user_dir = isolated_home / ".config/Code/User"
+    make_db(user_dir / "globalStorage/state.vscdb", ["/src/b", "/src/a"])
+    make_workspace(user_dir / "workspaceStorage", "1", {"folder": "file:///src/a"}, 1000)
+    make_workspace(user_dir / "workspaceStorage", "2", {"folder": "file:///src/forgotten"}, 500)
+    from toolbox_core import ProjectDiscovery
+    assert ProjectDiscovery().collect_recent_projects() == ["/src/b", "/src/a"]
+    discovery = ProjectDiscovery(workspace_history=WorkspaceHistory())
+    discovery.load_snapshot()
+    # The cached snapshot was built without deep history, so it is not reused
+    assert discovery.collect_recent_projects() == ["/src/b", "/src/a", "/src/forgotten"]
+
+def test_concurrent_scans_and_saves_keep_every_directory(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    dirs = []
+    for n in range(8):
+        storage_dir = tmp_path / f"storage{n}"
+        for i in range(20):
+            make_workspace(storage_dir, f"w{i}", {"folder": f"file:///src/{n}/{i}"}, 1000 + i)
+        dirs.append(str(storage_dir))
+    history = WorkspaceHistory(str(tmp_path / "history.json"))
+
+    def scan_and_save(storage_dir):
+        paths = history.scan(storage_dir)
+        history.save()
+        return paths
+
+    with ThreadPoolExecutor(8) as pool:
+        assert all(len(paths) == 20 for paths in pool.map(scan_and_save, dirs))
+    history.save()
+    reloaded = WorkspaceHistory(str(tmp_path / "history.json"))
+    reloaded.load()
+    assert sorted(reloaded._entries) == sorted(dirs)
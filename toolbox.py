@@ -1,204 +1,359 @@
-from PyQt5.QtWidgets import QApplication, QMainWindow
-from PyQt5.QtCore import Qt  # Add this import for Qt.UserRole
-import subprocess
-import json
+from PyQt5.QtWidgets import QApplication, QMainWindow, QShortcut, QMessageBox
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import Qt, QEvent, QTimer, pyqtSignal  # Add this import for Qt.UserRole
 import os
-import platform
 import sqlite3
-import urllib.parse
+import time
 from ui_components import ToolboxUI  # Import the new UI class
+from project_loader import ProjectLoader
+from project_launcher import ProjectLauncher
+from storage_watcher import StorageWatcher
+from path_health import OK
+from startup_profile import StartupProfile
+from instrumentation import get_logger, metrics
+from toolbox_core import LAUNCH_COMMAND, ProjectDiscovery
+
+log = get_logger("window")
 
 class ToolboxApp(QMainWindow):
-    def __init__(self):
+    # Emitted once, when the project list has been painted for the first time
+    painted = pyqtSignal()
+
+    def __init__(self, start_time=None, profile=None):
         super().__init__()
+        # Process start as measured by main.py, used to report time to first paint
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.profile = profile or StartupProfile(self.start_time)
+        self._startup_pending = {"paint", "load"}  # Reported once both are done
+        self.first_paint_ms = None
+        self.switch_ms = None  # Time from a show request to the window painting, when resident
+        self._paint_label = "First paint"
+        self._paint_started = self.start_time
+        # Set by ResidentController: closing then only hides the window, until quitting
+        self.resident = False
+        self.quitting = False
         
         # Set up the UI using our new UI class
-        self.ui = ToolboxUI(self)
+        self.ui = ToolboxUI(self, self.profile)
         self.project_list = self.ui.get_project_list()
+        self.project_list.viewport().installEventFilter(self)
+        # Finding and parsing projects lives in the GUI-free core, shared with the CLI
+        self.discovery = ProjectDiscovery(profile=self.profile)
         
         # Set a fixed width for the main window to prevent horizontal scrolling
         self.setMinimumWidth(600)
         self.setMaximumWidth(800)
         
-        # Load Recent Projects
-        self.load_recent_projects()
-        self.project_list.itemDoubleClicked.connect(self.open_project)
-
-    def find_storage_location(self):
-        """Tries to find the VSCode storage.json or state.vscdb path."""
-        system = platform.system()
-        home = os.path.expanduser("~")
-        
-        # Prioritize state.vscdb as it's more common in recent versions
-        db_possible_paths = []
-        json_possible_paths = []
-
-        if system == 'Darwin':  # macOS
-            base_paths = [
-                os.path.join(home, "Library/Application Support/Code/User/"),
-                os.path.join(home, "Library/Application Support/Code - Insiders/User/"),
-            ]
-        elif system == 'Linux':
-            base_paths = [
-                os.path.join(home, ".config/Code/User/"),
-                os.path.join(home, ".config/Code - Insiders/User/"),
-                os.path.join(home, ".var/app/com.visualstudio.code/config/Code/User/"),
-                os.path.join(home, ".var/app/com.visualstudio.code.insiders/config/Code/User/"),
-            ]
-        elif system == 'Windows':
-            base_paths = [
-                os.path.join(home, "AppData/Roaming/Code/User/"),
-                os.path.join(home, "AppData/Roaming/Code - Insiders/User/"),
-            ]
-        else:
-            base_paths = []
+        # Load Recent Projects in the background so the window shows right away
+        self.loader = ProjectLoader(parent=self)
+        self.loader.started.connect(lambda: self.ui.set_loading(True))
+        self.loader.batch_ready.connect(self.ui.append_projects)
+        self.loader.refreshed.connect(self.ui.sync_projects)
+        self.loader.finished.connect(self.on_projects_loaded)
+        self.loader.failed.connect(self.on_load_failed)
 
-        for base in base_paths:
-            db_possible_paths.append(os.path.join(base, "globalStorage/state.vscdb"))
-            json_possible_paths.append(os.path.join(base, "storage.json"))
+        # Git status and folder checks start after the first paint (see start_background_services)
+        self.git_enricher = None
+        self.health_checker = None
+        self.profiler = None
+        self.ui.get_project_model().git_status_needed.connect(self.request_git_statuses)
+        self.ui.prune_button.clicked.connect(self.confirm_prune_missing)
+        self.painted.connect(self.start_background_services)
 
-        # Check for state.vscdb first
-        for path in db_possible_paths:
-            if os.path.exists(path):
-                print(f"Found state database at: {path}")
-                return path, 'db'
-        
-        # Fallback to storage.json
-        for path in json_possible_paths:
-            if os.path.exists(path):
-                print(f"Found storage file at: {path}")
-                return path, 'json'
-                
-        print("Could not find VSCode state.vscdb or storage.json in common locations.")
-        print("Checked paths:")
-        for path in db_possible_paths + json_possible_paths:
-            print(f"- {path}")
-        return None, None
-
-    def load_recent_projects_from_db(self, db_path):
-        """Loads recent projects from the state.vscdb SQLite database."""
-        projects = set()
-        try:
-            conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)  # Read-only connection
-            cursor = conn.cursor()
-            # Query for the key that stores recently opened paths.
-            # This key might change between VSCode versions. 'history.recentlyOpenedPathsList' is common.
-            cursor.execute("SELECT value FROM ItemTable WHERE key = 'history.recentlyOpenedPathsList'")
-            result = cursor.fetchone()
-            conn.close()
-
-            if result:
-                # The value is often a JSON string
-                data = json.loads(result[0])
-                entries = data.get('entries', [])
-                for entry in entries:
-                    uri_str = entry.get('folderUri') or entry.get('fileUri')  # Prefer folders, fallback to files
-                    if uri_str and uri_str.startswith('file://'):
-                        # Decode percent-encoded characters and normalize path
-                        parsed_uri = urllib.parse.unquote(uri_str.replace('file://', ''))
-                        project_path = os.path.normpath(parsed_uri)
-                        # On Windows, remove leading '/' if present after replacing 'file://'
-                        if platform.system() == 'Windows' and project_path.startswith('/'):
-                            # Handle drive letters correctly, e.g., /C:/Users -> C:/Users
-                            if len(project_path) > 2 and project_path[2] == ':':
-                                project_path = project_path[1:]
-                        projects.add(project_path)
+        # Refresh the list in place whenever an editor writes new history
+        self.watchers = {}
+        with self.profile.phase("snapshot"):
+            self.load_cached_projects()
+        # Launches run as background processes, so a slow 'code' wrapper never blocks the UI
+        self.launcher = ProjectLauncher(LAUNCH_COMMAND, parent=self)
+        self.launch_errors = []
+        self.launches_recorded = False  # Re-rank once the launcher goes idle
+        self.launcher.launched.connect(self.on_project_launched)
+        self.launcher.failed.connect(self.on_launch_failed)
+        self.launcher.idle.connect(self.on_launches_done)
+        # Enter opens the whole selection, in the flat list and the grouped view alike
+        for view in (self.project_list, self.ui.project_tree):
+            view.doubleClicked.connect(self.open_project)
+            for key in (Qt.Key_Return, Qt.Key_Enter):
+                shortcut = QShortcut(QKeySequence(key), view)
+                shortcut.setContext(Qt.WidgetShortcut)
+                shortcut.activated.connect(self.open_selected_projects)
+
+        # F5 reloads the list from scratch, cancelling a load that is still running
+        self.reload_shortcut = QShortcut(QKeySequence.Refresh, self)
+        self.reload_shortcut.activated.connect(self.load_recent_projects)
+        # Escape puts a resident switcher away
+        self.hide_shortcut = QShortcut(QKeySequence(Qt.Key_Escape), self)
+        self.hide_shortcut.activated.connect(self.hide_switcher)
+        # F12 or Ctrl+Shift+D shows counters, timings and the recent log
+        self.diagnostics_panel = None
+        self.diagnostics_shortcuts = []
+        for key in ("F12", "Ctrl+Shift+D"):
+            shortcut = QShortcut(QKeySequence(key), self)
+            shortcut.activated.connect(self.show_diagnostics)
+            self.diagnostics_shortcuts.append(shortcut)
+
+    def show_diagnostics(self):
+        if self.diagnostics_panel is None:
+            from diagnostics_panel import DiagnosticsPanel  # Only loaded when asked for
+            self.diagnostics_panel = DiagnosticsPanel(self)
+        self.diagnostics_panel.show()
+        self.diagnostics_panel.raise_()
+        self.diagnostics_panel.activateWindow()
+
+    def changeEvent(self, event):
+        # Repositories may have changed while the user was elsewhere
+        if event.type() == QEvent.ActivationChange and self.isActiveWindow():
+            self.ui.get_project_model().refresh_git_statuses()
+        super().changeEvent(event)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self._paint_label is not None:
+            elapsed_ms = (time.perf_counter() - self._paint_started) * 1000
+            rows = self.ui.get_project_model().rowCount()
+            if self.first_paint_ms is None:
+                self.first_paint_ms = elapsed_ms
+                metrics.observe("startup.first_paint", elapsed_ms)
             else:
-                print(f"Key 'history.recentlyOpenedPathsList' not found in {db_path}")
-
-        except sqlite3.Error as e:
-            print(f"SQLite error reading {db_path}: {e}")
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from database: {e}")
-        except Exception as e:
-            print(f"An error occurred while processing {db_path}: {e}")
-        
-        return projects
+                self.switch_ms = elapsed_ms
+                metrics.observe("resident.switch", elapsed_ms)
+            log.info("%s after %.0f ms with %d projects", self._paint_label, elapsed_ms, rows,
+                     extra={"fields": {"elapsed_ms": round(elapsed_ms, 1), "projects": rows}})
+            first = self._paint_label == "First paint"
+            self._paint_label = None
+            obj.removeEventFilter(self)
+            if first:
+                self.profile.add("first paint", self.start_time)
+                # Queued, so the paint in progress finishes before anything else starts
+                QTimer.singleShot(0, self.painted.emit)
+        return super().eventFilter(obj, event)
 
-    def load_recent_projects_from_json(self, storage_path):
-        """Loads recent projects from the storage.json file."""
-        projects = set()
-        try:
-            with open(storage_path, "r", encoding='utf-8') as f:
-                data = json.load(f)
-                recent_paths_data = data.get("openedPathsList", {})
-                # Combine entries from different potential keys
-                entries = recent_paths_data.get("entries", []) + \
-                          recent_paths_data.get("workspaces3", []) + \
-                          recent_paths_data.get("files2", []) + \
-                          recent_paths_data.get("workspaces2", [])  # Older keys
-
-                for entry in entries:
-                    path_uri = None
-                    if isinstance(entry, str):  # Older format like "file:///path" or workspace path
-                        if entry.startswith("file://"):
-                            path_uri = entry
-                        elif entry.endswith(".code-workspace"):  # Handle workspace file paths directly
-                            # Use the directory containing the .code-workspace file
-                            project_path = os.path.dirname(os.path.normpath(entry))
-                            projects.add(project_path)
-                            continue  # Skip further processing for this entry
-                    elif isinstance(entry, dict):  # Newer format with folderUri or workspace.configPath
-                        path_uri = entry.get("folderUri") or entry.get("workspace", {}).get("configPath")
-
-                    if path_uri and path_uri.startswith("file://"):
-                        # Decode URI and normalize path
-                        project_path = os.path.normpath(urllib.parse.unquote(path_uri.replace("file://", "")))
-                        # On Windows, remove leading '/' if present after replacing 'file://'
-                        if platform.system() == 'Windows' and project_path.startswith('/'):
-                            if len(project_path) > 2 and project_path[2] == ':':
-                                project_path = project_path[1:]
-                        # Add the parent directory for .code-workspace files referenced by URI
-                        if project_path.endswith(".code-workspace"):
-                            project_path = os.path.dirname(project_path)
-                        projects.add(project_path)
-
-        except json.JSONDecodeError:
-            print(f"Error reading or parsing {storage_path}")
-        except Exception as e:
-            print(f"An error occurred while processing {storage_path}: {e}")
-        return projects
+    def start_background_services(self):
+        """Starts what the first paint does not need: git status, folder checks and profiling.
+
+        Their imports (concurrent.futures, multiprocessing, subprocess) and cache
+        loading are kept off the path to the first paint, and so is reading
+        the settings, which may switch to the grouped view.
+        """
+        with self.profile.phase("background services"):
+            from git_enricher import GitStatusEnricher
+            from health_checker import PathHealthChecker
+            from project_profiler import ProjectProfiler
+            from settings import load_settings
+
+            # Git branch and state are fetched in the background for the rows being painted
+            self.git_enricher = GitStatusEnricher(parent=self)
+            self.git_enricher.statuses_ready.connect(self.ui.get_project_model().set_git_statuses)
+
+            # Project folders are checked in the background; a dead mount only greys out its rows
+            self.health_checker = PathHealthChecker(parent=self)
+            self.health_checker.health_ready.connect(self.ui.set_project_health)
+            # Language, size and last change, for folders once they are known to be there
+            self.profiler = ProjectProfiler(parent=self)
+            self.profiler.profiles_ready.connect(self.ui.set_project_profiles)
+            self.health_checker.health_ready.connect(self.profile_projects)
+            settings = load_settings()
+            self.ui.hide_missing_checkbox.setChecked(bool(settings.get("hide_missing_projects")))
+            if settings.get("project_view") in ("folder", "editor"):
+                self.ui.set_view_mode(settings["project_view"])
+            self.health_checker.check(self.ui.get_project_model().paths())
+        self._startup_step_done("paint")
+
+    def _startup_step_done(self, step):
+        self._startup_pending.discard(step)
+        if not self._startup_pending and self.profile.enabled:
+            self.profile.report()
+            self.close()
+            QApplication.quit()
+
+    def show_switcher(self):
+        """Brings the window up with the search box focused and its text selected."""
+        if self._paint_label is None:
+            self._paint_label = "Switcher shown"
+            self._paint_started = time.perf_counter()
+            self.project_list.viewport().installEventFilter(self)
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        self.ui.search_input.selectAll()
+        self.ui.search_input.setFocus()
+
+    def hide_switcher(self):
+        if self.resident:
+            self.hide()
+
+    def trim_memory(self):
+        """Drops caches that are cheap to rebuild, while the window is hidden."""
+        self.ui.search_index.trim()
+
+    def load_cached_projects(self):
+        """Shows the cached snapshot right away, then checks it against VSCode's storage."""
+        snapshot = self.discovery.load_snapshot()
+        if snapshot is None:
+            self.load_recent_projects()
+            return
+        self.ui.set_projects(snapshot.paths)
+        self.ui.set_project_origins(snapshot.origins)
+        self.discovery.release_projects()  # The window's ProjectStore holds them from here on
+        self.ui.set_loading(True)
+        self.refresh_recent_projects()
 
     def load_recent_projects(self):
-        storage_location, storage_type = self.find_storage_location()
-        processed_paths = set()
+        """Starts (or restarts) loading recent projects in the background, bypassing the cache."""
+        self.ui.set_projects([])
+        self.loader.start(lambda: self.discovery.collect_recent_projects(use_cache=False))
 
-        if storage_type == 'db':
-            processed_paths = self.load_recent_projects_from_db(storage_location)
-        elif storage_type == 'json':
-            processed_paths = self.load_recent_projects_from_json(storage_location)
-        else:
-            # Message already printed by find_storage_location
-            return 
-
-        # Clear existing list before adding new items
-        self.project_list.clear()
-
-        # Add unique paths to the list widget
-        for project_path in sorted(list(processed_paths)):
-            # Display only the folder name for brevity
-            folder_name = os.path.basename(project_path)
-            # Use the new custom item widget
-            self.ui.add_project_item(folder_name, project_path)
-
-    def open_project(self, item):
-        # Retrieve the full path stored in the item's data
-        project_path = item.data(1) or item.data(Qt.UserRole)  # Try both roles for compatibility
+    def refresh_recent_projects(self):
+        """Re-reads recent projects in the background and applies only the differences."""
+        self.loader.refresh(self.discovery.collect_recent_projects)
+
+    def on_projects_loaded(self, total):
+        self.ui.set_loading(False)
+        self.ui.set_project_origins(self.discovery.project_origins)
+        self.discovery.release_projects()
+        # Rank the matches that streamed in while a search was active
+        if self.ui.search_input.text():
+            self.ui.apply_filter()
+        self.update_watchers()
+        if self.health_checker is not None:
+            self.health_checker.check(self.ui.get_project_model().paths())
+        self._startup_step_done("load")
+
+    def request_git_statuses(self, paths):
+        """Asks for git status only where the folder is known to be there.
+
+        A path on a dead mount would tie up a git worker indefinitely; the
+        model asks again for the rest once their health is known.
+        """
+        if self.git_enricher is None:
+            return  # Not started yet; the model asks again once health is known
+        model = self.ui.get_project_model()
+        healthy = [path for path in paths if model.health(path) == OK]
+        if healthy:
+            self.git_enricher.request(healthy)
+
+    def profile_projects(self, states):
+        """Profiles the folders just found to be there; a dead mount would stall a worker."""
+        self.profiler.profile([path for path, state in states.items() if state == OK])
+
+    def confirm_prune_missing(self):
+        paths = self.ui.get_project_model().unhealthy_paths()
+        if not paths:
+            return
+        answer = QMessageBox.question(
+            self, "Prune missing projects",
+            f"Remove {len(paths)} missing or unreachable projects from this list for good?\n"
+            "VSCode's own history is not changed.")
+        if answer == QMessageBox.Yes:
+            self.prune_projects(paths)
+
+    def prune_projects(self, paths):
+        """Drops paths from the list and keeps them out of future loads."""
+        try:
+            self.discovery.prune(paths)
+        except (OSError, sqlite3.Error) as e:
+            self.ui.show_status(f"Could not prune projects: {e}", error=True)
+            return
+        pruned = set(paths)
+        self.ui.sync_projects([path for path in self.ui.get_project_model().paths() if path not in pruned])
+        self.ui.update_hidden_paths()
+        self.ui.show_status(f"Pruned {len(paths)} projects.")
+        self.refresh_recent_projects()
+
+    def update_watchers(self):
+        """Watches exactly the storage files the last load read from."""
+        wanted = {path: storage_type for path, storage_type, _ in self.discovery.storage_locations}
+        for path in list(self.watchers):
+            if path not in wanted:
+                watcher = self.watchers.pop(path)
+                watcher.stop()
+                watcher.deleteLater()
+        for path, storage_type in wanted.items():
+            if path not in self.watchers:
+                watcher = StorageWatcher(parent=self)
+                watcher.changed.connect(self.refresh_recent_projects)
+                watcher.watch(path, storage_type)
+                self.watchers[path] = watcher
+
+    def on_load_failed(self, message):
+        self.ui.set_loading(False)
+        log.error("Failed to load recent projects: %s", message)
+        self._startup_step_done("load")
+
+    def closeEvent(self, event):
+        if self.resident and not self.quitting:
+            # Stay loaded in the tray; the next launch shows this window again
+            event.ignore()
+            self.hide()
+            return
+        for watcher in self.watchers.values():
+            watcher.stop()
+        self.loader.shutdown()
+        self.launcher.shutdown()
+        if self.git_enricher is not None:
+            self.git_enricher.shutdown()
+            self.health_checker.shutdown()
+            self.profiler.shutdown()
+        super().closeEvent(event)
+
+    def open_project(self, index):
+        if index.model().hasChildren(index):
+            return  # A group of the grouped view, which opens and closes on double-click
+        # Retrieve the full path stored in the model's data
+        project_path = index.data(Qt.UserRole)
         if project_path:
-            try:
-                # Add the --new-window flag to force opening in a new VS Code window
-                subprocess.run(["code", "--new-window", project_path], check=True)
-            except FileNotFoundError:
-                print("Error: 'code' command not found. Make sure VSCode is installed and added to your PATH.")
-            except Exception as e:
-                print(f"Failed to open project: {e}")
+            self.open_projects([project_path])
+        else:
+            self.ui.show_status("Could not retrieve project path.", error=True)
+
+    def open_selected_projects(self):
+        """Opens every selected project, a few editor windows at a time."""
+        self.open_projects(self.ui.selected_paths())
+
+    def open_projects(self, paths):
+        """Hands paths to the launcher; the UI stays responsive while VSCode starts."""
+        if not paths:
+            return
+        self.launcher.open(paths)
+        pending = self.launcher.pending_count()
+        if pending > 1:
+            self.ui.show_status(f"Opening {pending} projects...")
+        else:
+            self.ui.show_status(f"Opening {os.path.basename(paths[0]) or paths[0]}...")
+
+    def on_project_launched(self, path):
+        """Counts the launch towards the project's frecency; the list is re-ranked once all are done."""
+        try:
+            self.discovery.frecency.record_launch(path)
+        except (OSError, sqlite3.Error) as e:
+            log.warning("Could not record launch of %s: %s", path, e)
+            return
+        self.launches_recorded = True
+
+    def on_launch_failed(self, path, message):
+        self.launch_errors.append(f"{os.path.basename(path) or path}: {message}")
+
+    def on_launches_done(self):
+        """Re-ranks after the launches just recorded and reports their errors, if any."""
+        if self.launches_recorded:
+            self.launches_recorded = False
+            self.refresh_recent_projects()
+        if self.launch_errors:
+            if len(self.launch_errors) == 1:
+                message = f"Failed to open {self.launch_errors[0]}"
+            else:
+                message = (f"Failed to open {len(self.launch_errors)} projects:\n"
+                           + "\n".join(self.launch_errors[:5]))
+            self.ui.show_status(message, error=True, timeout_ms=15000)
+            self.launch_errors = []
         else:
-            print("Error: Could not retrieve project path.")
+            self.ui.clear_status()
 
 
 if __name__ == "__main__":
     import sys
+    start_time = time.perf_counter()
     app = QApplication(sys.argv)
-    window = ToolboxApp()
+    window = ToolboxApp(start_time)
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,422 @@
+import json
+import os
+import platform
+import sqlite3
+import time
+from snapshot_cache import Snapshot, SnapshotCache
+from storage_json import ENTRY_KEYS, iter_opened_paths
+from settings import extra_storage_paths, load_settings
+from frecency import FrecencyStore
+from path_health import PrunedPaths
+from startup_profile import StartupProfile
+from workspace_history import WorkspaceHistory, workspace_storage_dir
+from instrumentation import get_logger, metrics
+from vscode_uri import is_remote, launch_arguments, project_from_uri
+
+# subprocess, urllib.parse and concurrent.futures are imported where they are
+# used: the window needs this module before its first paint, but not them.
+
+log = get_logger("discovery")
+
+# Command line used to open a project in a new VSCode window
+LAUNCH_COMMAND = ("code", "--new-window")
+# ItemTable keys of state.vscdb holding recently opened entries, read in this order
+RECENT_KEYS = ("history.recentlyOpenedPathsList",)
+
+
+def read_item_values(db_path, keys):
+    """Returns {key: value} for those of keys present in a state.vscdb, with a single query.
+
+    The database is opened read-only. While it has no pending write-ahead
+    log or rollback journal it is read as an immutable snapshot, so no lock
+    is taken and VSCode writing at the same time is never held up, nor
+    holds this up. A non-empty -wal file holds writes not yet checkpointed
+    into the database, which an immutable read would miss; a non-empty
+    -journal means a transaction is under way, or was cut short, and the
+    database file may hold half of it. Either way a normal read-only
+    connection is used. Should the snapshot catch a write halfway, the read
+    is retried once the same way.
+    """
+    query = f"SELECT key, value FROM ItemTable WHERE key IN ({', '.join('?' * len(keys))})"
+    if _has_pending_writes(db_path):
+        return _query_items(sqlite_uri(db_path, immutable=False), query, keys)
+    try:
+        return _query_items(sqlite_uri(db_path, immutable=True), query, keys)
+    except sqlite3.DatabaseError as e:
+        log.info("Re-reading %s with locking after: %s", db_path, e)
+        return _query_items(sqlite_uri(db_path, immutable=False), query, keys)
+
+
+def _has_pending_writes(db_path):
+    for suffix in ("-wal", "-journal"):
+        try:
+            if os.path.getsize(db_path + suffix) > 0:
+                return True
+        except OSError:
+            pass
+    return False
+
+
+def _query_items(uri, query, keys):
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        return dict(conn.execute(query, keys).fetchall())
+    finally:
+        conn.close()
+
+
+def sqlite_uri(db_path, immutable=False):
+    """A read-only SQLite URI for db_path, percent-encoded so that ?, # and % in it are safe."""
+    from urllib.parse import quote
+    path = os.path.abspath(db_path).replace(os.sep, "/")
+    if not path.startswith("/"):
+        path = "/" + path  # C:/Users/... on Windows
+    return f"file:{quote(path)}?mode=ro" + ("&immutable=1" if immutable else "")
+
+
+class ProjectDiscovery:
+    """Finds, parses and ranks the recent projects of every VSCode install.
+
+    This is the GUI-free core shared by the window, the command line and the
+    daemon: nothing here imports Qt. The last result is kept on the instance,
+    with the storage files it came from and the editors of each project.
+    """
+    def __init__(self, snapshot_cache=None, frecency=None, pruned=None, profile=None,
+                 workspace_history=None):
+        self.snapshot_cache = snapshot_cache or SnapshotCache()
+        self.frecency = frecency or FrecencyStore()
+        self.pruned = pruned or PrunedPaths()
+        self.profile = profile or StartupProfile()
+        # Deep history from workspaceStorage, when enabled in the settings
+        if workspace_history is None and load_settings().get("deep_history"):
+            workspace_history = WorkspaceHistory()
+        self.workspace_history = workspace_history
+        self.snapshot = None
+        self.storage_locations = []
+        self.unreadable_locations = []
+        self.project_origins = {}
+
+    def load_snapshot(self):
+        """Loads the cached project list, which may be out of date; returns None if there is none."""
+        with metrics.span("snapshot.load", "snapshot") as args:
+            self.snapshot = self.snapshot_cache.load()
+            args["projects"] = len(self.snapshot.paths) if self.snapshot else 0
+        return self.snapshot
+
+    def release_projects(self):
+        """Drops the project list kept from the last load, once the caller holds its own copy.
+
+        Only the snapshot's sources are kept, so the next collect can still
+        tell whether anything changed; an unchanged list is read back from
+        the cache file.
+        """
+        if self.snapshot is not None:
+            self.snapshot = Snapshot(self.snapshot.sources, None)
+        self.project_origins = {}
+
+    def editor_base_paths(self):
+        """Returns (editor name, User directory) pairs for every known VSCode install and fork."""
+        system = platform.system()
+        home = os.path.expanduser("~")
+
+        if system == 'Darwin':  # macOS
+            support = os.path.join(home, "Library/Application Support")
+            base_paths = [
+                ("Code", os.path.join(support, "Code/User/")),
+                ("Code - Insiders", os.path.join(support, "Code - Insiders/User/")),
+                ("VSCodium", os.path.join(support, "VSCodium/User/")),
+                ("Cursor", os.path.join(support, "Cursor/User/")),
+            ]
+        elif system == 'Linux':
+            base_paths = [
+                ("Code", os.path.join(home, ".config/Code/User/")),
+                ("Code - Insiders", os.path.join(home, ".config/Code - Insiders/User/")),
+                ("VSCodium", os.path.join(home, ".config/VSCodium/User/")),
+                ("Cursor", os.path.join(home, ".config/Cursor/User/")),
+                ("Code (Flatpak)", os.path.join(home, ".var/app/com.visualstudio.code/config/Code/User/")),
+                ("Code - Insiders (Flatpak)",
+                 os.path.join(home, ".var/app/com.visualstudio.code.insiders/config/Code/User/")),
+                ("VSCodium (Flatpak)", os.path.join(home, ".var/app/com.vscodium.codium/config/VSCodium/User/")),
+                ("Code (Snap)", os.path.join(home, "snap/code/current/.config/Code/User/")),
+            ]
+        elif system == 'Windows':
+            roaming = os.path.join(home, "AppData/Roaming")
+            base_paths = [
+                ("Code", os.path.join(roaming, "Code/User/")),
+                ("Code - Insiders", os.path.join(roaming, "Code - Insiders/User/")),
+                ("VSCodium", os.path.join(roaming, "VSCodium/User/")),
+                ("Cursor", os.path.join(roaming, "Cursor/User/")),
+            ]
+        else:
+            base_paths = []
+
+        return base_paths + extra_storage_paths()
+
+    def probe_storage(self, editor, base):
+        """Returns (path, type, editor) for the storage under base, or None if there is none.
+
+        base is normally a User directory, where state.vscdb is preferred over
+        the older storage.json. A storage file can also be given directly.
+        """
+        if os.path.isfile(base):
+            return base, ('db' if base.endswith(".vscdb") else 'json'), editor
+        db_path = os.path.join(base, "globalStorage/state.vscdb")
+        if os.path.exists(db_path):
+            return db_path, 'db', editor
+        json_path = os.path.join(base, "storage.json")
+        if os.path.exists(json_path):
+            return json_path, 'json', editor
+        return None
+
+    def source_keys(self, locations):
+        """Describes the current state of everything the project list is built from."""
+        sources = [SnapshotCache.source_key(path, storage_type) for path, storage_type, _ in locations]
+        if self.workspace_history is not None:
+            # A new workspaceStorage directory means a project opened for the first time
+            for location in locations:
+                storage_dir = workspace_storage_dir(location)
+                if storage_dir is not None:
+                    sources.append(SnapshotCache.source_key(storage_dir, 'dir'))
+        if self.frecency.exists():
+            sources.append(SnapshotCache.source_key(self.frecency.path, 'db'))
+        pruned_key = SnapshotCache.source_key(self.pruned.path, 'json')
+        if pruned_key is not None:
+            sources.append(pruned_key)
+        return sources
+
+    def find_storage_locations(self):
+        """Probes every known install in parallel; returns (path, type, editor) for each one found."""
+        from concurrent.futures import ThreadPoolExecutor
+        base_paths = self.editor_base_paths()
+        with ThreadPoolExecutor(max_workers=max(1, len(base_paths))) as pool:
+            probed = list(pool.map(lambda base: self.probe_storage(*base), base_paths))
+
+        locations = []
+        seen = set()
+        for location in probed:
+            if location is None:
+                continue
+            real_path = os.path.realpath(location[0])
+            if real_path in seen:
+                continue  # The same install configured twice
+            seen.add(real_path)
+            kind = "state database" if location[1] == 'db' else "storage file"
+            log.info("Found %s %s at: %s", location[2], kind, location[0],
+                     extra={"fields": {"editor": location[2], "format": location[1], "path": location[0]}})
+            locations.append(location)
+
+        metrics.count("discovery.locations", len(locations))
+        if not locations:
+            log.warning("Could not find VSCode state.vscdb or storage.json in common locations. Checked paths:\n%s",
+                        "\n".join(f"- {base}" for _, base in base_paths))
+        return locations
+
+    def load_storage(self, location):
+        """Reads one storage location with the loader matching its type.
+
+        With deep history on, the projects recorded in the install's
+        workspaceStorage are added after its recent list. Returns None if
+        the storage file could not be read.
+        """
+        storage_path, storage_type, editor = location
+        start = time.perf_counter()
+        if storage_type == 'db':
+            recent = self.load_recent_projects_from_db(storage_path)
+        else:
+            recent = self.load_recent_projects_from_json(storage_path)
+        if recent is None:
+            return None
+        end = time.perf_counter()
+        metrics.record_span(f"parse.{storage_type}", start, end, "parsing",
+                            {"editor": editor, "entries": len(recent)})
+        metrics.count(f"parse.entries.{storage_type}", len(recent))
+        if recent and end > start:
+            # Throughput per format, to tell a slow disk from a long history
+            metrics.observe(f"parse.entries_per_s.{storage_type}", len(recent) / (end - start), "entries/s")
+        storage_dir = workspace_storage_dir(location) if self.workspace_history is not None else None
+        if storage_dir is None:
+            return recent
+        # Projects that dropped off the capped recent list follow it, most recently used first
+        known = set(recent)
+        return recent + [path for path in self.workspace_history.scan(storage_dir) if path not in known]
+
+    def load_all_sources(self, locations):
+        """Reads every location in parallel; returns {project path: (editor, ...)}.
+
+        The dict lists each source's history in turn, in discovery order,
+        with a project seen in an earlier source kept at its first place.
+        A project newly opened in one editor then only shifts the rows of
+        the sources after it, rather than those of every source. A location
+        that could not be read keeps the projects it had in the last
+        snapshot rather than losing them all; such locations are left in
+        self.unreadable_locations.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(1, len(locations))) as pool:
+            results = list(pool.map(self.load_storage, locations))
+
+        self.unreadable_locations = [location for location, recent in zip(locations, results) if recent is None]
+        if self.unreadable_locations:
+            previous = self.previous_origins()
+            results = [recent if recent is not None else
+                       [path for path, editors in previous.items() if editor in editors]
+                       for (_, _, editor), recent in zip(locations, results)]
+
+        # Editors are listed in discovery order too, whichever opened the project last
+        origins = {}
+        for (_, _, editor), recent in zip(locations, results):
+            for project_path in recent:
+                editors = origins.get(project_path, ())
+                if editor not in editors:
+                    origins[project_path] = editors + (editor,)
+        return origins
+
+    def previous_origins(self):
+        """Returns {project path: (editor, ...)} from the last snapshot, read back if released."""
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.paths is None:
+            snapshot = self.snapshot_cache.load()
+        return snapshot.origins if snapshot is not None else {}
+
+    def load_recent_projects_from_db(self, db_path):
+        """Loads recent projects from the state.vscdb SQLite database, most recent first.
+
+        Folders, workspaces and files are read from every key in RECENT_KEYS,
+        local and remote alike, all decoded by project_from_uri(). Returns
+        None if the database could not be read, which is not the same as an
+        empty history.
+        """
+        projects = {}  # Used as an ordered set
+        try:
+            values = read_item_values(db_path, RECENT_KEYS)
+            if not values:
+                log.warning("Key '%s' not found in %s", RECENT_KEYS[0], db_path)
+            for key in RECENT_KEYS:
+                if key not in values:
+                    continue
+                data = json.loads(values[key])
+                for entries_key in ENTRY_KEYS:
+                    for entry in data.get(entries_key, []):
+                        if isinstance(entry, dict):
+                            # Prefer folders and workspaces, fall back to files
+                            uri = (entry.get('folderUri') or (entry.get('workspace') or {}).get('configPath')
+                                   or entry.get('fileUri'))
+                        else:
+                            uri = entry
+                        project_path = project_from_uri(uri)
+                        if project_path:
+                            projects[project_path] = None
+
+        except sqlite3.Error as e:
+            metrics.count("parse.errors.db")
+            log.error("SQLite error reading %s: %s", db_path, e, extra={"fields": {"path": db_path}})
+            return None
+        except json.JSONDecodeError as e:
+            metrics.count("parse.errors.db")
+            log.error("Error decoding JSON from database %s: %s", db_path, e, extra={"fields": {"path": db_path}})
+            return None
+        except Exception as e:
+            metrics.count("parse.errors.db")
+            log.exception("An error occurred while processing %s: %s", db_path, e)
+            return None
+
+        return list(projects)
+
+    def load_recent_projects_from_json(self, storage_path):
+        """Loads recent projects from the storage.json file, most recent first, or None if unreadable."""
+        projects = {}  # Used as an ordered set
+        try:
+            # Only the openedPathsList subtree is parsed, entries from all its keys in turn
+            for entry in iter_opened_paths(storage_path):
+                path_uri = None
+                if isinstance(entry, str):  # Older format like "file:///path" or workspace path
+                    if is_remote(entry):
+                        path_uri = entry
+                    elif entry.endswith(".code-workspace"):  # Handle workspace file paths directly
+                        # Use the directory containing the .code-workspace file
+                        project_path = os.path.dirname(os.path.normpath(entry))
+                        projects[project_path] = None
+                        continue  # Skip further processing for this entry
+                elif isinstance(entry, dict):  # Newer format with folderUri or workspace.configPath
+                    path_uri = entry.get("folderUri") or (entry.get("workspace") or {}).get("configPath")
+
+                # Local and remote URIs alike, decoded the same way as in the database
+                project_path = project_from_uri(path_uri)
+                if project_path:
+                    projects[project_path] = None
+        except json.JSONDecodeError:
+            metrics.count("parse.errors.json")
+            log.error("Error reading or parsing %s", storage_path, extra={"fields": {"path": storage_path}})
+            return None
+        except Exception as e:
+            metrics.count("parse.errors.json")
+            log.exception("An error occurred while processing %s: %s", storage_path, e)
+            return None
+        return list(projects)
+
+    def prune(self, paths):
+        """Removes projects from the list for good, along with their launch history."""
+        self.pruned.add(paths)
+        for path in paths:
+            self.frecency.forget(path)
+
+    def collect_recent_projects(self, use_cache=True):
+        """Returns the ranked recent project paths from every install.
+
+        Projects are ordered by launch frecency merged with VSCode's own
+        recency order. When neither the storage files nor the launch history
+        changed since the cached snapshot was taken, the snapshot is returned
+        without parsing anything. Projects the user pruned are left out. The
+        editors each project was opened in are left in self.project_origins.
+        """
+        with self.profile.phase("discovery"), metrics.span("discovery", "discovery"):
+            locations = self.find_storage_locations()
+        self.storage_locations = locations
+        if not locations:
+            # Already logged by find_storage_locations
+            self.project_origins = {}
+            return []
+
+        sources = self.source_keys(locations)
+        snapshot = self.snapshot
+        if use_cache and self.snapshot_cache.is_fresh(snapshot, sources):
+            if snapshot.paths is None:
+                # Released by the window; the cache file holds the same list
+                snapshot = self.snapshot = self.snapshot_cache.load()
+            if self.snapshot_cache.is_fresh(snapshot, sources):
+                metrics.count("snapshot.fresh")
+                self.project_origins = snapshot.origins
+                return snapshot.paths
+
+        with self.profile.phase("parsing"), metrics.span("parsing", "parsing") as args:
+            origins = self.load_all_sources(locations)
+            args["projects"] = len(origins)
+            pruned = self.pruned.load()
+            if pruned:
+                origins = {path: editors for path, editors in origins.items() if path not in pruned}
+            paths = self.frecency.rank(list(origins))
+            if self.workspace_history is not None:
+                self.workspace_history.save()
+        if self.unreadable_locations:
+            # Never fresh, so the next collect tries those files again
+            unreadable = {storage_path for storage_path, _, _ in self.unreadable_locations}
+            sources = [None if key is not None and key["path"] in unreadable else key for key in sources]
+        self.snapshot = self.snapshot_cache.save_snapshot(sources, paths, origins)
+        self.project_origins = origins
+        return paths
+
+
+def open_in_editor(path, command=LAUNCH_COMMAND):
+    """Opens path in VSCode and waits for the command line wrapper to hand it over.
+
+    Returns None on success or an error message. The window uses the
+    non-blocking ProjectLauncher instead.
+    """
+    import subprocess
+    try:
+        result = subprocess.run(list(command) + launch_arguments(path), capture_output=True, text=True)
+    except OSError as e:
+        return f"Could not run '{command[0]}': {e}"
+    if result.returncode != 0:
+        return result.stderr.strip() or f"'{command[0]}' exited with code {result.returncode}"
+    return None
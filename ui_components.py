@@ -1,75 +1,545 @@
-from PyQt5.QtWidgets import (QMainWindow, QListWidget, QVBoxLayout, QWidget,
-                            QListWidgetItem, QLabel, QHBoxLayout, QLineEdit,
-                            QPushButton, QFrame, QSizePolicy, QStyle)
-from PyQt5.QtGui import QIcon, QFont, QPalette, QColor
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtWidgets import (QMainWindow, QListView, QVBoxLayout, QWidget,
+                            QLabel, QHBoxLayout, QLineEdit, QPushButton, QFrame,
+                            QSizePolicy, QStyle, QStyledItemDelegate, QCheckBox,
+                            QComboBox, QTreeView)
+from PyQt5.QtGui import QIcon, QFont, QFontMetrics, QPalette, QColor, QPainter
+from PyQt5.QtCore import Qt, QSize, QRect, QAbstractListModel, QModelIndex, QTimer, pyqtSignal
 import os  # Add this import for path operations
+import time
+from array import array
+from collections import Counter
+from itertools import filterfalse, islice, repeat
+from project_store import ProjectStore
+from search_index import SearchIndex
+from path_health import MISSING, OK, UNREACHABLE
+from project_profile import parse_filters
+from vscode_uri import remote_label
+from startup_profile import StartupProfile
+from instrumentation import metrics
 
-class ProjectListItem(QWidget):
-    """Custom widget for project list items that looks more modern."""
-    def __init__(self, folder_name, full_path, parent=None):
+class ProjectListModel(QAbstractListModel):
+    """List model over project records; rows are painted by ProjectItemDelegate.
+
+    Rows are record ids in a ProjectStore, kept in arrays, so the cost of a
+    row is four bytes rather than a tree of widgets or even a string; the
+    path is put back together when a role asks for it. A filter narrows the
+    visible rows to a subset of the records without touching the underlying
+    list. A filter may be given as an iterator, e.g. of search results still
+    being found: its rows are taken FETCH_SIZE at a time, as the view
+    scrolls to the end through fetchMore. Methods taking paths add them to
+    the store and work on their ids.
+    """
+    PathDisplayRole = Qt.UserRole + 1
+    OriginRole = Qt.UserRole + 2  # Editors the project was opened in, shown with several installs
+    GitStatusRole = Qt.UserRole + 3  # GitStatus, or None while unknown or not a repository
+    HealthRole = Qt.UserRole + 4  # path_health state, or None while unchecked
+    ProfileRole = Qt.UserRole + 5  # ProjectProfile, or None until the folder was profiled
+    HEALTH_STATES = (None, OK, MISSING, UNREACHABLE)  # Stored as their index, one byte per record
+    FETCH_SIZE = 500  # Filtered rows taken from an iterator at a time
+    MAX_ROW_MOVES = 100  # A sync needing more moves than this resets the model instead
+
+    # Paths whose git status was asked for (by painting their rows) but is not known yet
+    git_status_needed = pyqtSignal(object)
+
+    def __init__(self, shorten_path, store=None, parent=None):
         super().__init__(parent)
-        self.layout = QHBoxLayout(self)
-        self.layout.setContentsMargins(10, 8, 10, 8)
-        self.layout.setSpacing(12)  # Add spacing between icon and text container
-        
-        # Project icon (folder icon from system theme)
-        self.icon_label = QLabel()
-        self.icon_label.setPixmap(self.style().standardIcon(QStyle.SP_DirIcon).pixmap(24, 24))
-        # Add padding to icon
-        self.icon_label.setStyleSheet("padding: 4px; background-color: #3a3a3a; border-radius: 6px;")
-        # Fix size for the icon container
-        self.icon_label.setFixedSize(36, 36)
-        self.icon_label.setAlignment(Qt.AlignCenter)
-        self.layout.addWidget(self.icon_label)
-        
-        # Text container with vertical layout
-        self.text_container = QWidget()
-        self.text_container.setStyleSheet("background-color: #3a3a3a; border-radius: 8px; padding: 8px;")
-        self.text_layout = QVBoxLayout(self.text_container)
-        self.text_layout.setContentsMargins(8, 6, 8, 6)
-        self.text_layout.setSpacing(4)  # Increased spacing between name and path
-        
-        # Project name with bold font
-        self.name_label = QLabel(folder_name)
-        font = QFont()
-        font.setBold(True)
-        self.name_label.setFont(font)
-        self.name_label.setStyleSheet("background-color: transparent; padding: 2px 0px;")
-        self.text_layout.addWidget(self.name_label)
-        
-        # Project path with smaller, gray font - with elided text to handle long paths
-        self.path_label = QLabel(full_path)
-        path_font = QFont()
-        path_font.setPointSize(8)
-        self.path_label.setFont(path_font)
-        self.path_label.setStyleSheet("color: #888888; background-color: transparent; padding: 2px 0px;")
-        
-        # Enable text wrapping for long paths
-        self.path_label.setWordWrap(True)
-        # Set fixed width to avoid horizontal scrolling
-        self.path_label.setMaximumWidth(500)
-        # Use elided text (with ellipsis)
-        self.path_label.setTextFormat(Qt.PlainText)
-        
-        self.text_layout.addWidget(self.path_label)
-        
-        self.layout.addWidget(self.text_container, 1)  # 1 stretch factor to take available space
-        
-        # Add rounded corners to the whole item
-        self.setStyleSheet("QWidget { border-radius: 10px; }")
+        self._shorten_path = shorten_path
+        self.store = store if store is not None else ProjectStore()
+        self._ids = array('I')
+        self._names = {}  # Record -> display name, where it differs from the folder's basename
+        self._rows = None  # Visible subset of self._ids, None when unfiltered
+        self._more = None  # Iterator over the filtered rows not taken yet
+        self._origins = {}  # Record -> editor names, where they differ from _common_origins
+        self._common_origins = ()
+        self._show_origins = False
+        self._git = {}  # Record -> GitStatus or None, once fetched
+        self._git_requested = set()
+        self._git_wanted = []  # Requested during the current paint, flushed right after
+        self._health = bytearray()  # Record -> index into HEALTH_STATES, 0 while unchecked
+        self._profiles = {}  # Record -> ProjectProfile, once profiled
+
+    def _visible(self):
+        return self._ids if self._rows is None else self._rows
+
+    def rowCount(self, parent=QModelIndex()):
+        # Called once per row during layout, so keep it as cheap as possible
+        if parent.isValid():
+            return 0
+        return len(self._ids if self._rows is None else self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._more is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid():
+            self._fetch(self.FETCH_SIZE)
+
+    def _fetch(self, count=None):
+        """Take count more filtered rows from the iterator, or all of them."""
+        if self._more is None:
+            return
+        rows = array('I', self._more if count is None else islice(self._more, count))
+        if count is None or len(rows) < count:
+            self._more = None
+        if rows:
+            row = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.record_data(self._visible()[index.row()], role)
+
+    def record_data(self, record, role):
+        """What data() answers for the row showing record; shared with the grouped view."""
+        if role == Qt.DisplayRole:
+            return self._names.get(record) or self.store.names[record]
+        if role == Qt.UserRole:
+            return self.store.path(record)
+        if role == Qt.ToolTipRole:
+            path = self.store.path(record)
+            editors = self._origins.get(record, self._common_origins)
+            profile = self._profiles.get(record)
+            lines = [path, f"Opened in: {', '.join(editors)}" if editors else "",
+                     profile.label() if profile is not None else ""]
+            return "\n".join(line for line in lines if line)
+        if role == self.PathDisplayRole:
+            return self._shorten_path(self.store.path(record))
+        if role == self.OriginRole:
+            return self._origins.get(record, self._common_origins) if self._show_origins else ()
+        if role == self.GitStatusRole:
+            if record not in self._git_requested:
+                self._git_requested.add(record)
+                if not self._git_wanted:
+                    QTimer.singleShot(0, self._flush_git_requests)
+                self._git_wanted.append(record)
+            return self._git.get(record)
+        if role == self.HealthRole:
+            return self._health_of(record)
+        if role == self.ProfileRole:
+            return self._profiles.get(record)
+        return None
+
+    def _flush_git_requests(self):
+        wanted, self._git_wanted = self._git_wanted, []
+        if wanted:
+            self.git_status_needed.emit(self.store.paths(wanted))
+
+    def set_git_statuses(self, statuses):
+        """Store fetched git statuses ({path: GitStatus or None}) and repaint."""
+        statuses = dict(zip(self.store.add_many(list(statuses)), statuses.values()))
+        changed = {record: status for record, status in statuses.items() if self._git.get(record, 0) != status}
+        if not changed:
+            return
+        self._git.update(changed)
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), [self.GitStatusRole])
+
+    def set_profiles(self, profiles):
+        """Store project profiles ({path: ProjectProfile or None}) and repaint."""
+        profiles = dict(zip(self.store.add_many(list(profiles)), profiles.values()))
+        changed = {record: profile for record, profile in profiles.items() if self._profiles.get(record) != profile}
+        if not changed:
+            return
+        self._profiles.update(changed)
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1),
+                                  [self.ProfileRole, Qt.ToolTipRole])
+
+    def matching_profiles(self, records, wanted):
+        """Iterate over the records whose profile satisfies wanted, in order; unprofiled ones never do."""
+        profiles = self._profiles
+        return (record for record in records if wanted(profiles.get(record)))
+
+    def refresh_git_statuses(self):
+        """Ask for the git status of rows again as they are painted, e.g. after switching back to the app."""
+        self._git_requested.clear()
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), [self.GitStatusRole])
+
+    def set_health(self, states):
+        """Store path_health results ({path: state}) and repaint.
+
+        Rows whose health just became known ask for their git status again,
+        since it may have been held back until the path was known to be there.
+        """
+        records = self.store.add_many(list(states))
+        health = self._health
+        if len(health) < len(self.store):
+            health.extend(bytes(len(self.store) - len(health)))
+        changed = []
+        for record, code in zip(records, map(self.HEALTH_STATES.index, states.values())):
+            if health[record] != code:
+                health[record] = code
+                changed.append(record)
+        if not changed:
+            return
+        self._git_requested.difference_update(changed)
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1),
+                                  [self.HealthRole, self.GitStatusRole])
+
+    def _health_of(self, record):
+        return self.HEALTH_STATES[self._health[record]] if record < len(self._health) else None
+
+    def health(self, path):
+        record = self.store.id_of(path)
+        return None if record is None else self._health_of(record)
+
+    def unhealthy_ids(self):
+        """Return the records found missing or unreachable, in list order."""
+        health = self._health
+        return [record for record in self._ids if record < len(health) and health[record] > 1]
+
+    def unhealthy_paths(self):
+        """Return the paths found missing or unreachable, in list order."""
+        return self.store.paths(self.unhealthy_ids())
+
+    def set_origins(self, origins):
+        """Set the editors each path was opened in.
+
+        Origins are only displayed once projects come from more than one editor.
+        Most projects share the same editors, so only the exceptions are kept.
+        """
+        counts = Counter(origins.values())  # Few distinct tuples, shared between paths
+        self._show_origins = len(set().union(*counts)) > 1
+        self._common_origins = counts.most_common(1)[0][0] if counts else ()
+        self._origins = {}
+        if len(counts) > 1:
+            other = {path: editors for path, editors in origins.items() if editors != self._common_origins}
+            self._origins = dict(zip(self.store.add_many(list(other)), other.values()))
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1),
+                                  [Qt.ToolTipRole, self.OriginRole])
+
+    def visible_ids(self):
+        """Return the records of the visible rows, in order, taking every filtered row first."""
+        self._fetch()
+        return self._visible()
+
+    def editors_of(self, records):
+        """Iterate over the editors each of records was opened in."""
+        return map(self._origins.get, records, repeat(self._common_origins))
+
+    def ids(self):
+        """Return all project records, ignoring the active filter."""
+        return self._ids
+
+    def paths(self):
+        """Return all project paths, ignoring the active filter."""
+        return self.store.paths(self._ids)
+
+    def row_of(self, path):
+        """Return the visible row of path, or -1 if it is not shown."""
+        record = self.store.id_of(path)
+        try:
+            return -1 if record is None else self.visible_ids().index(record)
+        except ValueError:
+            return -1
+
+    def set_projects(self, paths):
+        """Replace the whole list of projects."""
+        self.set_ids(self.store.add_many(paths))
+
+    def set_ids(self, records):
+        self.beginResetModel()
+        self._ids = array('I', records)
+        self._names = {}
+        self._rows = None
+        self._more = None
+        self.endResetModel()
+
+    def add_project(self, folder_name, full_path):
+        """Append a single project and return its model index."""
+        if self._rows is not None:
+            self.set_filter_ids(None)
+        record = self.store.add(full_path)
+        row = len(self._ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.append(record)
+        if folder_name != self.store.names[record]:
+            self._names[record] = folder_name
+        self.endInsertRows()
+        return self.index(row)
+
+    def append_projects(self, paths, matches=None):
+        """Append a batch of projects; see append_ids."""
+        self.append_ids(self.store.add_many(paths), None if matches is None else self.store.add_many(matches))
+
+    def append_ids(self, records, matches=None):
+        """Append a batch of records.
+
+        While a filter is active, matches is the part of the batch that passes
+        it and only those rows become visible.
+        """
+        if not records:
+            return
+        self._fetch()  # Matches go after every row the filter already has
+        if self._rows is None:
+            row = len(self._ids)
+            self.beginInsertRows(QModelIndex(), row, row + len(records) - 1)
+            self._ids.extend(records)
+            self.endInsertRows()
+            return
+        self._ids.extend(records)
+        if matches:
+            row = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row, row + len(matches) - 1)
+            self._rows.extend(matches)
+            self.endInsertRows()
+
+    def sync(self, paths, matches=None):
+        """Bring the model up to date with a new list of paths; see sync_ids."""
+        self.sync_ids(self.store.add_many(paths), None if matches is None else self.store.add_many(matches))
+
+    def sync_ids(self, records, matches=None):
+        """Bring the model up to date with inserts, removals and moves only.
+
+        Unchanged rows are left alone, so selection and scroll position
+        survive. While a filter is active, matches is the new visible subset.
+        """
+        self._fetch()
+        if (matches is None) != (self._rows is None):
+            # Filter switched on or off, e.g. by hiding missing projects
+            self._ids = array('I', records)
+            self.set_filter_ids(matches)
+        elif self._rows is None:
+            self._ids = self._sync_rows(self._ids, array('I', records))
+        else:
+            self._ids = array('I', records)
+            self._rows = self._sync_rows(self._rows, array('I', matches or ()))
+
+    def _sync_rows(self, current, target):
+        """Turn the visible list current into target, emitting row signals.
+
+        Past MAX_ROW_MOVES moves, one reset is cheaper for the view than
+        moving rows one at a time.
+        """
+        if current == target:
+            return current
+        target_set = set(target)
+        removed = set(current).difference(target_set)
+        if removed:
+            rows = [row for row, record in enumerate(current) if record in removed]
+            # Remove contiguous runs from the bottom up so earlier rows keep their numbers
+            for first, last in reversed(self._runs(rows)):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del current[first:last + 1]
+                self.endRemoveRows()
+
+        added = target_set.difference(current)
+        if added:
+            rows = [row for row, record in enumerate(target) if record in added]
+            for first, last in self._runs(rows):
+                self.beginInsertRows(QModelIndex(), first, last)
+                current[first:first] = target[first:last + 1]
+                self.endInsertRows()
+
+        # Whatever still differs was reordered; move those rows into place
+        if self._count_moves(current, target) > self.MAX_ROW_MOVES:
+            self.beginResetModel()
+            current[:] = target
+            self.endResetModel()
+            return current
+        for row, record in enumerate(target):
+            if current[row] != record:
+                source = current.index(record, row + 1)
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), row)
+                current.insert(row, current.pop(source))
+                self.endMoveRows()
+        return current
+
+    @staticmethod
+    def _count_moves(current, target):
+        """The number of rows the move loop of _sync_rows would move, counted in one pass."""
+        moved = set()
+        moves = source = 0
+        for record in target:
+            while current[source] in moved:
+                source += 1
+            if current[source] == record:
+                source += 1
+            else:
+                moved.add(record)
+                moves += 1
+        return moves
+
+    @staticmethod
+    def _runs(rows):
+        """Group sorted row numbers into (first, last) runs of consecutive rows."""
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return runs
+
+    def set_filter(self, paths):
+        """Show only the given paths, or every project when paths is None."""
+        self.set_filter_ids(None if paths is None else self.store.add_many(paths))
+
+    def set_filter_ids(self, records):
+        """Show only records (any iterable), or every project when records is None."""
+        self.beginResetModel()
+        self._more = None
+        if records is None:
+            self._rows = None
+        else:
+            records = iter(records)
+            self._rows = array('I', islice(records, self.FETCH_SIZE))
+            if len(self._rows) == self.FETCH_SIZE:
+                self._more = records
+        self.endResetModel()
+
+
+class ProjectItemDelegate(QStyledItemDelegate):
+    """Paints a project row: folder icon, bold name and elided path."""
+    MARGIN_H = 10
+    MARGIN_V = 8
+    ICON_BOX = 36
+    ICON_SIZE = 24
+    SPACING = 12
+    TEXT_PADDING_H = 12
+    TEXT_PADDING_V = 8
+    LINE_SPACING = 4
+
+    SELECTED_COLOR = QColor("#4a76c9")
+    HOVER_COLOR = QColor("#3a3a3a")
+    BOX_COLOR = QColor("#3a3a3a")
+    NAME_COLOR = QColor("#e0e0e0")
+    PATH_COLOR = QColor("#888888")
+    GIT_CLEAN_COLOR = QColor("#6a9955")
+    GIT_DIRTY_COLOR = QColor("#d7ba7d")
+    MISSING_COLOR = QColor("#e06c6c")
+
+    def __init__(self, icon_pixmap, parent=None):
+        super().__init__(parent)
+        # Rendered once and shared by every row
+        self.icon_pixmap = icon_pixmap
+        self.name_font = QFont()
+        self.name_font.setBold(True)
+        self.path_font = QFont()
+        self.path_font.setPointSize(8)
+        self._name_metrics = QFontMetrics(self.name_font)
+        self._path_metrics = QFontMetrics(self.path_font)
+
+    def sizeHint(self, option, index):
+        text_height = (self._name_metrics.height() + self.LINE_SPACING +
+                       self._path_metrics.height() + 2 * self.TEXT_PADDING_V)
+        height = max(self.ICON_BOX, text_height) + 2 * self.MARGIN_V
+        return QSize(option.rect.width(), height)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        rect = option.rect
+
+        # Row background for selection and hover
+        if option.state & QStyle.State_Selected:
+            painter.setBrush(self.SELECTED_COLOR)
+            painter.drawRoundedRect(rect, 4, 4)
+        elif option.state & QStyle.State_MouseOver:
+            painter.setBrush(self.HOVER_COLOR)
+            painter.drawRoundedRect(rect, 4, 4)
+
+        # Icon box
+        icon_rect = QRect(rect.left() + self.MARGIN_H,
+                          rect.top() + (rect.height() - self.ICON_BOX) // 2,
+                          self.ICON_BOX, self.ICON_BOX)
+        painter.setBrush(self.BOX_COLOR)
+        painter.drawRoundedRect(icon_rect, 6, 6)
+        offset = (self.ICON_BOX - self.ICON_SIZE) // 2
+        painter.drawPixmap(icon_rect.left() + offset, icon_rect.top() + offset, self.icon_pixmap)
+
+        # Text box
+        text_rect = QRect(icon_rect.right() + 1 + self.SPACING, rect.top() + self.MARGIN_V,
+                          0, rect.height() - 2 * self.MARGIN_V)
+        text_rect.setRight(rect.right() - self.MARGIN_H)
+        painter.drawRoundedRect(text_rect, 8, 8)
+        inner = text_rect.adjusted(self.TEXT_PADDING_H, self.TEXT_PADDING_V,
+                                   -self.TEXT_PADDING_H, -self.TEXT_PADDING_V)
+
+        name = index.data(Qt.DisplayRole) or ""
+        name_rect = QRect(inner.left(), inner.top(), inner.width(), self._name_metrics.height())
+        name_width = inner.width()
+        editors = index.data(ProjectListModel.OriginRole)
+        if editors:
+            # Right-aligned editor label, sharing the line with the name
+            label = " · ".join(editors)
+            painter.setFont(self.path_font)
+            painter.setPen(self.PATH_COLOR)
+            painter.drawText(name_rect, Qt.AlignRight | Qt.AlignVCenter,
+                             self._path_metrics.elidedText(label, Qt.ElideRight, inner.width() // 2))
+            name_width -= min(self._path_metrics.width(label), inner.width() // 2) + self.SPACING
+        git_status = index.data(ProjectListModel.GitStatusRole)
+        if git_status is not None:
+            # Branch and state follow the name, which is elided first to make room
+            git_label = git_status.label()
+            painter.setFont(self.path_font)
+            # The arrows may come from a fallback font, so measure with the painter's metrics
+            git_metrics = painter.fontMetrics()
+            full_width = git_metrics.width(git_label)
+            git_width = min(full_width, name_width // 2)
+            name_width -= git_width + self.SPACING
+            elided_name = self._name_metrics.elidedText(name, Qt.ElideRight, name_width)
+            git_rect = QRect(inner.left() + self._name_metrics.width(elided_name) + self.SPACING,
+                             name_rect.top(), git_width, name_rect.height())
+            painter.setPen(self.GIT_DIRTY_COLOR if git_status.dirty else self.GIT_CLEAN_COLOR)
+            if full_width > git_width:
+                # Only elide when needed: eliding at the exact width can drop fallback glyphs
+                git_label = git_metrics.elidedText(git_label, Qt.ElideRight, git_width)
+            painter.drawText(git_rect, Qt.AlignLeft | Qt.AlignVCenter, git_label)
+        else:
+            elided_name = self._name_metrics.elidedText(name, Qt.ElideRight, name_width)
+        painter.setFont(self.name_font)
+        painter.setPen(self.NAME_COLOR)
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter, elided_name)
+
+        path = index.data(ProjectListModel.PathDisplayRole) or ""
+        path_rect = QRect(inner.left(), name_rect.bottom() + 1 + self.LINE_SPACING,
+                          inner.width(), self._path_metrics.height())
+        painter.setFont(self.path_font)
+        profile = index.data(ProjectListModel.ProfileRole)
+        if profile is not None:
+            # Right-aligned language, size and age, sharing the line with the path
+            label = profile.label()
+            label_width = min(self._path_metrics.width(label), inner.width() // 3)
+            painter.setPen(self.PATH_COLOR)
+            painter.drawText(path_rect, Qt.AlignRight | Qt.AlignVCenter,
+                             self._path_metrics.elidedText(label, Qt.ElideRight, label_width))
+            path_rect.setWidth(path_rect.width() - label_width - self.SPACING)
+        health = index.data(ProjectListModel.HealthRole)
+        if health is not None and health != OK:
+            # Missing or unreachable projects say so in place of a plain path
+            path = f"{health} · {path}"
+            painter.setPen(self.MISSING_COLOR)
+        else:
+            painter.setPen(self.PATH_COLOR)
+        painter.drawText(path_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         self._path_metrics.elidedText(path, Qt.ElideMiddle, path_rect.width()))
+        painter.restore()
 
 class ToolboxUI:
-    def __init__(self, main_window):
+    VIEW_MODES = (("List", "list"), ("By folder", "folder"), ("By editor", "editor"))
+
+    def __init__(self, main_window, profile=None):
         """Set up the UI components for the Toolbox application.
         
         Args:
             main_window: The main QMainWindow instance to set up
+            profile: StartupProfile timing the setup phases, if any
         """
         self.main_window = main_window
+        profile = profile or StartupProfile()
         self.setup_main_window()
-        self.setup_widgets()
-        self.apply_stylesheet()
+        with profile.phase("widgets"):
+            self.setup_widgets()
+        with profile.phase("stylesheet and palette"):
+            self.apply_stylesheet()
         
     def setup_main_window(self):
         """Configure the main window properties."""
@@ -104,7 +574,7 @@ class ToolboxUI:
         self.search_layout.setContentsMargins(0, 10, 0, 10)
         
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search projects...")
+        self.search_input.setPlaceholderText("Search projects...  (lang:python  files:>100  modified:<2w)")
         self.search_input.setMinimumHeight(36)
         self.search_layout.addWidget(self.search_input)
         
@@ -127,18 +597,78 @@ class ToolboxUI:
         projects_font.setPointSize(12)
         projects_font.setBold(True)
         self.projects_label.setFont(projects_font)
-        self.layout.addWidget(self.projects_label)
+        # Missing and unreachable projects can be hidden for now or pruned for good
+        self.hide_missing_checkbox = QCheckBox("Hide missing")
+        self.prune_button = QPushButton("Prune missing")
+        self.prune_button.setEnabled(False)
+        self.projects_header = QWidget()
+        self.projects_header_layout = QHBoxLayout(self.projects_header)
+        self.projects_header_layout.setContentsMargins(0, 0, 0, 0)
+        self.projects_header_layout.addWidget(self.projects_label)
+        self.projects_header_layout.addStretch()
+        # A flat list, or the same rows grouped by parent folder or by editor
+        self.view_combo = QComboBox()
+        for label, mode in self.VIEW_MODES:
+            self.view_combo.addItem(label, mode)
+        self.projects_header_layout.addWidget(self.view_combo)
+        self.projects_header_layout.addWidget(self.hide_missing_checkbox)
+        self.projects_header_layout.addWidget(self.prune_button)
+        self.layout.addWidget(self.projects_header)
+        self.hidden_ids = frozenset()  # Records of missing projects, while they are hidden
         
-        # Project List
-        self.project_list = QListWidget()
+        # Project List: a virtualized view, only visible rows are painted
+        # Every path is held once, in the store; the model and search index refer to its records
+        self.project_store = ProjectStore()
+        self.project_model = ProjectListModel(self.shorten_path, self.project_store)
+        self.project_list = QListView()
+        self.project_list.setModel(self.project_model)
+        self.icon_pixmap = self.main_window.style().standardIcon(QStyle.SP_DirIcon).pixmap(24, 24)
+        self.project_delegate = ProjectItemDelegate(self.icon_pixmap, self.project_list)
+        self.project_list.setItemDelegate(self.project_delegate)
         self.project_list.setSpacing(4)  # Add spacing between items
-        self.project_list.setUniformItemSizes(False)  # Allow variable height items
+        self.project_list.setUniformItemSizes(True)  # All rows share the delegate's size hint
+        # Lay out long lists a batch at a time so the first rows paint immediately
+        self.project_list.setLayoutMode(QListView.Batched)
+        self.project_list.setBatchSize(500)
+        self.project_list.setMouseTracking(True)  # Needed for hover highlighting
+        self.project_list.setEditTriggers(QListView.NoEditTriggers)
+        self.project_list.setSelectionMode(QListView.ExtendedSelection)  # Ctrl/Shift to open several
         self.project_list.setFrameShape(QFrame.NoFrame)  # Remove the border
         self.layout.addWidget(self.project_list)
+
+        # Grouped view over the same model; its tree model is only created once it is shown
+        self.project_tree = QTreeView()
+        self.project_tree.setHeaderHidden(True)
+        self.project_tree.setMouseTracking(True)
+        self.project_tree.setEditTriggers(QTreeView.NoEditTriggers)
+        self.project_tree.setSelectionMode(QTreeView.ExtendedSelection)
+        self.project_tree.setFrameShape(QFrame.NoFrame)
+        self.project_tree.hide()
+        self.project_tree_model = None
+        self.expanded_groups = set()  # Keys of the groups left open, reopened after regrouping
+        self.layout.addWidget(self.project_tree)
+
+        # Status line for launch progress and errors, cleared after a few seconds
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        self.status_label.hide()
+        self.layout.addWidget(self.status_label)
+        self.status_timer = QTimer(self.main_window)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.timeout.connect(self.clear_status)
         
-        # Connect search functionality
-        self.search_input.textChanged.connect(self.filter_projects)
-        self.search_button.clicked.connect(lambda: self.filter_projects(self.search_input.text()))
+        # Connect search functionality; typing is debounced, the button searches at once
+        self.search_index = SearchIndex(store=self.project_store)
+        self.search_timer = QTimer(self.main_window)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(80)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_input.textChanged.connect(self.on_search_edited)
+        self._edited_at = None  # First keystroke not yet reflected in the list
+        self.search_button.clicked.connect(self.apply_filter)
+        self.hide_missing_checkbox.toggled.connect(self.update_hidden_paths)
+        self.view_combo.currentIndexChanged.connect(
+            lambda: self.set_view_mode(self.view_combo.currentData()))
     
     def apply_stylesheet(self):
         """Apply custom styling to make the app look modern."""
@@ -155,22 +685,12 @@ class ToolboxUI:
             QLabel {
                 color: #e0e0e0;
             }
-            QListWidget {
+            QListView {
                 background-color: #333333;
                 border-radius: 8px;
                 padding: 5px;
                 outline: none;
             }
-            QListWidget::item {
-                border-radius: 4px;
-                margin: 2px 0px;
-            }
-            QListWidget::item:selected {
-                background-color: #4a76c9;
-            }
-            QListWidget::item:hover {
-                background-color: #3a3a3a;
-            }
             QLineEdit {
                 background-color: #333333;
                 border: 1px solid #444444;
@@ -215,24 +735,161 @@ class ToolboxUI:
         self.main_window.setPalette(dark_palette)
         
     def add_project_item(self, folder_name, full_path):
-        """Add a project to the list with a custom widget for better appearance."""
-        item = QListWidgetItem(self.project_list)
-        
-        # Get a shortened display version of the path
-        display_path = self.shorten_path(full_path)
-        
-        custom_widget = ProjectListItem(folder_name, display_path)
-        item.setSizeHint(custom_widget.sizeHint())
-        self.project_list.setItemWidget(item, custom_widget)
-        
-        # Store the full path data for use when opening
-        item.setData(Qt.UserRole, full_path)
-        # Show full path on hover
-        item.setToolTip(full_path)
-        return item
+        """Add a project to the list and return its model index."""
+        index = self.project_model.add_project(folder_name, full_path)
+        self.search_index.add_ids([self.project_model.ids()[-1]])
+        return index
+
+    def set_projects(self, paths):
+        """Replace the list contents with the given project paths."""
+        with metrics.span("list.populate", "ui", rows=len(paths)):
+            records = self.project_store.add_many(paths)
+            self.project_model.set_ids(records)
+            self.search_index.set_ids(records)
+        search_text = self.search_input.text()
+        if search_text or self.hidden_ids:
+            self.filter_projects(search_text)
+
+    def set_project_origins(self, origins):
+        """Record which editors each project was opened in."""
+        self.project_model.set_origins(origins)
+
+    def append_projects(self, paths):
+        """Append a batch of projects, honouring the active search filter.
+
+        Matches from a batch are added at the end; apply_filter() ranks them
+        once loading is done.
+        """
+        with metrics.span("list.append", "ui", rows=len(paths)):
+            records = self.project_store.add_many(paths)
+            matches = self._search(self.search_input.text(), records, ranked=False)
+            self.search_index.add_ids(records)
+            self.project_model.append_ids(records, matches)
+
+    def sync_projects(self, paths):
+        """Apply an updated project list without rebuilding the view.
+
+        The selection is preserved by the model, the active search filter is
+        re-applied to the new list and the row at the top of the view stays there.
+        """
+        top_index = self.project_list.indexAt(self.project_list.viewport().rect().topLeft())
+        top_path = top_index.data(Qt.UserRole) if top_index.isValid() else None
+        with metrics.span("list.sync", "ui", rows=len(paths)):
+            records = self.project_store.add_many(paths)
+            self.search_index.set_ids(records)
+            matches = self._search(self.search_input.text(), records)
+            self.project_model.sync_ids(records, matches)
+        if top_path is not None:
+            row = self.project_model.row_of(top_path)
+            if row >= 0:
+                self.project_list.scrollTo(self.project_model.index(row), QListView.PositionAtTop)
+
+    def set_project_health(self, states):
+        """Record path_health results and update what is hidden or can be pruned."""
+        self.project_model.set_health(states)
+        self.update_hidden_paths()
+
+    def update_hidden_paths(self):
+        """Hide missing and unreachable projects while the checkbox is ticked."""
+        unhealthy = self.project_model.unhealthy_ids()
+        self.prune_button.setEnabled(bool(unhealthy))
+        hidden = frozenset(unhealthy) if self.hide_missing_checkbox.isChecked() else frozenset()
+        if hidden != self.hidden_ids:
+            self.hidden_ids = hidden
+            self.filter_projects(self.search_input.text())
+
+    def set_project_profiles(self, profiles):
+        """Record project profiles, filtering again if the search asks for them."""
+        self.project_model.set_profiles(profiles)
+        if parse_filters(self.search_input.text())[1] is not None:
+            self.search_timer.start()  # Profiles arrive a chunk at a time; filter once they settle
+
+    def _search(self, search_text, records, ranked=True):
+        """Return the records matching search_text, leaving out hidden ones, or None for all of them.
+
+        The plain part of the query goes to the search index: ranked over
+        the whole index, as an iterator that finds matches as the list takes
+        them, or matched within records in their order, as a list.
+        Profile filters such as lang:python then narrow the result.
+        """
+        query, wanted = parse_filters(search_text)
+        if ranked:
+            matches = self.search_index.iter_ids(query)
+        else:
+            matches = self.search_index.match_ids(records, query) if query.strip() else None
+        if wanted is not None:
+            matches = self.project_model.matching_profiles(records if matches is None else matches, wanted)
+        if self.hidden_ids:
+            matches = filterfalse(self.hidden_ids.__contains__, records if matches is None else matches)
+        return matches if ranked or matches is None else list(matches)
+
+    def set_loading(self, loading):
+        """Show or clear the loading indicator next to the list title."""
+        self.projects_label.setText("Recent Projects (loading...)" if loading else "Recent Projects")
+
+    def show_status(self, message, error=False, timeout_ms=6000):
+        """Show a message below the list; errors are shown in red."""
+        self.status_label.setStyleSheet("color: #e06c6c;" if error else "color: #888888;")
+        self.status_label.setText(message)
+        self.status_label.show()
+        self.status_timer.start(timeout_ms)
+
+    def clear_status(self):
+        self.status_timer.stop()
+        self.status_label.hide()
+        self.status_label.clear()
+
+    def set_view_mode(self, mode):
+        """Show projects as a flat "list" or grouped by "folder" or "editor"."""
+        grouped = mode in ("folder", "editor")
+        if grouped and self.project_tree_model is None:
+            from project_tree import ProjectTreeModel, ProjectTreeDelegate  # Only loaded when grouping
+            self.project_tree_model = ProjectTreeModel(self.project_model, self.project_tree)
+            self.project_tree.setModel(self.project_tree_model)
+            self.project_tree.setItemDelegate(ProjectTreeDelegate(self.icon_pixmap, self.project_tree))
+            self.project_tree.expanded.connect(lambda index: self._group_toggled(index, True))
+            self.project_tree.collapsed.connect(lambda index: self._group_toggled(index, False))
+            self.project_tree_model.modelReset.connect(self._reopen_groups)
+        if self.project_tree_model is not None:
+            self.project_tree_model.set_grouping(mode if grouped else None)
+        self.project_tree.setVisible(grouped)
+        self.project_list.setVisible(not grouped)
+        row = self.view_combo.findData(mode if grouped else "list")
+        if row != self.view_combo.currentIndex():
+            self.view_combo.blockSignals(True)
+            self.view_combo.setCurrentIndex(row)
+            self.view_combo.blockSignals(False)
+
+    def _group_toggled(self, index, expanded):
+        key = self.project_tree_model.group_key(index)
+        if expanded:
+            self.expanded_groups.add(key)
+            self.project_tree_model.fetchMore(index)  # Rather than on the view's next layout
+        else:
+            self.expanded_groups.discard(key)
+
+    def _reopen_groups(self):
+        # Only the groups that were open get child rows again; the rest stay collapsed and empty
+        model = self.project_tree_model
+        for row in model.group_rows(self.expanded_groups):
+            self.project_tree.expand(model.index(row, 0))
+
+    def current_view(self):
+        """Return the list or tree view, whichever is shown."""
+        return self.project_list if self.project_tree.isHidden() else self.project_tree
+
+    def selected_paths(self):
+        """Return the paths of the selected projects, top to bottom."""
+        indexes = sorted(self.current_view().selectionModel().selectedIndexes(),
+                         key=lambda index: (index.parent().row(), index.row()))
+        return [path for path in (index.data(Qt.UserRole) for index in indexes) if path]
 
     def shorten_path(self, path):
         """Shorten a long path for display purposes while keeping important parts."""
+        label = remote_label(path)
+        if label is not None:
+            # Where a remote project lives, then its path on that machine
+            return f"{label} · {self.shorten_path('/' + path.partition('://')[2].partition('/')[2])}"
         # If path is short enough, return it as is
         if len(path) < 60:
             return path
@@ -249,20 +906,30 @@ class ToolboxUI:
         return shortened_path
         
     def get_project_list(self):
-        """Return the project list widget."""
+        """Return the project list view."""
         return self.project_list
-        
+
+    def get_project_model(self):
+        """Return the model backing the project list."""
+        return self.project_model
+
+    def on_search_edited(self):
+        if self._edited_at is None:
+            self._edited_at = time.perf_counter()
+        self.search_timer.start()
+
+    def apply_filter(self):
+        """Filter with the current search text right away."""
+        self.search_timer.stop()
+        self.filter_projects(self.search_input.text())
+        if self._edited_at is not None:
+            # Typing to results, debounce included: what the user waits for
+            metrics.observe("filter.keystroke", (time.perf_counter() - self._edited_at) * 1000)
+            self._edited_at = None
+
     def filter_projects(self, search_text):
-        """Filter projects based on search text."""
-        search_text = search_text.lower()
-        for i in range(self.project_list.count()):
-            item = self.project_list.item(i)
-            widget = self.project_list.itemWidget(item)
-            folder_name = widget.name_label.text().lower()
-            full_path = widget.path_label.text().lower()
-            
-            # Show the item if the search text is in the name or path
-            if search_text in folder_name or search_text in full_path:
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
+        """Filter projects based on search text, best matches first, leaving out hidden ones."""
+        with metrics.span("filter", "ui", query_length=len(search_text)) as args:
+            matches = self._search(search_text, self.project_model.ids())
+            self.project_model.set_filter_ids(matches)
+            args["results"] = self.project_model.rowCount()
@@ -0,0 +1,88 @@
+import os
+import platform
+import posixpath
+import re
+from functools import lru_cache
+
+# urllib.parse is imported once something needs decoding, like in toolbox_core:
+# the window needs this module before its first paint.
+_unquote = None
+_WINDOWS = platform.system() == 'Windows'
+
+# A URI scheme followed by ://, as opposed to a local path such as C:\src or /home
+_URI = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*://")
+
+# Remote authorities as VSCode labels them in its status bar
+_REMOTE_KINDS = {"ssh-remote": "SSH", "wsl": "WSL", "dev-container": "Dev Container",
+                 "attached-container": "Container", "codespaces": "Codespaces", "tunnel": "Tunnel"}
+
+
+@lru_cache(maxsize=1 << 17)
+def project_from_uri(uri):
+    """The project a URI recorded by VSCode stands for, or None if it is not one.
+
+    file:// URIs become local paths. Any other scheme (vscode-remote for SSH,
+    WSL and dev containers, vscode-vfs and so on) stays a URI, with its
+    authority and path percent-decoded so it reads and searches like a path,
+    e.g. vscode-remote://ssh-remote+box/srv/api. A .code-workspace file
+    stands for the folder holding it. Every loader decodes through here, and
+    the same URIs come back on every refresh, so results are memoized.
+    """
+    if not isinstance(uri, str):
+        return None
+    if uri.startswith("file://"):
+        path = os.path.normpath(_decoded(uri[len("file://"):]))
+        if _WINDOWS and path[:1] in "/\\" and path[2:3] == ":":
+            path = path[1:]  # /C:/Users -> C:/Users
+        if path.endswith(".code-workspace"):
+            path = os.path.dirname(path)
+        return path
+    if not _URI.match(uri):
+        return None
+    scheme, _, rest = uri.partition("://")
+    authority, _, path = rest.partition("/")
+    path = posixpath.normpath("/" + _decoded(path))
+    if path.endswith(".code-workspace"):
+        path = posixpath.dirname(path)
+    return f"{scheme}://{_decoded(authority)}{path}"
+
+
+def _decoded(text):
+    global _unquote
+    if "%" not in text:
+        return text
+    if _unquote is None:
+        from urllib.parse import unquote as _unquote
+    return _unquote(text)
+
+
+def is_remote(project):
+    """True for projects kept as a URI rather than a local path."""
+    return _URI.match(project) is not None
+
+
+def remote_label(project):
+    """Where a remote project lives, e.g. 'SSH: box' or 'WSL: Ubuntu'; None for local paths."""
+    if not is_remote(project):
+        return None
+    scheme, _, rest = project.partition("://")
+    authority = rest.partition("/")[0]
+    kind, plus, host = authority.partition("+")
+    name = _REMOTE_KINDS.get(kind, kind) if scheme == "vscode-remote" else scheme
+    # Container authorities carry hex-encoded JSON rather than a readable name
+    return f"{name}: {host}" if plus and kind not in ("dev-container", "attached-container") else name
+
+
+def launch_arguments(project):
+    """Command line arguments that open project in VSCode.
+
+    A local path is passed as it is; a remote project is re-encoded and
+    passed with --folder-uri, which opens it through the matching remote
+    extension just as VSCode's own recent list does.
+    """
+    if not is_remote(project):
+        return [project]
+    from urllib.parse import quote
+    scheme, _, rest = project.partition("://")
+    authority, _, path = rest.partition("/")
+    return ["--folder-uri", f"{scheme}://{quote(authority, safe='')}/{quote(path)}"]
@@ -0,0 +1,130 @@
+import json
+import os
+import threading
+from app_paths import cache_dir
+from instrumentation import get_logger, metrics
+from vscode_uri import project_from_uri
+
+log = get_logger("workspace_history")
+
+
+def workspace_storage_dir(location):
+    """The workspaceStorage directory next to a (path, type, editor) storage location, or None."""
+    storage_path, storage_type, _ = location
+    # state.vscdb lives in User/globalStorage, storage.json directly in User
+    user_dir = os.path.dirname(storage_path)
+    if storage_type == 'db':
+        user_dir = os.path.dirname(user_dir)
+    path = os.path.join(user_dir, "workspaceStorage")
+    return path if os.path.isdir(path) else None
+
+
+def workspace_json_path(data):
+    """The project recorded in a parsed workspace.json, decoded like the recent list; None if unknown."""
+    return project_from_uri(data.get("folder") or data.get("workspace") or data.get("configuration"))
+
+
+class WorkspaceHistory:
+    """Every folder and workspace VSCode ever opened, from User/workspaceStorage.
+
+    VSCode caps its recent list, but keeps one workspaceStorage/<hash>
+    directory per folder or workspace it has opened, each with a
+    workspace.json naming it. Scanning them recovers the full history.
+
+    The parsed path of each directory is cached together with the
+    directory's modification time, which changes whenever VSCode writes
+    the workspace's state. A later scan only reads the workspace.json
+    files of new or changed directories, on a thread pool. Directories are
+    returned most recently used first.
+    """
+    def __init__(self, path=None, max_workers=8):
+        self.path = path or os.path.join(cache_dir(), "workspace-history.json")
+        self.max_workers = max_workers
+        self._entries = None  # workspaceStorage dir -> {hash: [mtime_ns, path or None]}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # One writer at a time, each newer than the last
+
+    def load(self):
+        with self._lock:
+            self._entries = self._read_cache()
+
+    def _read_cache(self):
+        try:
+            with open(self.path, "r", encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self):
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                # A copy: scans running meanwhile replace entries of the dict itself
+                data = dict(self._entries)
+                self._dirty = False
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, "w", encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                log.warning("Could not write workspace history cache %s: %s", self.path, e)
+
+    def scan(self, storage_dir):
+        """Returns the project paths under storage_dir, most recently used first.
+
+        Safe to call for several storage directories at once.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        with self._lock:
+            if self._entries is None:  # Checked under the lock so that one scan loads it
+                self._entries = self._read_cache()
+            cached = self._entries.get(storage_dir, {})
+
+        entries = {}  # hash -> [mtime_ns, path or None]
+        changed = []
+        try:
+            with os.scandir(storage_dir) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_dir():
+                            continue
+                        mtime = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    known = cached.get(entry.name)
+                    if known is not None and known[0] == mtime:
+                        entries[entry.name] = known
+                    else:
+                        entries[entry.name] = [mtime, None]
+                        changed.append(entry.name)
+        except OSError as e:
+            log.warning("Could not scan %s: %s", storage_dir, e)
+            return []
+
+        metrics.count("workspace_history.read", len(changed))
+        if changed:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                paths = pool.map(lambda name: self._read(os.path.join(storage_dir, name)), changed)
+                for name, path in zip(changed, paths):
+                    entries[name][1] = path
+        if changed or len(entries) != len(cached):
+            with self._lock:
+                self._entries[storage_dir] = entries
+                self._dirty = True
+
+        ordered = sorted(entries.values(), key=lambda entry: entry[0], reverse=True)
+        return list(dict.fromkeys(path for _, path in ordered if path))
+
+    @staticmethod
+    def _read(directory):
+        try:
+            with open(os.path.join(directory, "workspace.json"), "r", encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return workspace_json_path(data) if isinstance(data, dict) else None